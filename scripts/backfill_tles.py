@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Bulk-load historical TLE archives (.txt/.tle, .gz, .zip) into the configured database
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from astrolabe.database import TLEDatabaseUpdater
+from astrolabe.backfill import BackfillLoader
+from astrolabe.archive import ColumnarArchive
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backfill historical TLE files into the database')
+    parser.add_argument('paths', nargs='+', help='Input files (.txt, .tle, .gz or .zip)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Parser processes (default: all cores)')
+    parser.add_argument('--archive', metavar='DIR',
+                        help='Also append to a columnar archive (overrides ARCHIVE_DIR)')
+    parser.add_argument('--archive-only', action='store_true',
+                        help='Write only the columnar archive, not the database')
+    args = parser.parse_args()
+
+    updater = TLEDatabaseUpdater()
+    if args.archive:
+        updater.archive = ColumnarArchive(args.archive)
+    if args.archive_only:
+        if updater.archive is None:
+            parser.error('--archive-only needs --archive or ARCHIVE_DIR')
+        updater.archive_only = True
+    loader = BackfillLoader(updater, workers=args.workers)
+    loader.load(args.paths)
+    loader.print_stats()
+    updater.print_stats()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
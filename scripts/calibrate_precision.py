@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Measure the speed and position error of each SGP4 precision tier
+
+Propagates the TLEs of a file with every tier of astrolabe.propagate over
+a span of minutes since epoch and reports, separately for near-earth and
+deep-space satellites, the throughput, the speedup over 'exact' and the
+position error against 'exact' at a few percentiles.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from astrolabe.parser import TLEParser
+from astrolabe.propagate import PRECISIONS, calibrate_precision, sgp4_init
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Calibrate the SGP4 precision tiers against exact propagation')
+    parser.add_argument('path', help='TLE file in 2LE or 3LE format')
+    parser.add_argument('--sats', type=int, default=0,
+                        help='Only use the first N element sets (default: all)')
+    parser.add_argument('--days', type=float, default=1.0,
+                        help='Span propagated, in days from epoch (default: 1)')
+    parser.add_argument('--step', type=float, default=3.0,
+                        help='Step in minutes (default: 3)')
+    parser.add_argument('--precision', action='append', choices=PRECISIONS,
+                        help='Tier to measure, may be repeated (default: all)')
+    args = parser.parse_args()
+
+    batch = TLEParser.parse_many(Path(args.path).read_bytes())
+    batch = {key: values[batch['valid']] for key, values in batch.items()}
+    if args.sats:
+        batch = {key: values[:args.sats] for key, values in batch.items()}
+    if not len(batch['norad_id']):
+        print("Error: no valid element sets")
+        return 1
+
+    constants = sgp4_init(batch)
+    tsince = np.arange(0.0, args.days * 1440.0, args.step)
+    precisions = args.precision or PRECISIONS
+    percentiles = (50.0, 90.0, 99.0, 99.9, 100.0)
+    print(f"{len(batch['norad_id']):,} element sets x {len(tsince)} times")
+
+    for label, deep_space in (('Near-earth', False), ('Deep-space', True)):
+        columns = np.flatnonzero(constants['deep_space'] == deep_space)
+        if not len(columns):
+            continue
+        subset = {key: values[columns] for key, values in constants.items()}
+        report = calibrate_precision(subset, tsince, precisions, percentiles)
+        print(f"\n{label}: {len(columns):,} satellites, position error against exact in m")
+        print(f"  {'tier':<8} {'states/sec':>11} {'speedup':>8}  "
+              + ' '.join(f"{'p' + format(q, 'g'):>9}" for q in percentiles))
+        for precision, result in report.items():
+            errors = ' '.join(f"{result['errors_km'][q] * 1e3:>9.2g}" for q in percentiles)
+            print(f"  {precision:<8} {result['states_per_sec'] / 1e6:>10.2f}M {result['speedup']:>7.2f}x  {errors}")
+            if result['mismatched']:
+                print(f"  Warning: {result['mismatched']:,} states propagate in only one of {precision} and exact")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
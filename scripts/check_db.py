@@ -2,6 +2,7 @@
 """
 Check SQLite Database Statistics
 """
+import argparse
 import os
 import sys
 from pathlib import Path
@@ -9,10 +10,15 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
-from astrolabe.database import TLEDatabaseUpdater
+from astrolabe.backends import create_backend
 from astrolabe.config import DB_TYPE, DB_PATH
 
 def main():
+    parser = argparse.ArgumentParser(description='Check SQLite database statistics')
+    parser.add_argument('--recount', action='store_true',
+                        help='Rebuild the maintained counters with a full table scan')
+    args = parser.parse_args()
+
     if DB_TYPE != 'sqlite':
         print(f"Error: configured for {DB_TYPE}, but this script is for checking the local SQLite DB.")
         return 1
@@ -23,8 +29,14 @@ def main():
 
     print(f"Checking database at: {DB_PATH}")
     
-    updater = TLEDatabaseUpdater()
-    stats = updater.get_database_stats()
+    # Open the backend directly: no parser, HTTP client or NumPy to load
+    backend = create_backend('sqlite')
+    if args.recount:
+        print("Recounting statistics from the full tables...")
+        stats = backend.recount_stats()
+    else:
+        stats = backend.get_stats()
+    backend.close()
     
     if stats:
         print("\nDATABASE STATISTICS")
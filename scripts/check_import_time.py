@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Check CLI startup cost: opening the SQLite backend must not drag in the
+Supabase client, HTTP stack, NumPy or psycopg, and must stay within a
+time budget.
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).parent.parent / 'src'
+
+# Modules only the ingest path or another backend should load
+HEAVY_MODULES = ('supabase', 'requests', 'numpy', 'psycopg')
+
+PROBE = f"""
+import sys, time
+sys.path.insert(0, {str(SRC)!r})
+start = time.perf_counter()
+from astrolabe.backends import get_backend_class
+get_backend_class('sqlite')
+elapsed = time.perf_counter() - start
+print(elapsed)
+print(' '.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))
+"""
+
+
+def measure() -> tuple:
+    """(seconds, heavy modules loaded) from a fresh interpreter"""
+    result = subprocess.run([sys.executable, '-c', PROBE], capture_output=True, text=True, check=True)
+    elapsed, loaded = (result.stdout.splitlines() + [''])[:2]
+    return float(elapsed), loaded.split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check astrolabe backend import time')
+    parser.add_argument('--budget-ms', type=float, default=50.0,
+                        help='Maximum import time in milliseconds (default: 50)')
+    parser.add_argument('--runs', type=int, default=5,
+                        help='Fresh interpreters to time; the fastest run is compared (default: 5)')
+    args = parser.parse_args()
+
+    runs = [measure() for _ in range(max(args.runs, 1))]
+    best = min(elapsed for elapsed, _ in runs) * 1000
+    loaded = sorted({name for _, names in runs for name in names})
+
+    print(f"SQLite backend import: {best:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    failed = False
+    if loaded:
+        print(f"Error: heavy modules imported: {', '.join(loaded)}")
+        failed = True
+    if best > args.budget_ms:
+        print("Error: import time over budget")
+        failed = True
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
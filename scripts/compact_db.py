@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Convert the local SQLite TLE history to compact line storage and reclaim space
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from astrolabe.backends import create_backend
+from astrolabe.config import DB_TYPE, DB_PATH
+
+
+def database_size(backend) -> int:
+    """Bytes used by the main file plus any TLE partitions"""
+    paths = [Path(DB_PATH)]
+    if hasattr(backend, 'partition_dir'):
+        paths += backend.partition_dir.glob('*.db')
+    return sum(os.path.getsize(path) for path in paths)
+
+
+def main():
+    if DB_TYPE != 'sqlite':
+        print(f"Error: configured for {DB_TYPE}, but this script compacts the local SQLite DB.")
+        return 1
+
+    if not os.path.exists(DB_PATH):
+        print(f"Error: Database file not found at {DB_PATH}")
+        return 1
+
+    backend = create_backend('sqlite')
+    size_before = database_size(backend)
+    print(f"Compacting TLE lines in {DB_PATH}...")
+    converted = backend.compact_tles()
+    print(f"Converted {converted} rows; running VACUUM...")
+    backend.vacuum()
+    size_after = database_size(backend)
+    backend.close()
+
+    print(f"Database size: {size_before / 1e6:.1f} MB -> {size_after / 1e6:.1f} MB")
+    print("Set COMPACT_LINES=1 so new rows are stored compactly as well.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
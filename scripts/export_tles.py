@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Export stored TLE history from the local SQLite DB as 2LE text
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from astrolabe.backends import create_backend
+from astrolabe.config import DB_TYPE
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export stored TLEs as line pairs, oldest first')
+    parser.add_argument('--start', help='Earliest epoch to export (ISO 8601)')
+    parser.add_argument('--end', help='Latest epoch to export (ISO 8601)')
+    parser.add_argument('--output', '-o', help='Output file (default: stdout)')
+    args = parser.parse_args()
+
+    if DB_TYPE != 'sqlite':
+        print(f"Error: configured for {DB_TYPE}, but this script exports the local SQLite DB.", file=sys.stderr)
+        return 1
+
+    backend = create_backend('sqlite')
+    out = open(args.output, 'w') if args.output else sys.stdout
+    exported = 0
+    try:
+        for rows in backend.iter_tles(args.start, args.end):
+            out.write(''.join(f"{row['tle_line1']}\n{row['tle_line2']}\n" for row in rows))
+            exported += len(rows)
+    finally:
+        if args.output:
+            out.close()
+        backend.close()
+    print(f"Exported {exported} TLEs", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+List the TLE partitions of a partitioned SQLite database and seal old ones
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from astrolabe.backends import create_backend
+from astrolabe.config import DB_TYPE, DB_PATH, SQLITE_PARTITION
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect and seal SQLite TLE partitions')
+    parser.add_argument('--seal-before', metavar='DATE',
+                        help='Make partitions ending on or before DATE (ISO 8601) read-only')
+    args = parser.parse_args()
+
+    if DB_TYPE != 'sqlite' or not SQLITE_PARTITION:
+        print("Error: set DB_TYPE=sqlite and SQLITE_PARTITION=year|month to use partitions.")
+        return 1
+
+    backend = create_backend('sqlite')
+    if args.seal_before:
+        sealed = backend.seal_partitions(args.seal_before)
+        print(f"Sealed {len(sealed)} partitions" + (f": {', '.join(sealed)}" if sealed else ''))
+
+    sealed = set(backend.sealed_partitions())
+    print(f"TLE partitions of {DB_PATH} (by {backend.partition}) in {backend.partition_dir}:")
+    for key in backend.partitions():
+        size = (backend.partition_dir / f"{key}.db").stat().st_size
+        print(f"  {key}  {size / 1e6:8.1f} MB  {'sealed' if key in sealed else 'writable'}")
+    backend.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
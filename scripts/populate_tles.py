@@ -5,7 +5,6 @@ Fetches TLE data from Celestrak and updates Supabase database
 """
 
 import sys
-import time
 from pathlib import Path
 
 # Add src to path
@@ -31,22 +30,16 @@ def main():
     choice = input("\nSelect source (1-5) or 'all' for all sources: ").strip()
 
     if choice.lower() == 'all':
-        # Process all sources
-        for key, url in CELESTRAK_URLS.items():
-            print(f"\n\nProcessing {key}...")
-            lines = updater.fetch_tle_data(url)
-            if lines:
-                updater.process_tles(lines, source=key)
-            time.sleep(2)  # Be nice to Celestrak servers
+        # Fetch all sources in parallel, then write each unique TLE once,
+        # tagged with every group it appeared in
+        updater.process_groups(CELESTRAK_URLS)
     else:
         # Process single source
         try:
             idx = int(choice) - 1
             key = list(CELESTRAK_URLS.keys())[idx]
             url = CELESTRAK_URLS[key]
-            lines = updater.fetch_tle_data(url)
-            if lines:
-                updater.process_tles(lines, source=key)
+            updater.process_tles(updater.stream_tle_data(url), source=key)
         except (ValueError, IndexError):
             print("Invalid choice")
             return 1
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Rebuild the persistent dedup (Bloom) filter from the TLEs stored in the database
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from astrolabe.backends import create_backend
+from astrolabe.bloom import BloomFilter
+from astrolabe.config import DEDUP_FILTER_PATH, DEDUP_FILTER_CAPACITY, DEDUP_FILTER_FP_RATE, validate_config
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rebuild the (norad_id, epoch) dedup filter')
+    parser.add_argument('--output', '-o', default=DEDUP_FILTER_PATH,
+                        help='Filter file (default: DEDUP_FILTER_PATH)')
+    parser.add_argument('--capacity', type=int, default=DEDUP_FILTER_CAPACITY,
+                        help='Keys to size the filter for (raised to twice the stored TLEs)')
+    parser.add_argument('--fp-rate', type=float, default=DEDUP_FILTER_FP_RATE,
+                        help='Target false-positive rate at capacity')
+    args = parser.parse_args()
+
+    if not args.output:
+        print("Error: set DEDUP_FILTER_PATH or pass --output")
+        return 1
+
+    validate_config()
+    backend = create_backend()
+    start = time.perf_counter()
+    try:
+        bloom = BloomFilter.rebuild(backend, args.capacity, args.fp_rate)
+    except NotImplementedError:
+        print("Error: this backend can't list its stored TLE keys")
+        return 1
+    finally:
+        backend.close()
+    bloom.save(args.output)
+
+    print(f"Added {len(bloom)} keys in {time.perf_counter() - start:.1f}s")
+    print(f"Filter: {bloom.size // 8 / 1e6:.1f} MB, {bloom.hashes} hashes, "
+          f"~{bloom.expected_fp_rate():.3%} false positives now")
+    print(f"Saved to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -26,22 +26,22 @@ def update_active_tles(source='celestrak'):
 
     # Fetch latest active TLEs
     if source == 'spacetrack':
-        lines = updater.fetch_tle_data('spacetrack')
+        lines = updater.stream_tle_data('spacetrack')
         source_name = 'spacetrack-daily'
     else:
         url = CELESTRAK_URLS['active']
-        lines = updater.fetch_tle_data(url)
+        lines = updater.stream_tle_data(url)
         source_name = 'celestrak-daily'
 
-    if lines:
-        updater.process_tles(lines, source=source_name)
+    processed = updater.process_tles(lines, source=source_name)
+    if processed or updater.stats['cache_hits']:
         updater.print_stats()
 
         # Output GitHub Actions summary if in CI
         if sys.stdout.isatty() == False:  # Running in CI
             stats = updater.stats
             print(
-                f"::notice title=TLE Update Complete::Added {stats['tles_added']} new TLEs, skipped {stats['tles_skipped']} duplicates")
+                f"::notice title=TLE Update Complete::Added {stats['tles_added']} new TLEs, skipped {stats['tles_skipped']} duplicates, {stats['cache_hits']} unchanged fetches")
 
         return updater.stats
 
@@ -60,6 +60,8 @@ def main():
     if stats:
         if stats['tles_added'] > 0:
             print(f"\n✅ Successfully added {stats['tles_added']} new TLEs")
+        elif stats['cache_hits']:
+            print("\nℹ️ Source unchanged since last run (fetch cache hit)")
         else:
             print("\nℹ️ No new TLEs to add (all up to date)")
         return 0
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Check astrolabe.propagate against the reference sgp4 package and time it
+
+Propagates the TLEs of a file with both implementations over a span of
+minutes since epoch and reports the largest position/velocity differences,
+then times a one-day, one-minute propagation of the whole set, a
+repeated, cached initialization and the same propagation sharded across
+worker processes (one per core unless --workers says otherwise).
+Needs the sgp4 package (pip install sgp4) for the comparison.
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from astrolabe.constants_cache import ConstantsCache
+from astrolabe.engine import PropagationEngine
+from astrolabe.parser import TLEParser
+from astrolabe.propagate import sgp4_init, sgp4_propagate
+
+# Relative part of the position/velocity tolerance, on top of the absolute one
+RTOL = 1e-10
+
+
+def reference_states(batch, tsince: np.ndarray) -> np.ndarray:
+    """(n_times, n_sats, 6) states from the sgp4 package, NaN where it reports an error"""
+    from sgp4.api import Satrec
+
+    states = np.full((len(tsince), len(batch['tle_line1']), 6), np.nan)
+    for j, (line1, line2) in enumerate(zip(batch['tle_line1'], batch['tle_line2'])):
+        satrec = Satrec.twoline2rv(line1.decode(), line2.decode())
+        for i, t in enumerate(tsince):
+            error, r, v = satrec.sgp4_tsince(float(t))
+            if error == 0:
+                states[i, j, :3] = r
+                states[i, j, 3:] = v
+    return states
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate and time the vectorized SGP4 propagator')
+    parser.add_argument('path', help='TLE file in 2LE or 3LE format')
+    parser.add_argument('--sats', type=int, default=2000,
+                        help='Element sets compared against sgp4 (default: 2000)')
+    parser.add_argument('--days', type=float, default=3.0,
+                        help='Span compared, in days from epoch (default: 3)')
+    parser.add_argument('--step', type=float, default=37.0,
+                        help='Comparison step in minutes (default: 37)')
+    parser.add_argument('--atol-km', type=float, default=1e-5,
+                        help='Allowed position difference in km, velocity in km/s (default: 1e-5)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Also time the multi-process engine with this many workers '
+                             '(default: one per core, 0 to skip)')
+    parser.add_argument('--skip-benchmark', action='store_true',
+                        help='Only compare, do not time a full-day propagation')
+    args = parser.parse_args()
+
+    batch = TLEParser.parse_many(Path(args.path).read_bytes())
+    batch = {key: values[batch['valid']] for key, values in batch.items()}
+    print(f"Loaded {len(batch['norad_id']):,} element sets")
+
+    sample = {key: values[:args.sats] for key, values in batch.items()}
+    constants = sgp4_init(sample)
+    tsince = np.arange(0.0, args.days * 1440.0 + args.step, args.step)
+    states = sgp4_propagate(constants, tsince)
+    try:
+        expected = reference_states(sample, tsince)
+    except ImportError:
+        print("Error: the sgp4 package is required for the comparison (pip install sgp4)")
+        return 1
+
+    failed = np.isnan(states) != np.isnan(expected)
+    both = ~np.isnan(states) & ~np.isnan(expected)
+    diff = np.where(both, np.abs(states - expected), 0.0)
+    failed |= diff > args.atol_km + RTOL * np.abs(np.where(both, expected, 0.0))
+
+    deep = constants['deep_space']
+    print(f"Compared {len(deep):,} satellites ({int(deep.sum()):,} deep-space) x {len(tsince)} times")
+    for label, columns in (('Near-earth', ~deep), ('Deep-space', deep)):
+        print(f"  {label} max position difference: {diff[:, columns, :3].max(initial=0.0):.3e} km, "
+              f"velocity {diff[:, columns, 3:].max(initial=0.0):.3e} km/s")
+    if failed.any():
+        bad = np.unique(np.nonzero(failed)[1])
+        ids = sample['norad_id'][bad]
+        print(f"Error: {len(bad)} satellites differ beyond tolerance: {', '.join(map(str, ids[:20]))}")
+        return 1
+    print("OK")
+
+    if not args.skip_benchmark:
+        # A second init through the cache is what repeated requests for the catalog cost
+        cache = ConstantsCache(capacity=len(batch['norad_id']), path=None)
+        start = time.perf_counter()
+        constants = cache.init(batch)
+        init_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        cache.init(batch)
+        cached_seconds = time.perf_counter() - start
+        minutes = np.arange(1440.0)
+        start = time.perf_counter()
+        states = sgp4_propagate(constants, minutes)
+        elapsed = time.perf_counter() - start
+        count = len(batch['norad_id']) * len(minutes)
+        print(f"\nOne day at one-minute steps: {len(batch['norad_id']):,} satellites")
+        print(f"  Init:      {init_seconds:.3f}s ({cached_seconds:.3f}s cached)")
+        print(f"  Propagate: {elapsed:.2f}s ({count / elapsed / 1e6:.2f}M states/sec)")
+        cache.print_stats()
+
+        if args.workers:
+            with PropagationEngine(workers=args.workers) as engine:
+                # The first call starts the workers and maps the output buffer
+                engine.propagate(constants, minutes[:1])
+                start = time.perf_counter()
+                sharded = engine.propagate(constants, minutes)
+                sharded_seconds = time.perf_counter() - start
+                same = np.array_equal(sharded, states, equal_nan=True)
+                del sharded
+                print(f"  Sharded:   {sharded_seconds:.2f}s ({count / sharded_seconds / 1e6:.2f}M states/sec, "
+                      f"{elapsed / sharded_seconds:.1f}x on {args.workers} workers)")
+                engine.print_stats()
+            if not same:
+                print("Error: sharded propagation differs from the single-process result")
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
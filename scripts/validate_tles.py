@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Screen a TLE file for malformed element sets without touching the database
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from astrolabe.parser import TLEParser, REJECT_REASONS
+from astrolabe.stream import iter_record_chunks
+
+# Records per chunk
+CHUNK_RECORDS = 200_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate a TLE file (checksums, layout, catalog numbers)')
+    parser.add_argument('path', help='TLE file in 2LE or 3LE format')
+    parser.add_argument('--show', type=int, default=20,
+                        help='Number of rejected rows to list (default: 20)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    total = 0
+    counts = {name: 0 for name in REJECT_REASONS.values()}
+    shown = 0
+
+    with open(args.path, 'rb') as f:
+        # Blank lines are dropped before chunking, so they cannot shift records
+        for chunk in iter_record_chunks(f, CHUNK_RECORDS):
+            batch = TLEParser.parse_many(chunk)
+            report = TLEParser.validate_many(batch)
+            for name, count in report['counts'].items():
+                counts[name] += count
+            for row, reasons in zip(report['rejected'], report['reasons']):
+                if shown >= args.show:
+                    break
+                flags = [name for flag, name in REJECT_REASONS.items() if reasons & flag]
+                print(f"  row {total + row}: {batch['norad_id'][row]} {','.join(flags)}")
+                shown += 1
+            total += report['total']
+
+    elapsed = time.perf_counter() - start
+    print(f"\nScreened {total} TLEs in {elapsed:.2f}s")
+    for name, count in counts.items():
+        print(f"  {name:<18} {count}")
+    return 1 if any(counts.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+-- Maintained newest-element-set-per-satellite table for the Supabase backend.
+--
+-- latest_tles used to be a view that grouped the whole tles history on every
+-- read, and every page of a read. It is now a table keyed by norad_id that a
+-- statement-level trigger advances on each insert into tles, so reading the
+-- current catalog is a primary-key scan. rebuild_latest_tles() is the
+-- full-scan repair.
+
+-- Replace the old view (a no-op once the table exists)
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_views WHERE schemaname = current_schema() AND viewname = 'latest_tles') THEN
+        DROP VIEW latest_tles;
+    END IF;
+END;
+$$;
+
+-- Same column types as tles
+CREATE TABLE IF NOT EXISTS latest_tles AS
+    SELECT norad_id, epoch, tle_line1, tle_line2, inclination, raan, eccentricity,
+           argument_of_perigee, mean_anomaly, mean_motion, revolution_number,
+           bstar, mean_motion_dot, source
+    FROM tles WITH NO DATA;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conrelid = 'latest_tles'::regclass AND contype = 'p'
+    ) THEN
+        ALTER TABLE latest_tles ADD PRIMARY KEY (norad_id);
+    END IF;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION rebuild_latest_tles() RETURNS void
+LANGUAGE sql AS $$
+    DELETE FROM latest_tles;
+    INSERT INTO latest_tles
+    SELECT DISTINCT ON (norad_id)
+        norad_id, epoch, tle_line1, tle_line2, inclination, raan, eccentricity,
+        argument_of_perigee, mean_anomaly, mean_motion, revolution_number,
+        bstar, mean_motion_dot, source
+    FROM tles ORDER BY norad_id, epoch DESC;
+$$;
+
+-- Transition tables only hold the rows each statement actually inserted, so
+-- duplicates skipped by ON CONFLICT DO NOTHING never move the table. Rows
+-- only ever advance to a newer epoch, so backfilling old history is a no-op.
+
+CREATE OR REPLACE FUNCTION latest_tles_tles_inserted() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO latest_tles
+    SELECT DISTINCT ON (norad_id)
+        norad_id, epoch, tle_line1, tle_line2, inclination, raan, eccentricity,
+        argument_of_perigee, mean_anomaly, mean_motion, revolution_number,
+        bstar, mean_motion_dot, source
+    FROM new_rows ORDER BY norad_id, epoch DESC
+    ON CONFLICT (norad_id) DO UPDATE SET
+        epoch = excluded.epoch,
+        tle_line1 = excluded.tle_line1,
+        tle_line2 = excluded.tle_line2,
+        inclination = excluded.inclination,
+        raan = excluded.raan,
+        eccentricity = excluded.eccentricity,
+        argument_of_perigee = excluded.argument_of_perigee,
+        mean_anomaly = excluded.mean_anomaly,
+        mean_motion = excluded.mean_motion,
+        revolution_number = excluded.revolution_number,
+        bstar = excluded.bstar,
+        mean_motion_dot = excluded.mean_motion_dot,
+        source = excluded.source
+    WHERE excluded.epoch > latest_tles.epoch;
+    RETURN NULL;
+END;
+$$;
+
+-- Deleting history falls back to the next newest stored element set
+CREATE OR REPLACE FUNCTION latest_tles_tles_deleted() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    DELETE FROM latest_tles l USING old_rows o
+    WHERE l.norad_id = o.norad_id AND l.epoch = o.epoch;
+    INSERT INTO latest_tles
+    SELECT DISTINCT ON (t.norad_id)
+        t.norad_id, t.epoch, t.tle_line1, t.tle_line2, t.inclination, t.raan, t.eccentricity,
+        t.argument_of_perigee, t.mean_anomaly, t.mean_motion, t.revolution_number,
+        t.bstar, t.mean_motion_dot, t.source
+    FROM tles t
+    WHERE t.norad_id IN (SELECT norad_id FROM old_rows)
+        AND NOT EXISTS (SELECT 1 FROM latest_tles l WHERE l.norad_id = t.norad_id)
+    ORDER BY t.norad_id, t.epoch DESC;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS latest_tles_tles_insert ON tles;
+CREATE TRIGGER latest_tles_tles_insert AFTER INSERT ON tles
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION latest_tles_tles_inserted();
+
+DROP TRIGGER IF EXISTS latest_tles_tles_delete ON tles;
+CREATE TRIGGER latest_tles_tles_delete AFTER DELETE ON tles
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION latest_tles_tles_deleted();
+
+-- Backfill from the existing history
+SELECT rebuild_latest_tles();
@@ -0,0 +1,129 @@
+-- Incrementally maintained statistics for the Supabase backend.
+--
+-- get_tle_stats() used to count both tables on every call. The counters now
+-- live in a single-row tle_stats table that statement-level triggers keep in
+-- step with each insert/upsert batch, so reading them is O(1).
+-- recount_tle_stats() is the full-scan repair.
+
+CREATE TABLE IF NOT EXISTS tle_stats (
+    id integer PRIMARY KEY CHECK (id = 1),
+    total_satellites bigint NOT NULL DEFAULT 0,
+    active_satellites bigint NOT NULL DEFAULT 0,
+    total_tles bigint NOT NULL DEFAULT 0,
+    latest_tle_epoch timestamptz
+);
+
+CREATE OR REPLACE FUNCTION recount_tle_stats() RETURNS void
+LANGUAGE sql AS $$
+    INSERT INTO tle_stats (id, total_satellites, active_satellites, total_tles, latest_tle_epoch)
+    SELECT 1,
+        (SELECT count(*) FROM satellites),
+        (SELECT count(*) FROM satellites WHERE is_active),
+        (SELECT count(*) FROM tles),
+        (SELECT max(epoch) FROM tles)
+    ON CONFLICT (id) DO UPDATE SET
+        total_satellites = excluded.total_satellites,
+        active_satellites = excluded.active_satellites,
+        total_tles = excluded.total_tles,
+        latest_tle_epoch = excluded.latest_tle_epoch;
+$$;
+
+-- Transition tables only hold the rows each statement actually changed, so
+-- duplicates skipped by ON CONFLICT DO NOTHING are never counted
+
+CREATE OR REPLACE FUNCTION tle_stats_tles_inserted() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE tle_stats SET
+        total_tles = total_tles + (SELECT count(*) FROM new_rows),
+        latest_tle_epoch = greatest(latest_tle_epoch, (SELECT max(epoch) FROM new_rows))
+    WHERE id = 1;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION tle_stats_tles_deleted() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE tle_stats SET
+        total_tles = total_tles - (SELECT count(*) FROM old_rows),
+        latest_tle_epoch = (SELECT max(epoch) FROM tles)
+    WHERE id = 1;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION tle_stats_satellites_inserted() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE tle_stats SET
+        total_satellites = total_satellites + (SELECT count(*) FROM new_rows),
+        active_satellites = active_satellites + (SELECT count(*) FROM new_rows WHERE is_active)
+    WHERE id = 1;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION tle_stats_satellites_updated() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE tle_stats SET
+        active_satellites = active_satellites
+            + (SELECT count(*) FROM new_rows WHERE is_active)
+            - (SELECT count(*) FROM old_rows WHERE is_active)
+    WHERE id = 1;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION tle_stats_satellites_deleted() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE tle_stats SET
+        total_satellites = total_satellites - (SELECT count(*) FROM old_rows),
+        active_satellites = active_satellites - (SELECT count(*) FROM old_rows WHERE is_active)
+    WHERE id = 1;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS tle_stats_tles_insert ON tles;
+CREATE TRIGGER tle_stats_tles_insert AFTER INSERT ON tles
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION tle_stats_tles_inserted();
+
+DROP TRIGGER IF EXISTS tle_stats_tles_delete ON tles;
+CREATE TRIGGER tle_stats_tles_delete AFTER DELETE ON tles
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION tle_stats_tles_deleted();
+
+DROP TRIGGER IF EXISTS tle_stats_satellites_insert ON satellites;
+CREATE TRIGGER tle_stats_satellites_insert AFTER INSERT ON satellites
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION tle_stats_satellites_inserted();
+
+DROP TRIGGER IF EXISTS tle_stats_satellites_update ON satellites;
+CREATE TRIGGER tle_stats_satellites_update AFTER UPDATE ON satellites
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION tle_stats_satellites_updated();
+
+DROP TRIGGER IF EXISTS tle_stats_satellites_delete ON satellites;
+CREATE TRIGGER tle_stats_satellites_delete AFTER DELETE ON satellites
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION tle_stats_satellites_deleted();
+
+-- Replaces the scanning version; same result shape as before
+DROP FUNCTION IF EXISTS get_tle_stats();
+CREATE FUNCTION get_tle_stats()
+RETURNS TABLE (
+    total_satellites bigint,
+    active_satellites bigint,
+    total_tles bigint,
+    latest_tle_epoch timestamptz
+)
+LANGUAGE sql STABLE AS $$
+    SELECT total_satellites, active_satellites, total_tles, latest_tle_epoch
+    FROM tle_stats WHERE id = 1;
+$$;
+
+SELECT recount_tle_stats();
@@ -0,0 +1,192 @@
+"""Append-only columnar archive of element sets, readable via numpy.memmap"""
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .config import ARCHIVE_DIR
+
+# Fixed-width columns mirroring the numeric fields of the tles table
+COLUMNS = {
+    'norad_id': np.dtype('<i4'),
+    'epoch': np.dtype('<M8[us]'),
+    'inclination': np.dtype('<f8'),
+    'raan': np.dtype('<f8'),
+    'eccentricity': np.dtype('<f8'),
+    'argument_of_perigee': np.dtype('<f8'),
+    'mean_anomaly': np.dtype('<f8'),
+    'mean_motion': np.dtype('<f8'),
+    'revolution_number': np.dtype('<i4'),
+    'bstar': np.dtype('<f8'),
+    'mean_motion_dot': np.dtype('<f8'),
+}
+
+INDEX_FILE = 'index.json'
+
+# Dedup keys pack norad_id above the microsecond offset into the month
+# (31 days < 2**42 us; catalog numbers < 2**19 even with Alpha-5)
+_KEY_SHIFT = 42
+
+
+def _as_datetime64(value) -> np.datetime64:
+    return np.datetime64(value, 'us')
+
+
+class ColumnarArchive:
+    """Per-month segments of fixed-width column files plus a JSON index.
+
+    Each segment directory (``YYYY-MM``) holds one raw little-endian file per
+    column in ``COLUMNS``, so any column maps straight into a numpy array with
+    no parsing or copying. ``index.json`` records the committed row count and
+    epoch range of every segment; it is replaced atomically after the column
+    files are flushed, so a crash mid-append leaves only an ignored tail that
+    the next append truncates. Rows are deduplicated on (norad_id, epoch).
+    """
+
+    def __init__(self, root: str = ARCHIVE_DIR, key_cache_segments: int = 12):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.key_cache_segments = key_cache_segments
+        self._keys: 'OrderedDict[str, np.ndarray]' = OrderedDict()
+        self._index = self._read_index()
+
+    def _read_index(self) -> Dict:
+        try:
+            index = json.loads((self.root / INDEX_FILE).read_text())
+        except (OSError, ValueError):
+            return {'columns': {name: dtype.str for name, dtype in COLUMNS.items()}, 'segments': {}}
+        stored = {name: np.dtype(dtype) for name, dtype in index['columns'].items()}
+        if stored != COLUMNS:
+            raise ValueError(f"Archive at {self.root} has a different column layout")
+        return index
+
+    def _write_index(self):
+        path = self.root / INDEX_FILE
+        tmp = path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(self._index, indent=1, sort_keys=True))
+        os.replace(tmp, path)
+
+    def __len__(self) -> int:
+        return sum(meta['rows'] for meta in self._index['segments'].values())
+
+    def segments(self, start=None, end=None) -> List[str]:
+        """Names of the segments whose epochs overlap [start, end], in order"""
+        lo = None if start is None else _as_datetime64(start).astype(np.int64)
+        hi = None if end is None else _as_datetime64(end).astype(np.int64)
+        return [
+            name for name, meta in sorted(self._index['segments'].items())
+            if (lo is None or meta['epoch_max'] >= lo) and (hi is None or meta['epoch_min'] <= hi)
+        ]
+
+    def open_segment(self, name: str, columns: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+        """Map a segment's columns read-only; no data is read until touched"""
+        rows = self._index['segments'][name]['rows']
+        mapped = {}
+        for column in columns or COLUMNS:
+            mapped[column] = np.memmap(
+                self.root / name / f"{column}.bin", dtype=COLUMNS[column], mode='r', shape=(rows,)
+            )
+        return mapped
+
+    def iter_segments(self, columns: Optional[Iterable[str]] = None,
+                      start=None, end=None) -> Iterator[Tuple[str, Dict[str, np.ndarray]]]:
+        """Yield (name, mapped columns) for each segment overlapping the range"""
+        columns = list(columns or COLUMNS)
+        for name in self.segments(start, end):
+            yield name, self.open_segment(name, columns)
+
+    def read(self, columns: Optional[Iterable[str]] = None, start=None, end=None) -> Dict[str, np.ndarray]:
+        """Concatenate columns across segments, keeping rows with start <= epoch <= end.
+
+        A single unfiltered segment is returned as its memmaps; otherwise the
+        result is one sequential copy per column.
+        """
+        columns = list(columns or COLUMNS)
+        wanted = columns if (start is None and end is None) or 'epoch' in columns else columns + ['epoch']
+        parts = [mapped for _, mapped in self.iter_segments(wanted, start, end)]
+        if start is not None or end is not None:
+            lo = _as_datetime64(start) if start is not None else None
+            hi = _as_datetime64(end) if end is not None else None
+            filtered = []
+            for mapped in parts:
+                epoch = mapped['epoch']
+                keep = np.ones(len(epoch), dtype=bool)
+                if lo is not None:
+                    keep &= epoch >= lo
+                if hi is not None:
+                    keep &= epoch <= hi
+                filtered.append({column: mapped[column][keep] for column in columns})
+            parts = filtered
+        if len(parts) == 1:
+            return {column: parts[0][column] for column in columns}
+        return {
+            column: np.concatenate([mapped[column] for mapped in parts])
+            if parts else np.empty(0, dtype=COLUMNS[column])
+            for column in columns
+        }
+
+    def _segment_keys(self, name: str) -> np.ndarray:
+        """Sorted dedup keys of a segment, cached for the most recent segments"""
+        keys = self._keys.pop(name, None)
+        if keys is None:
+            if name in self._index['segments']:
+                mapped = self.open_segment(name, ('norad_id', 'epoch'))
+                keys = np.sort(self._pack_keys(name, mapped['norad_id'], mapped['epoch']))
+            else:
+                keys = np.empty(0, dtype=np.int64)
+        self._keys[name] = keys
+        while len(self._keys) > self.key_cache_segments:
+            self._keys.popitem(last=False)
+        return keys
+
+    @staticmethod
+    def _pack_keys(name: str, norad_ids: np.ndarray, epochs: np.ndarray) -> np.ndarray:
+        offset = epochs.astype('datetime64[us]').astype(np.int64) - _as_datetime64(name).astype(np.int64)
+        return (norad_ids.astype(np.int64) << _KEY_SHIFT) | offset
+
+    def append(self, batch: Dict[str, np.ndarray], mask: Optional[np.ndarray] = None) -> int:
+        """Append rows (e.g. a ``TLEParser.parse_many`` batch) and return how many were new"""
+        if mask is None:
+            mask = np.ones(len(batch['norad_id']), dtype=bool)
+        epochs = batch['epoch'][mask].astype('datetime64[us]')
+        months = epochs.astype('datetime64[M]')
+        selected = np.flatnonzero(mask)
+        added = 0
+        for month in np.unique(months):
+            rows = selected[months == month]
+            added += self._append_segment(str(month), {column: batch[column][rows] for column in COLUMNS})
+        if added:
+            self._write_index()
+        return added
+
+    def _append_segment(self, name: str, columns: Dict[str, np.ndarray]) -> int:
+        keys = self._pack_keys(name, columns['norad_id'], columns['epoch'])
+        existing = self._segment_keys(name)
+        # First occurrence of each key in the batch, minus keys already stored
+        keys, first = np.unique(keys, return_index=True)
+        pos = np.minimum(np.searchsorted(existing, keys), max(len(existing) - 1, 0))
+        new = (existing[pos] != keys) if len(existing) else np.ones(len(keys), dtype=bool)
+        if not new.any():
+            return 0
+        rows = np.sort(first[new])
+
+        meta = self._index['segments'].get(name, {'rows': 0})
+        directory = self.root / name
+        directory.mkdir(exist_ok=True)
+        for column, dtype in COLUMNS.items():
+            with open(directory / f"{column}.bin", 'ab') as f:
+                # Drop any tail left by an append that never reached the index
+                f.truncate(meta['rows'] * dtype.itemsize)
+                f.write(np.ascontiguousarray(columns[column][rows], dtype=dtype).tobytes())
+
+        epochs = columns['epoch'][rows].astype('datetime64[us]').astype(np.int64)
+        self._index['segments'][name] = {
+            'rows': meta['rows'] + len(rows),
+            'epoch_min': int(min(epochs.min(), meta.get('epoch_min', epochs.min()))),
+            'epoch_max': int(max(epochs.max(), meta.get('epoch_max', epochs.max()))),
+        }
+        self._keys[name] = np.insert(existing, np.searchsorted(existing, keys[new]), keys[new])
+        return len(rows)
@@ -0,0 +1,48 @@
+"""Storage backends, imported only when selected
+
+Each backend module pulls in its own client library (supabase, psycopg, ...),
+so the registry maps a DB_TYPE name to where its class lives and
+``create_backend`` imports just that one.
+"""
+import importlib
+from typing import Dict, Optional, Tuple
+
+from ..config import DB_TYPE, DB_PATH, POSTGRES_DSN, SQLITE_PARTITION
+from .base import DatabaseBackend, TLE_COLUMNS
+
+# DB_TYPE -> (module, class name)
+BACKENDS: Dict[str, Tuple[str, str]] = {
+    'sqlite': ('astrolabe.backends.sqlite', 'SQLiteBackend'),
+    'sqlite-partitioned': ('astrolabe.backends.partitioned', 'PartitionedSQLiteBackend'),
+    'postgres': ('astrolabe.backends.postgres', 'PostgresBackend'),
+    'supabase': ('astrolabe.backends.supabase', 'SupabaseBackend'),
+}
+
+
+def register_backend(name: str, module: str, class_name: str):
+    """Make a DatabaseBackend subclass selectable as DB_TYPE=name"""
+    BACKENDS[name] = (module, class_name)
+
+
+def get_backend_class(name: str) -> type:
+    """Import and return the backend class registered under name"""
+    try:
+        module, class_name = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown backend {name!r}; expected one of {', '.join(sorted(BACKENDS))}")
+    return getattr(importlib.import_module(module), class_name)
+
+
+def create_backend(name: Optional[str] = None) -> DatabaseBackend:
+    """Open the configured backend (DB_TYPE by default) with its settings from config"""
+    name = name or DB_TYPE
+    if name == 'sqlite' and SQLITE_PARTITION:
+        name = 'sqlite-partitioned'
+    backend_class = get_backend_class(name)
+    if name == 'sqlite':
+        return backend_class(DB_PATH)
+    if name == 'sqlite-partitioned':
+        return backend_class(DB_PATH, SQLITE_PARTITION or 'year')
+    if name == 'postgres':
+        return backend_class(POSTGRES_DSN)
+    return backend_class()
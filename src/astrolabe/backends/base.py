@@ -0,0 +1,123 @@
+"""Backend interface and helpers shared by every database backend"""
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
+
+
+# Element-set columns written to the tles table, in insert order
+TLE_COLUMNS = (
+    'norad_id', 'epoch', 'tle_line1', 'tle_line2',
+    'inclination', 'raan', 'eccentricity', 'argument_of_perigee',
+    'mean_anomaly', 'mean_motion', 'revolution_number',
+    'bstar', 'mean_motion_dot', 'source',
+)
+
+
+Epoch = Union[datetime, str]
+
+
+def _epoch_text(t: Epoch) -> str:
+    """Render a query time in the stored epoch format (naive UTC ISO 8601)"""
+    if isinstance(t, datetime):
+        if t.tzinfo is not None:
+            t = t.replace(tzinfo=None) - t.utcoffset()
+        return t.isoformat()
+    return t
+
+
+def _closest(candidates: List[Dict], t: Epoch) -> Optional[Dict]:
+    """Pick the row whose epoch is nearest to t"""
+    nearest = _closest_by_id(candidates, t)
+    return next(iter(nearest.values()), None)
+
+
+def _closest_by_id(candidates: List[Dict], t: Epoch) -> Dict[int, Dict]:
+    """For each norad_id among the candidate rows, keep the one nearest to t"""
+    if not candidates:
+        return {}
+    # Imported here so opening a backend doesn't pay for NumPy
+    import numpy as np
+    from ..index import to_datetime64
+
+    target = np.datetime64(_epoch_text(t), 'us')
+    distance = np.abs(to_datetime64(row['epoch'] for row in candidates) - target)
+    nearest: Dict[int, Dict] = {}
+    # Visit rows from farthest to nearest so the nearest one wins
+    for i in np.argsort(distance)[::-1]:
+        nearest[candidates[i]['norad_id']] = candidates[i]
+    return nearest
+
+
+class DatabaseBackend(ABC):
+    """Abstract base class for database backends"""
+
+    # Whether write calls may run on several threads at once
+    concurrent_writes = False
+
+    @abstractmethod
+    def upsert_satellites(self, satellites: List[Dict]) -> int:
+        """Upsert satellites and return count of updated rows"""
+        pass
+
+    @abstractmethod
+    def insert_tles(self, tles: List[Dict]) -> int:
+        """Insert TLEs and return count of added rows (skipping duplicates)"""
+        pass
+
+    @abstractmethod
+    def get_stats(self) -> Dict:
+        """Get database statistics"""
+        pass
+
+    def recount_stats(self) -> Dict:
+        """Rebuild maintained statistics from a full scan and return them"""
+        return self.get_stats()
+
+    def get_latest_epochs(self) -> Dict[int, str]:
+        """Map norad_id to the newest stored TLE epoch"""
+        return {}
+
+    def get_current_catalog(self) -> List[Dict]:
+        """Return the newest stored TLE of every satellite"""
+        raise NotImplementedError
+
+    def get_satellite_fingerprints(self) -> Dict[int, tuple]:
+        """Map norad_id to the stored (name, international_designator)"""
+        return {}
+
+    def get_tles(self, norad_id: int, start: Epoch, end: Epoch) -> List[Dict]:
+        """Return a satellite's TLEs with start <= epoch <= end, oldest first"""
+        return self.get_tles_many([norad_id], start, end).get(norad_id, [])
+
+    def get_tles_many(self, norad_ids: List[int], start: Epoch, end: Epoch) -> Dict[int, List[Dict]]:
+        """Batched ``get_tles``: map each norad_id to its TLEs in the range"""
+        raise NotImplementedError
+
+    def get_tle_nearest(self, norad_id: int, t: Epoch) -> Optional[Dict]:
+        """Return the satellite's TLE whose epoch is closest to t"""
+        return self.get_tle_nearest_many([norad_id], t).get(norad_id)
+
+    def get_tle_nearest_many(self, norad_ids: List[int], t: Epoch) -> Dict[int, Dict]:
+        """Batched ``get_tle_nearest``; satellites with no TLEs are omitted"""
+        raise NotImplementedError
+
+    def known_tles(self, keys: List[Tuple[int, str]]) -> Set[Tuple[int, str]]:
+        """The (norad_id, epoch) keys that are already stored.
+
+        The default knows none, leaving duplicates to ``insert_tles``.
+        """
+        return set()
+
+    def iter_tle_keys(self, chunk_size: int = 100000) -> Iterator[Tuple[List[int], List[str]]]:
+        """Yield (norad_ids, epochs) of every stored TLE, in chunks"""
+        raise NotImplementedError
+
+    @contextmanager
+    def bulk(self):
+        """Group all writes made inside the block into one bulk run"""
+        yield self
+
+    def close(self):
+        """Release any connections held by the backend"""
+        pass
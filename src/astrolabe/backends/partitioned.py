@@ -0,0 +1,381 @@
+"""SQLite backend with the TLE history split into per-year or per-month files"""
+import sqlite3
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import quote
+
+from ..config import COMPACT_LINES, SQLITE_PARTITION
+from .base import Epoch, TLE_COLUMNS, _closest_by_id, _epoch_text
+from .sqlite import SQLiteBackend
+
+# Leading characters of an ISO epoch that name its partition
+KEY_WIDTH = {'year': 4, 'month': 7}
+
+# Same layout as the main tles table, minus the foreign key (it can't span files)
+_TLES_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS tles (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        norad_id INTEGER,
+        epoch TIMESTAMP,
+        tle_line1 TEXT,
+        tle_line2 TEXT,
+        inclination REAL,
+        raan REAL,
+        eccentricity REAL,
+        argument_of_perigee REAL,
+        mean_anomaly REAL,
+        mean_motion REAL,
+        revolution_number INTEGER,
+        bstar REAL,
+        mean_motion_dot REAL,
+        source TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        line_residual BLOB,
+        UNIQUE(norad_id, epoch)
+    )
+"""
+
+
+def _uri(path: Path, **params) -> str:
+    """SQLite URI for a database file, e.g. with mode=ro"""
+    query = '&'.join(f"{key}={value}" for key, value in params.items())
+    return f"file:{quote(str(Path(path).resolve()))}" + (f"?{query}" if query else '')
+
+
+class PartitionedSQLiteBackend(SQLiteBackend):
+    """SQLite backend keeping each year's (or month's) TLEs in its own file.
+
+    The main database holds satellites, latest_tles, db_stats and the list
+    of sealed partitions; history rows live in ``<stem>_tles/<key>.db``
+    files that are ATTACHed only when an insert or query touches their
+    epoch range, and detached least-recently-used first once SQLite's
+    attach limit is reached. Inserts are routed by epoch, range queries
+    attach just the overlapping partitions, and nearest-epoch lookups work
+    outward from the partition holding t, so recent-data queries cost the
+    same however long the history grows.
+
+    ``seal_partitions`` checkpoints and vacuums old partitions and marks
+    them immutable: they are then attached read-only with no locking, and
+    their files can be backed up or cached once. A later write into a
+    sealed partition unseals it.
+
+    Commits are atomic per file, not across files: a crash between them
+    can leave db_stats or latest_tles behind the history, which
+    ``recount_stats`` and ``rebuild_latest_tles`` repair. A bulk run that
+    needs more partitions than can be attached at once commits before
+    detaching one.
+    """
+
+    def __init__(self, db_path: str, partition: str = SQLITE_PARTITION or 'year',
+                 compact_lines: bool = COMPACT_LINES):
+        if partition not in KEY_WIDTH:
+            raise ValueError(f"Unknown partitioning {partition!r}; expected 'year' or 'month'")
+        self.partition = partition
+        self.partition_dir = Path(db_path).parent / f"{Path(db_path).stem}_tles"
+        self._key_width = KEY_WIDTH[partition]
+        # Partition key -> whether it is attached writable, in LRU order
+        self._attached: 'OrderedDict[str, bool]' = OrderedDict()
+        self._partitions: set = set()
+        self._sealed: set = set()
+        super().__init__(db_path, compact_lines)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            # Opened by URI so ATTACH accepts read-only/immutable partition URIs
+            self._conn = sqlite3.connect(_uri(self.db_path), uri=True, check_same_thread=False)
+            for pragma in self.PRAGMAS:
+                self._conn.execute(pragma)
+            # One slot stays free for the temporary database VACUUM attaches
+            self._max_attached = self._conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED) - 1
+        return self._conn
+
+    def close(self):
+        super().close()
+        self._attached.clear()
+
+    def _init_db(self):
+        conn = self._connect()
+        conn.execute("CREATE TABLE IF NOT EXISTS sealed_partitions (name TEXT PRIMARY KEY)")
+        # Oldest stored epoch per satellite, the counterpart of latest_tles:
+        # together they bound which partitions can hold a satellite's rows
+        conn.execute("CREATE TABLE IF NOT EXISTS first_epochs (norad_id INTEGER PRIMARY KEY, epoch TIMESTAMP)")
+        conn.commit()
+        self._sealed = {name for (name,) in conn.execute("SELECT name FROM sealed_partitions")}
+        self.partition_dir.mkdir(parents=True, exist_ok=True)
+        self._partitions = {path.stem for path in self.partition_dir.glob('*.db')}
+        if any(len(key) != self._key_width for key in self._partitions):
+            raise ValueError(f"{self.partition_dir} is not partitioned by {self.partition}")
+        has_tles = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tles'"
+        ).fetchone()
+        if has_tles:
+            self._migrate_tles()
+        super()._init_db()
+        if conn.execute("SELECT 1 FROM first_epochs LIMIT 1").fetchone() is None:
+            self._rebuild_first_epochs()
+
+    def _migrate_tles(self):
+        """Move rows of a single-file tles table into partitions"""
+        conn = self._connect()
+        keys = [key for (key,) in conn.execute(
+            f"SELECT DISTINCT substr(epoch, 1, {self._key_width}) FROM main.tles"
+        )]
+        if not keys:
+            return
+        print(f"Moving TLE history into {len(keys)} {self.partition} partitions...")
+        columns = ', '.join(TLE_COLUMNS) + ', line_residual'
+        for key in sorted(keys):
+            schema = self._attach(key, write=True)
+            bounds = self._bounds(key)
+            conn.execute(f"""
+                INSERT OR IGNORE INTO {schema}.tles ({columns})
+                SELECT {columns} FROM main.tles WHERE epoch >= ? AND epoch < ? ORDER BY id
+            """, bounds)
+            conn.execute("DELETE FROM main.tles WHERE epoch >= ? AND epoch < ?", bounds)
+            conn.commit()
+
+    def _key(self, t: Epoch) -> str:
+        return _epoch_text(t)[:self._key_width]
+
+    def _bounds(self, key: str) -> tuple:
+        """[low, high) epoch text bounds of a partition"""
+        if self.partition == 'year':
+            return key, str(int(key) + 1)
+        year, month = int(key[:4]), int(key[5:7])
+        return key, f"{year + month // 12:04d}-{month % 12 + 1:02d}"
+
+    @staticmethod
+    def _schema(key: str) -> str:
+        return 'p' + key.replace('-', '_')
+
+    def partitions(self, start: Optional[Epoch] = None, end: Optional[Epoch] = None) -> List[str]:
+        """Keys of the partitions overlapping [start, end], oldest first"""
+        low = self._key(start) if start is not None else ''
+        high = self._key(end) if end is not None else '~'
+        return sorted(key for key in self._partitions if low <= key <= high)
+
+    def _create_partition(self, key: str):
+        """Create a partition file in WAL mode (can't be switched inside a transaction)"""
+        path = self.partition_dir / f"{key}.db"
+        conn = sqlite3.connect(path)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_TLES_SCHEMA)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_tles_epoch_norad ON tles(epoch, norad_id)")
+            conn.commit()
+        finally:
+            conn.close()
+        self._partitions.add(key)
+
+    def _detach(self, key: str):
+        conn = self._connect()
+        # SQLite refuses to detach a database the open transaction has used
+        if conn.in_transaction:
+            conn.commit()
+        conn.execute(f"DETACH DATABASE {self._schema(key)}")
+        del self._attached[key]
+
+    def _attach(self, key: str, write: bool = False) -> str:
+        """Attach a partition (creating it for writes) and return its schema name"""
+        schema = self._schema(key)
+        if key in self._attached and (self._attached[key] or not write):
+            self._attached.move_to_end(key)
+            return schema
+        if key in self._attached:
+            # Attached immutable; reopen it writable
+            self._detach(key)
+        if write and key in self._sealed:
+            print(f"Unsealing TLE partition {key} for writing")
+            self._sealed.discard(key)
+            self._connect().execute("DELETE FROM sealed_partitions WHERE name = ?", (key,))
+        if key not in self._partitions:
+            self._create_partition(key)
+        while len(self._attached) >= self._max_attached:
+            self._detach(next(iter(self._attached)))
+
+        path = self.partition_dir / f"{key}.db"
+        sealed = key in self._sealed
+        uri = _uri(path, mode='ro', immutable=1) if sealed else _uri(path)
+        conn = self._connect()
+        conn.execute(f"ATTACH DATABASE ? AS {schema}", (uri,))
+        conn.execute(f"PRAGMA {schema}.mmap_size=268435456")
+        self._attached[key] = not sealed
+        return schema
+
+    def seal_partitions(self, before: Epoch) -> List[str]:
+        """Make partitions ending at or before ``before`` read-only; returns their keys"""
+        conn = self._connect()
+        cutoff = _epoch_text(before)
+        sealed = []
+        for key in self.partitions():
+            if key in self._sealed or self._bounds(key)[1] > cutoff:
+                continue
+            schema = self._attach(key, write=True)
+            conn.commit()
+            conn.execute(f"ANALYZE {schema}")
+            conn.execute(f"VACUUM {schema}")
+            conn.execute(f"PRAGMA {schema}.journal_mode=DELETE")
+            self._detach(key)
+            conn.execute("INSERT OR IGNORE INTO sealed_partitions VALUES (?)", (key,))
+            conn.commit()
+            self._sealed.add(key)
+            sealed.append(key)
+        return sealed
+
+    def sealed_partitions(self) -> List[str]:
+        return sorted(self._sealed)
+
+    def rebuild_latest_tles(self):
+        """Repopulate latest_tles from every partition"""
+        columns = ', '.join(TLE_COLUMNS)
+        conn = self._connect()
+        conn.execute("DELETE FROM latest_tles")
+        # Newest partition first, so a satellite's first row is its latest
+        for key in reversed(self.partitions()):
+            schema = self._attach(key)
+            conn.execute(f"""
+                INSERT INTO latest_tles ({columns})
+                SELECT {columns} FROM (
+                    SELECT {columns}, MAX(epoch) FROM {schema}.tles GROUP BY norad_id
+                ) WHERE true
+                ON CONFLICT(norad_id) DO NOTHING
+            """)
+            self._restore_latest_lines(f"{schema}.tles")
+        self._rebuild_first_epochs()
+
+    def _rebuild_first_epochs(self):
+        conn = self._connect()
+        conn.execute("DELETE FROM first_epochs")
+        # Oldest partition first, so a satellite's first row is its earliest
+        for key in self.partitions():
+            conn.execute(f"""
+                INSERT INTO first_epochs (norad_id, epoch)
+                SELECT norad_id, MIN(epoch) FROM {self._attach(key)}.tles GROUP BY norad_id
+                ON CONFLICT(norad_id) DO NOTHING
+            """)
+        self._commit()
+
+    def compact_tles(self, batch_size: int = 50000) -> int:
+        """Compact the lines of every unsealed partition; see SQLiteBackend.compact_tles"""
+        return sum(
+            self._compact_table(f"{self._attach(key, write=True)}.tles", batch_size)
+            for key in self.partitions() if key not in self._sealed
+        )
+
+    def vacuum(self):
+        super().vacuum()
+        conn = self._connect()
+        for key in self.partitions():
+            if key not in self._sealed:
+                schema = self._attach(key, write=True)
+                conn.commit()
+                conn.execute(f"VACUUM {schema}")
+
+    def iter_tles(self, start: Optional[Epoch] = None, end: Optional[Epoch] = None,
+                  chunk_size: int = 50000) -> Iterator[List[Dict]]:
+        # Partitions cover disjoint epoch ranges, so visiting them in order
+        # keeps the (epoch, norad_id) ordering
+        for key in self.partitions(start, end):
+            yield from self._iter_table(f"{self._attach(key)}.tles", start, end, chunk_size)
+
+    def _insert_history(self, history: List[tuple]) -> int:
+        by_key: Dict[str, List[tuple]] = {}
+        for row in history:
+            by_key.setdefault(self._key(row[1]), []).append(row)
+        conn = self._connect()
+        columns = ', '.join(TLE_COLUMNS)
+        placeholders = ', '.join('?' * len(TLE_COLUMNS))
+        added = 0
+        for key, rows in sorted(by_key.items()):
+            schema = self._attach(key, write=True)
+            before = conn.total_changes
+            conn.executemany(
+                f"INSERT OR IGNORE INTO {schema}.tles ({columns}, line_residual) VALUES ({placeholders}, ?)",
+                rows
+            )
+            added += conn.total_changes - before
+        first: Dict[int, str] = {}
+        for row in history:
+            first[row[0]] = min(first.get(row[0], row[1]), row[1])
+        conn.executemany("""
+            INSERT INTO first_epochs (norad_id, epoch) VALUES (?, ?)
+            ON CONFLICT(norad_id) DO UPDATE SET epoch = excluded.epoch WHERE excluded.epoch < first_epochs.epoch
+        """, first.items())
+        return added
+
+    def get_tles_many(self, norad_ids: List[int], start: Epoch, end: Epoch) -> Dict[int, List[Dict]]:
+        self._load_query_ids(norad_ids)
+        grouped: Dict[int, List[Dict]] = {}
+        # Oldest partition first keeps each satellite's rows in epoch order
+        for key in self.partitions(start, end):
+            for row in self._read_range(f"{self._attach(key)}.tles", start, end):
+                grouped.setdefault(row['norad_id'], []).append(row)
+        return grouped
+
+    def get_tle_nearest_many(self, norad_ids: List[int], t: Epoch) -> Dict[int, Dict]:
+        t = _epoch_text(t)
+        key = self._key(t)
+        conn = self._connect()
+        columns = ', '.join(f"l.{column}" for column in TLE_COLUMNS)
+        candidates: List[Dict] = []
+        for pick, op, keys in (
+            ('MAX', '<=', [k for k in reversed(self.partitions()) if k <= key]),
+            ('MIN', '>=', [k for k in self.partitions() if k >= key]),
+        ):
+            self._load_query_ids(norad_ids)
+            if pick == 'MAX':
+                # A satellite whose newest TLE is at/before t needs no history
+                # lookup, and one whose oldest is after t has nothing to find
+                candidates.extend(self._read_tles(conn.execute(f"""
+                    SELECT {columns}, NULL FROM query_ids q
+                    CROSS JOIN latest_tles l ON l.norad_id = q.norad_id
+                    WHERE l.epoch <= ?
+                """, (t,))))
+                conn.execute("""
+                    DELETE FROM query_ids WHERE NOT EXISTS (
+                        SELECT 1 FROM latest_tles l CROSS JOIN first_epochs f ON f.norad_id = l.norad_id
+                        WHERE l.norad_id = query_ids.norad_id AND l.epoch > ? AND f.epoch <= ?
+                    )
+                """, (t, t))
+            else:
+                # Only satellites with a TLE after t have one to find
+                conn.execute("""
+                    DELETE FROM query_ids WHERE NOT EXISTS (
+                        SELECT 1 FROM latest_tles l WHERE l.norad_id = query_ids.norad_id AND l.epoch > ?
+                    )
+                """, (t,))
+            # Walk outward from t's partition, dropping satellites once found
+            for k in keys:
+                if conn.execute("SELECT 1 FROM query_ids LIMIT 1").fetchone() is None:
+                    break
+                found = self._read_nearest(f"{self._attach(k)}.tles", pick, op, t)
+                conn.executemany("DELETE FROM query_ids WHERE norad_id = ?", [(row['norad_id'],) for row in found])
+                candidates.extend(found)
+        self._commit()
+        return _closest_by_id(candidates, t)
+
+    def known_tles(self, keys: List[Tuple[int, str]]) -> Set[Tuple[int, str]]:
+        if not keys:
+            return set()
+        self._load_query_keys(keys)
+        epochs = [epoch for _, epoch in keys]
+        known: Set[Tuple[int, str]] = set()
+        for key in self.partitions(min(epochs), max(epochs)):
+            known |= self._known_in(f"{self._attach(key)}.tles")
+        return known
+
+    def iter_tle_keys(self, chunk_size: int = 100000) -> Iterator[Tuple[List[int], List[str]]]:
+        for key in self.partitions():
+            yield from self._iter_table_keys(f"{self._attach(key)}.tles", chunk_size)
+
+    def _tle_totals(self) -> tuple:
+        conn = self._connect()
+        total, latest = 0, None
+        for key in self.partitions():
+            count, newest = conn.execute(
+                f"SELECT COUNT(*), MAX(epoch) FROM {self._attach(key)}.tles"
+            ).fetchone()
+            total += count
+            latest = newest if newest is not None else latest
+        return total, latest
@@ -0,0 +1,328 @@
+"""PostgreSQL backend using COPY staging and a connection pool"""
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+try:
+    import psycopg
+    from psycopg_pool import ConnectionPool
+except ImportError:  # optional: only needed for DB_TYPE=postgres
+    psycopg = None
+
+from ..config import POSTGRES_DSN, POSTGRES_POOL_MIN, POSTGRES_POOL_MAX
+from .base import DatabaseBackend, Epoch, TLE_COLUMNS, _closest_by_id, _epoch_text
+
+
+class PostgresBackend(DatabaseBackend):
+    """PostgreSQL backend talking to the server directly.
+
+    Rows are streamed into per-connection temp staging tables with COPY and
+    merged with a single ``INSERT ... SELECT ... ON CONFLICT`` per batch.
+    Connections come from a pool and are reused across batches; a bulk run
+    keeps one of them, and its transaction, for the whole block.
+    """
+
+    def __init__(self, dsn: str = POSTGRES_DSN):
+        if psycopg is None:
+            raise ImportError("PostgreSQL backend needs psycopg: pip install 'astrolabe[postgres]'")
+        self.pool = ConnectionPool(
+            dsn, min_size=POSTGRES_POOL_MIN, max_size=POSTGRES_POOL_MAX, open=True
+        )
+        self._bulk_conn = None
+        self._init_db()
+
+    @contextmanager
+    def _connection(self):
+        """Yield the bulk run's connection, or a pooled one committed on exit"""
+        if self._bulk_conn is not None:
+            # A savepoint per call keeps one failed batch from aborting the run
+            with self._bulk_conn.transaction():
+                yield self._bulk_conn
+            return
+        with self.pool.connection() as conn:
+            yield conn
+
+    @contextmanager
+    def bulk(self):
+        """Run all writes in the block as a single transaction"""
+        if self._bulk_conn is not None:
+            yield self
+            return
+        with self.pool.connection() as conn, conn.transaction():
+            self._bulk_conn = conn
+            try:
+                yield self
+            finally:
+                self._bulk_conn = None
+
+    def close(self):
+        self.pool.close()
+
+    def _init_db(self):
+        """Initialize database schema"""
+        with self._connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS satellites (
+                    norad_id INTEGER PRIMARY KEY,
+                    name TEXT,
+                    international_designator TEXT,
+                    is_active BOOLEAN DEFAULT TRUE,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS tles (
+                    id BIGSERIAL PRIMARY KEY,
+                    norad_id INTEGER,
+                    epoch TIMESTAMP,
+                    tle_line1 TEXT,
+                    tle_line2 TEXT,
+                    inclination DOUBLE PRECISION,
+                    raan DOUBLE PRECISION,
+                    eccentricity DOUBLE PRECISION,
+                    argument_of_perigee DOUBLE PRECISION,
+                    mean_anomaly DOUBLE PRECISION,
+                    mean_motion DOUBLE PRECISION,
+                    revolution_number INTEGER,
+                    bstar DOUBLE PRECISION,
+                    mean_motion_dot DOUBLE PRECISION,
+                    source TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE (norad_id, epoch)
+                )
+            """)
+            # Newest element set per satellite, advanced by insert_tles
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS latest_tles (
+                    norad_id INTEGER PRIMARY KEY,
+                    epoch TIMESTAMP,
+                    tle_line1 TEXT,
+                    tle_line2 TEXT,
+                    inclination DOUBLE PRECISION,
+                    raan DOUBLE PRECISION,
+                    eccentricity DOUBLE PRECISION,
+                    argument_of_perigee DOUBLE PRECISION,
+                    mean_anomaly DOUBLE PRECISION,
+                    mean_motion DOUBLE PRECISION,
+                    revolution_number INTEGER,
+                    bstar DOUBLE PRECISION,
+                    mean_motion_dot DOUBLE PRECISION,
+                    source TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_tles_epoch_norad ON tles(epoch, norad_id)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS db_stats (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    total_satellites BIGINT NOT NULL DEFAULT 0,
+                    active_satellites BIGINT NOT NULL DEFAULT 0,
+                    total_tles BIGINT NOT NULL DEFAULT 0,
+                    latest_tle_epoch TIMESTAMP
+                )
+            """)
+            empty_latest = conn.execute("SELECT 1 FROM latest_tles LIMIT 1").fetchone() is None
+            empty_stats = conn.execute("SELECT 1 FROM db_stats").fetchone() is None
+        if empty_latest:
+            self.rebuild_latest_tles()
+        if empty_stats:
+            self.recount_stats()
+
+    def rebuild_latest_tles(self):
+        """Repopulate latest_tles from the full tles history"""
+        columns = ', '.join(TLE_COLUMNS)
+        with self._connection() as conn:
+            conn.execute("DELETE FROM latest_tles")
+            conn.execute(f"""
+                INSERT INTO latest_tles ({columns})
+                SELECT DISTINCT ON (norad_id) {columns} FROM tles ORDER BY norad_id, epoch DESC
+            """)
+
+    @staticmethod
+    def _stage(conn, table: str, columns: tuple, rows: Iterable[tuple]):
+        """COPY rows into an emptied temp staging table shaped like ``table``"""
+        stage = f"stage_{table}"
+        conn.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS {stage} AS SELECT {', '.join(columns)} FROM {table} WITH NO DATA"
+        )
+        conn.execute(f"TRUNCATE {stage}")
+        with conn.cursor().copy(f"COPY {stage} ({', '.join(columns)}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
+        return stage
+
+    @staticmethod
+    def _satellite_counts(conn, stage: str) -> tuple:
+        """(count, active count) of the staged satellites already stored"""
+        return conn.execute(f"""
+            SELECT COUNT(*), COUNT(*) FILTER (WHERE s.is_active) FROM satellites s
+            WHERE s.norad_id IN (SELECT norad_id FROM {stage})
+        """).fetchone()
+
+    def upsert_satellites(self, satellites: List[Dict]) -> int:
+        columns = ('norad_id', 'name', 'international_designator', 'is_active')
+        with self._connection() as conn:
+            stage = self._stage(conn, 'satellites', columns,
+                                (tuple(sat[column] for column in columns) for sat in satellites))
+            total_before, active_before = self._satellite_counts(conn, stage)
+            # DISTINCT ON: ON CONFLICT DO UPDATE may not touch a row twice
+            changed = conn.execute(f"""
+                INSERT INTO satellites ({', '.join(columns)})
+                SELECT DISTINCT ON (norad_id) {', '.join(columns)} FROM {stage}
+                ON CONFLICT (norad_id) DO UPDATE SET
+                    name = COALESCE(NULLIF(excluded.name, ''), satellites.name),
+                    international_designator = excluded.international_designator,
+                    is_active = excluded.is_active,
+                    updated_at = CURRENT_TIMESTAMP
+            """).rowcount
+            total_after, active_after = self._satellite_counts(conn, stage)
+            conn.execute("""
+                UPDATE db_stats SET
+                    total_satellites = total_satellites + %s,
+                    active_satellites = active_satellites + %s
+                WHERE id = 1
+            """, (total_after - total_before, active_after - active_before))
+        return changed
+
+    def insert_tles(self, tles: List[Dict]) -> int:
+        if not tles:
+            return 0
+        columns = ', '.join(TLE_COLUMNS)
+        updates = ', '.join(f"{column} = excluded.{column}" for column in TLE_COLUMNS[1:])
+        with self._connection() as conn:
+            stage = self._stage(conn, 'tles', TLE_COLUMNS,
+                                (tuple(tle[column] for column in TLE_COLUMNS) for tle in tles))
+            added = conn.execute(f"""
+                INSERT INTO tles ({columns}) SELECT {columns} FROM {stage}
+                ON CONFLICT (norad_id, epoch) DO NOTHING
+            """).rowcount
+            # Advance latest_tles in the same transaction, only ever to a newer epoch
+            conn.execute(f"""
+                INSERT INTO latest_tles ({columns})
+                SELECT DISTINCT ON (norad_id) {columns} FROM {stage} ORDER BY norad_id, epoch DESC
+                ON CONFLICT (norad_id) DO UPDATE SET {updates}
+                WHERE excluded.epoch > latest_tles.epoch
+            """)
+            conn.execute(f"""
+                UPDATE db_stats SET
+                    total_tles = total_tles + %s,
+                    latest_tle_epoch = GREATEST(latest_tle_epoch, (SELECT MAX(epoch) FROM {stage}))
+                WHERE id = 1
+            """, (added,))
+        return added
+
+    @staticmethod
+    def _rows(cursor) -> List[Dict]:
+        """TLE rows as dicts, epochs rendered in the stored ISO format"""
+        rows = []
+        for values in cursor:
+            row = dict(zip(TLE_COLUMNS, values))
+            row['epoch'] = row['epoch'].isoformat()
+            rows.append(row)
+        return rows
+
+    def get_latest_epochs(self) -> Dict[int, str]:
+        with self._connection() as conn:
+            return {
+                norad_id: epoch.isoformat()
+                for norad_id, epoch in conn.execute("SELECT norad_id, epoch FROM latest_tles")
+            }
+
+    def get_current_catalog(self) -> List[Dict]:
+        with self._connection() as conn:
+            return self._rows(conn.execute(f"SELECT {', '.join(TLE_COLUMNS)} FROM latest_tles"))
+
+    def get_satellite_fingerprints(self) -> Dict[int, tuple]:
+        with self._connection() as conn:
+            return {
+                norad_id: (name, designator) for norad_id, name, designator in conn.execute(
+                    "SELECT norad_id, name, international_designator FROM satellites"
+                )
+            }
+
+    def get_tles_many(self, norad_ids: List[int], start: Epoch, end: Epoch) -> Dict[int, List[Dict]]:
+        with self._connection() as conn:
+            rows = self._rows(conn.execute(f"""
+                SELECT {', '.join(TLE_COLUMNS)} FROM tles
+                WHERE norad_id = ANY(%s) AND epoch BETWEEN %s AND %s
+                ORDER BY norad_id, epoch
+            """, (list(norad_ids), _epoch_text(start), _epoch_text(end))))
+        grouped: Dict[int, List[Dict]] = {}
+        for row in rows:
+            grouped.setdefault(row['norad_id'], []).append(row)
+        return grouped
+
+    def get_tle_nearest_many(self, norad_ids: List[int], t: Epoch) -> Dict[int, Dict]:
+        t = _epoch_text(t)
+        columns = ', '.join(TLE_COLUMNS)
+        # Two index seeks per satellite: newest at/before t and oldest at/after t
+        with self._connection() as conn:
+            candidates = self._rows(conn.execute(f"""
+                SELECT c.* FROM unnest(%s::integer[]) AS q(id) CROSS JOIN LATERAL (
+                    (SELECT {columns} FROM tles WHERE norad_id = q.id AND epoch <= %s
+                     ORDER BY epoch DESC LIMIT 1)
+                    UNION ALL
+                    (SELECT {columns} FROM tles WHERE norad_id = q.id AND epoch >= %s
+                     ORDER BY epoch LIMIT 1)
+                ) c
+            """, (list(norad_ids), t, t)))
+        return _closest_by_id(candidates, t)
+
+    def known_tles(self, keys: List[Tuple[int, str]]) -> Set[Tuple[int, str]]:
+        if not keys:
+            return set()
+        with self._connection() as conn:
+            return {
+                (norad_id, epoch.isoformat()) for norad_id, epoch in conn.execute("""
+                    SELECT t.norad_id, t.epoch FROM unnest(%s::integer[], %s::timestamp[]) AS q(id, epoch)
+                    JOIN tles t ON t.norad_id = q.id AND t.epoch = q.epoch
+                """, ([key[0] for key in keys], [key[1] for key in keys]))
+            }
+
+    def iter_tle_keys(self, chunk_size: int = 100000) -> Iterator[Tuple[List[int], List[str]]]:
+        after = (-1, '-infinity')
+        while True:
+            # Keyset pagination along UNIQUE (norad_id, epoch)
+            with self._connection() as conn:
+                rows = conn.execute("""
+                    SELECT norad_id, epoch FROM tles WHERE (norad_id, epoch) > (%s, %s::timestamp)
+                    ORDER BY norad_id, epoch LIMIT %s
+                """, (*after, chunk_size)).fetchall()
+            if not rows:
+                return
+            after = rows[-1]
+            yield [row[0] for row in rows], [row[1].isoformat() for row in rows]
+
+    def get_stats(self) -> Dict:
+        stats = {}
+        try:
+            with self._connection() as conn:
+                row = conn.execute("""
+                    SELECT total_satellites, active_satellites, total_tles, latest_tle_epoch
+                    FROM db_stats WHERE id = 1
+                """).fetchone()
+            if row:
+                stats = dict(zip(
+                    ('total_satellites', 'active_satellites', 'total_tles', 'latest_tle_epoch'), row
+                ))
+                if stats['latest_tle_epoch'] is not None:
+                    stats['latest_tle_epoch'] = stats['latest_tle_epoch'].isoformat()
+        except Exception as e:
+            print(f"Error getting stats: {e}")
+        return stats
+
+    def recount_stats(self) -> Dict:
+        """Rebuild the db_stats counters with full table scans"""
+        with self._connection() as conn:
+            conn.execute("""
+                INSERT INTO db_stats (id, total_satellites, active_satellites, total_tles, latest_tle_epoch)
+                SELECT 1,
+                    (SELECT COUNT(*) FROM satellites),
+                    (SELECT COUNT(*) FROM satellites WHERE is_active),
+                    (SELECT COUNT(*) FROM tles),
+                    (SELECT MAX(epoch) FROM tles)
+                ON CONFLICT (id) DO UPDATE SET
+                    total_satellites = excluded.total_satellites,
+                    active_satellites = excluded.active_satellites,
+                    total_tles = excluded.total_tles,
+                    latest_tle_epoch = excluded.latest_tle_epoch
+            """)
+        return self.get_stats()
@@ -0,0 +1,473 @@
+"""SQLite backend: a single local database file"""
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from ..config import COMPACT_LINES
+from .base import DatabaseBackend, Epoch, TLE_COLUMNS, _closest_by_id, _epoch_text
+
+
+class SQLiteBackend(DatabaseBackend):
+    """SQLite implementation of database backend"""
+
+    # Applied to the persistent connection: WAL lets readers run alongside the
+    # writer, and NORMAL sync is durable in WAL mode without an fsync per commit
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-65536",
+        "PRAGMA mmap_size=268435456",
+    )
+
+    def __init__(self, db_path: str, compact_lines: bool = COMPACT_LINES):
+        self.db_path = db_path
+        self.compact_lines = compact_lines
+        self._conn: Optional[sqlite3.Connection] = None
+        self._in_bulk = False
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return the persistent connection, opening it on first use"""
+        if self._conn is None:
+            # Pipelined ingest writes from a background thread; writes are
+            # still serialized, one writer at a time
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            for pragma in self.PRAGMAS:
+                self._conn.execute(pragma)
+        return self._conn
+
+    def _commit(self):
+        """Commit unless a bulk run is holding the transaction open"""
+        if not self._in_bulk:
+            self._connect().commit()
+
+    @contextmanager
+    def bulk(self):
+        """Run all writes in the block as a single transaction"""
+        if self._in_bulk:
+            yield self
+            return
+        conn = self._connect()
+        self._in_bulk = True
+        try:
+            yield self
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._in_bulk = False
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
+
+    def _init_db(self):
+        """Initialize database schema"""
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS satellites (
+                norad_id INTEGER PRIMARY KEY,
+                name TEXT,
+                international_designator TEXT,
+                is_active BOOLEAN DEFAULT 1,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS tles (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                norad_id INTEGER,
+                epoch TIMESTAMP,
+                tle_line1 TEXT,
+                tle_line2 TEXT,
+                inclination REAL,
+                raan REAL,
+                eccentricity REAL,
+                argument_of_perigee REAL,
+                mean_anomaly REAL,
+                mean_motion REAL,
+                revolution_number INTEGER,
+                bstar REAL,
+                mean_motion_dot REAL,
+                source TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                line_residual BLOB,
+                UNIQUE(norad_id, epoch),
+                FOREIGN KEY(norad_id) REFERENCES satellites(norad_id)
+            )
+        """)
+        # Compact rows store NULL lines plus a residual (see astrolabe.lines)
+        if 'line_residual' not in {row[1] for row in conn.execute("PRAGMA table_info(tles)")}:
+            conn.execute("ALTER TABLE tles ADD COLUMN line_residual BLOB")
+        # Newest element set per satellite, maintained alongside tles so the
+        # current catalog is a primary-key scan instead of a GROUP BY over history
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS latest_tles (
+                norad_id INTEGER PRIMARY KEY,
+                epoch TIMESTAMP,
+                tle_line1 TEXT,
+                tle_line2 TEXT,
+                inclination REAL,
+                raan REAL,
+                eccentricity REAL,
+                argument_of_perigee REAL,
+                mean_anomaly REAL,
+                mean_motion REAL,
+                revolution_number INTEGER,
+                bstar REAL,
+                mean_motion_dot REAL,
+                source TEXT
+            )
+        """)
+        # UNIQUE(norad_id, epoch) already indexes per-satellite ranges; this one
+        # serves catalog-wide time slices
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_tles_epoch_norad ON tles(epoch, norad_id)")
+        # Single-row counters kept in step with every write so stats reads
+        # don't scan either table
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS db_stats (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                total_satellites INTEGER NOT NULL DEFAULT 0,
+                active_satellites INTEGER NOT NULL DEFAULT 0,
+                total_tles INTEGER NOT NULL DEFAULT 0,
+                latest_tle_epoch TIMESTAMP
+            )
+        """)
+        conn.commit()
+        if conn.execute("SELECT 1 FROM latest_tles LIMIT 1").fetchone() is None:
+            self.rebuild_latest_tles()
+        if conn.execute("SELECT 1 FROM db_stats").fetchone() is None:
+            self.recount_stats()
+
+    def rebuild_latest_tles(self):
+        """Repopulate latest_tles from the full tles history"""
+        columns = ', '.join(TLE_COLUMNS)
+        conn = self._connect()
+        conn.execute("DELETE FROM latest_tles")
+        # SQLite returns the bare columns of the row holding MAX(epoch)
+        conn.execute(f"""
+            INSERT INTO latest_tles ({columns})
+            SELECT {columns} FROM (
+                SELECT {columns}, MAX(epoch) FROM tles GROUP BY norad_id
+            )
+        """)
+        self._restore_latest_lines('tles')
+        self._commit()
+
+    def _restore_latest_lines(self, table: str):
+        """Fill in latest_tles rows copied from compacted rows of table"""
+        # latest_tles always keeps full text, so rebuild any compacted lines.
+        # The residual codec is imported where it is used so databases that
+        # never compact lines open without loading NumPy
+        from ..lines import FIELDS as LINE_FIELDS, decode_lines
+        conn = self._connect()
+        rows = conn.execute(f"""
+            SELECT {', '.join('t.' + field for field in LINE_FIELDS)}, t.line_residual
+            FROM latest_tles l CROSS JOIN {table} t ON t.norad_id = l.norad_id AND t.epoch = l.epoch
+            WHERE l.tle_line1 IS NULL
+        """).fetchall()
+        if rows:
+            fields = {field: [row[i] for row in rows] for i, field in enumerate(LINE_FIELDS)}
+            line1, line2 = decode_lines(fields, [row[-1] for row in rows])
+            conn.executemany(
+                "UPDATE latest_tles SET tle_line1 = ?, tle_line2 = ? WHERE norad_id = ?",
+                zip(line1, line2, fields['norad_id'])
+            )
+
+    @staticmethod
+    def _restore_lines(rows: List[Dict], residuals: List[Optional[bytes]]) -> List[Dict]:
+        """Fill in tle_line1/tle_line2 of compact rows from their residuals"""
+        compact = [i for i, residual in enumerate(residuals) if residual is not None]
+        if compact:
+            from ..lines import FIELDS as LINE_FIELDS, decode_lines
+            fields = {field: [rows[i][field] for i in compact] for field in LINE_FIELDS}
+            line1, line2 = decode_lines(fields, [residuals[i] for i in compact])
+            for i, l1, l2 in zip(compact, line1, line2):
+                rows[i]['tle_line1'], rows[i]['tle_line2'] = l1, l2
+        return rows
+
+    def _read_tles(self, cursor) -> List[Dict]:
+        """Rows of TLE_COLUMNS followed by line_residual, with lines restored"""
+        rows, residuals = [], []
+        for values in cursor:
+            rows.append(dict(zip(TLE_COLUMNS, values)))
+            residuals.append(values[-1])
+        return self._restore_lines(rows, residuals)
+
+    def compact_tles(self, batch_size: int = 50000) -> int:
+        """Convert stored full-text rows to residual form; returns rows converted.
+
+        Run VACUUM afterwards to give the freed pages back to the filesystem.
+        """
+        return self._compact_table('tles', batch_size)
+
+    def _compact_table(self, table: str, batch_size: int) -> int:
+        from ..lines import FIELDS as LINE_FIELDS, encode_residuals
+        conn = self._connect()
+        converted = 0
+        last_id = 0
+        while True:
+            rows = conn.execute(f"""
+                SELECT id, {', '.join(LINE_FIELDS)}, tle_line1, tle_line2 FROM {table}
+                WHERE id > ? AND line_residual IS NULL AND tle_line1 IS NOT NULL
+                ORDER BY id LIMIT ?
+            """, (last_id, batch_size)).fetchall()
+            if not rows:
+                return converted
+            last_id = rows[-1][0]
+            fields = {field: [row[i + 1] for row in rows] for i, field in enumerate(LINE_FIELDS)}
+            residuals = encode_residuals(fields, [row[-2] for row in rows], [row[-1] for row in rows])
+            updates = [(residual, row[0]) for row, residual in zip(rows, residuals) if residual is not None]
+            conn.executemany(
+                f"UPDATE {table} SET tle_line1 = NULL, tle_line2 = NULL, line_residual = ? WHERE id = ?",
+                updates
+            )
+            self._commit()
+            converted += len(updates)
+
+    def vacuum(self):
+        """Rewrite the database file to release free pages"""
+        conn = self._connect()
+        conn.commit()
+        conn.execute("VACUUM")
+
+    def iter_tles(self, start: Optional[Epoch] = None, end: Optional[Epoch] = None,
+                  chunk_size: int = 50000) -> Iterator[List[Dict]]:
+        """Yield TLE rows in (epoch, norad_id) order, in chunks, with lines restored"""
+        yield from self._iter_table('tles', start, end, chunk_size)
+
+    def _iter_table(self, table: str, start: Optional[Epoch], end: Optional[Epoch],
+                    chunk_size: int) -> Iterator[List[Dict]]:
+        columns = ', '.join(TLE_COLUMNS)
+        after = (_epoch_text(start) if start is not None else '', -1)
+        upper = _epoch_text(end if end is not None else datetime.max)
+        while True:
+            # Keyset pagination along idx_tles_epoch_norad
+            rows = self._read_tles(self._connect().execute(f"""
+                SELECT {columns}, line_residual FROM {table}
+                WHERE (epoch, norad_id) > (?, ?) AND epoch <= ?
+                ORDER BY epoch, norad_id LIMIT ?
+            """, (*after, upper, chunk_size)))
+            if not rows:
+                return
+            yield rows
+            after = (rows[-1]['epoch'], rows[-1]['norad_id'])
+
+    def _satellite_counts(self) -> tuple:
+        """(count, active count) of the satellites staged in query_ids"""
+        total, active = self._connect().execute("""
+            SELECT COUNT(*), COALESCE(SUM(s.is_active = 1), 0) FROM query_ids q
+            CROSS JOIN satellites s ON s.norad_id = q.norad_id
+        """).fetchone()
+        return total, active
+
+    def upsert_satellites(self, satellites: List[Dict]) -> int:
+        conn = self._connect()
+        # Diff the batch's rows before and after the upsert to adjust the
+        # counters without touching the rest of the table
+        self._load_query_ids([sat['norad_id'] for sat in satellites])
+        total_before, active_before = self._satellite_counts()
+        before = conn.total_changes
+        conn.executemany("""
+            INSERT INTO satellites (norad_id, name, international_designator, is_active)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(norad_id) DO UPDATE SET
+                name=COALESCE(NULLIF(excluded.name, ''), satellites.name),
+                international_designator=excluded.international_designator,
+                is_active=excluded.is_active,
+                updated_at=CURRENT_TIMESTAMP
+        """, [
+            (sat['norad_id'], sat['name'], sat['international_designator'], sat['is_active'])
+            for sat in satellites
+        ])
+        changed = conn.total_changes - before
+        total_after, active_after = self._satellite_counts()
+        conn.execute("""
+            UPDATE db_stats SET
+                total_satellites = total_satellites + ?,
+                active_satellites = active_satellites + ?
+            WHERE id = 1
+        """, (total_after - total_before, active_after - active_before))
+        self._commit()
+        return changed
+
+    def insert_tles(self, tles: List[Dict]) -> int:
+        conn = self._connect()
+        columns = ', '.join(TLE_COLUMNS)
+        placeholders = ', '.join('?' * len(TLE_COLUMNS))
+        rows = [tuple(tle[column] for column in TLE_COLUMNS) for tle in tles]
+        history = [row + (None,) for row in rows]
+        if self.compact_lines and tles:
+            from ..lines import FIELDS as LINE_FIELDS, encode_residuals
+            residuals = encode_residuals(
+                {field: [tle[field] for tle in tles] for field in LINE_FIELDS},
+                [tle['tle_line1'] for tle in tles], [tle['tle_line2'] for tle in tles]
+            )
+            # tle_line1/tle_line2 are the 3rd/4th columns
+            history = [
+                row[:2] + (None, None) + row[4:] + (residual,) if residual is not None else row + (None,)
+                for row, residual in zip(rows, residuals)
+            ]
+        added = self._insert_history(history)
+        # Advance latest_tles in the same transaction, only ever to a newer epoch
+        updates = ', '.join(f"{column}=excluded.{column}" for column in TLE_COLUMNS[1:])
+        conn.executemany(f"""
+            INSERT INTO latest_tles ({columns}) VALUES ({placeholders})
+            ON CONFLICT(norad_id) DO UPDATE SET {updates}
+            WHERE excluded.epoch > latest_tles.epoch
+        """, rows)
+        if rows:
+            # Ignored duplicates are already stored, so the batch maximum is
+            # safe to fold in whether or not its row was added
+            latest = max(tle['epoch'] for tle in tles)
+            conn.execute("""
+                UPDATE db_stats SET
+                    total_tles = total_tles + ?,
+                    latest_tle_epoch = MAX(COALESCE(latest_tle_epoch, ?), ?)
+                WHERE id = 1
+            """, (added, latest, latest))
+        self._commit()
+        return added
+
+    def _insert_history(self, history: List[tuple]) -> int:
+        """Insert rows of TLE_COLUMNS plus line_residual into tles; returns rows added"""
+        conn = self._connect()
+        columns = ', '.join(TLE_COLUMNS)
+        placeholders = ', '.join('?' * len(TLE_COLUMNS))
+        before = conn.total_changes
+        # Duplicates are dropped by the UNIQUE(norad_id, epoch) constraint, so
+        # the change counter tells us how many rows were actually added
+        conn.executemany(
+            f"INSERT OR IGNORE INTO tles ({columns}, line_residual) VALUES ({placeholders}, ?)", history
+        )
+        return conn.total_changes - before
+
+    def get_latest_epochs(self) -> Dict[int, str]:
+        return dict(self._connect().execute("SELECT norad_id, epoch FROM latest_tles"))
+
+    def get_current_catalog(self) -> List[Dict]:
+        cursor = self._connect().execute(f"SELECT {', '.join(TLE_COLUMNS)} FROM latest_tles")
+        return [dict(zip(TLE_COLUMNS, row)) for row in cursor]
+
+    def get_satellite_fingerprints(self) -> Dict[int, tuple]:
+        return {
+            norad_id: (name, designator) for norad_id, name, designator in self._connect().execute(
+                "SELECT norad_id, name, international_designator FROM satellites"
+            )
+        }
+
+    def _load_query_ids(self, norad_ids: List[int]):
+        """Stage a set of norad_ids in a temp table for set-based lookups"""
+        conn = self._connect()
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS query_ids (norad_id INTEGER PRIMARY KEY)")
+        conn.execute("DELETE FROM query_ids")
+        conn.executemany("INSERT OR IGNORE INTO query_ids VALUES (?)", [(i,) for i in norad_ids])
+        self._commit()
+
+    def get_tles_many(self, norad_ids: List[int], start: Epoch, end: Epoch) -> Dict[int, List[Dict]]:
+        self._load_query_ids(norad_ids)
+        grouped: Dict[int, List[Dict]] = {}
+        for row in self._read_range('tles', start, end):
+            grouped.setdefault(row['norad_id'], []).append(row)
+        return grouped
+
+    def _read_range(self, table: str, start: Epoch, end: Epoch) -> List[Dict]:
+        """Rows of table for the satellites in query_ids with start <= epoch <= end"""
+        columns = ', '.join(f"t.{column}" for column in TLE_COLUMNS)
+        return self._read_tles(self._connect().execute(f"""
+            SELECT {columns}, t.line_residual FROM query_ids q
+            CROSS JOIN {table} t ON t.norad_id = q.norad_id AND t.epoch BETWEEN ? AND ?
+            ORDER BY t.norad_id, t.epoch
+        """, (_epoch_text(start), _epoch_text(end))))
+
+    def get_tle_nearest_many(self, norad_ids: List[int], t: Epoch) -> Dict[int, Dict]:
+        t = _epoch_text(t)
+        self._load_query_ids(norad_ids)
+        candidates: List[Dict] = []
+        # Two index seeks per satellite: newest at/before t and oldest at/after t
+        for pick, op in (('MAX', '<='), ('MIN', '>=')):
+            candidates.extend(self._read_nearest('tles', pick, op, t))
+        return _closest_by_id(candidates, t)
+
+    def _read_nearest(self, table: str, pick: str, op: str, t: str) -> List[Dict]:
+        """For each satellite in query_ids, the row of table with the {pick}(epoch) {op} t"""
+        columns = ', '.join(f"t.{column}" for column in TLE_COLUMNS)
+        # CROSS JOIN pins the join order so SQLite drives from the id list
+        return self._read_tles(self._connect().execute(f"""
+            SELECT {columns}, t.line_residual FROM query_ids q
+            CROSS JOIN {table} t ON t.norad_id = q.norad_id AND t.epoch = (
+                SELECT {pick}(epoch) FROM {table} WHERE norad_id = q.norad_id AND epoch {op} ?
+            )
+        """, (t,)))
+
+    def _load_query_keys(self, keys: List[Tuple[int, str]]):
+        """Stage (norad_id, epoch) keys in a temp table for set-based lookups"""
+        conn = self._connect()
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS query_keys (norad_id INTEGER, epoch TIMESTAMP)")
+        conn.execute("DELETE FROM query_keys")
+        conn.executemany("INSERT INTO query_keys VALUES (?, ?)", keys)
+        self._commit()
+
+    def _known_in(self, table: str) -> Set[Tuple[int, str]]:
+        """Keys staged in query_keys that exist in table"""
+        return set(self._connect().execute(f"""
+            SELECT q.norad_id, q.epoch FROM query_keys q
+            CROSS JOIN {table} t ON t.norad_id = q.norad_id AND t.epoch = q.epoch
+        """))
+
+    def known_tles(self, keys: List[Tuple[int, str]]) -> Set[Tuple[int, str]]:
+        self._load_query_keys(keys)
+        return self._known_in('tles')
+
+    def iter_tle_keys(self, chunk_size: int = 100000) -> Iterator[Tuple[List[int], List[str]]]:
+        yield from self._iter_table_keys('tles', chunk_size)
+
+    def _iter_table_keys(self, table: str, chunk_size: int) -> Iterator[Tuple[List[int], List[str]]]:
+        last_id = 0
+        while True:
+            rows = self._connect().execute(
+                f"SELECT id, norad_id, epoch FROM {table} WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, chunk_size)
+            ).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield [row[1] for row in rows], [row[2] for row in rows]
+
+    def get_stats(self) -> Dict:
+        stats = {}
+        try:
+            row = self._connect().execute("""
+                SELECT total_satellites, active_satellites, total_tles, latest_tle_epoch
+                FROM db_stats WHERE id = 1
+            """).fetchone()
+            if row:
+                stats = dict(zip(
+                    ('total_satellites', 'active_satellites', 'total_tles', 'latest_tle_epoch'), row
+                ))
+        except Exception as e:
+            print(f"Error getting stats: {e}")
+        return stats
+
+    def recount_stats(self) -> Dict:
+        """Rebuild the db_stats counters with full table scans"""
+        conn = self._connect()
+        conn.execute("""
+            INSERT OR REPLACE INTO db_stats
+                (id, total_satellites, active_satellites, total_tles, latest_tle_epoch)
+            SELECT 1,
+                (SELECT COUNT(*) FROM satellites),
+                (SELECT COUNT(*) FROM satellites WHERE is_active = 1),
+                ?, ?
+        """, self._tle_totals())
+        self._commit()
+        return self.get_stats()
+
+    def _tle_totals(self) -> tuple:
+        """(row count, newest epoch) of the TLE history"""
+        return self._connect().execute("SELECT COUNT(*), MAX(epoch) FROM tles").fetchone()
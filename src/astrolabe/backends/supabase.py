@@ -0,0 +1,174 @@
+"""Supabase (PostgREST) backend"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+from supabase import create_client, Client
+
+from ..config import (
+    SUPABASE_URL, SUPABASE_KEY,
+    SUPABASE_CHUNK_SIZE, SUPABASE_CONCURRENCY, SUPABASE_ID_CHUNK, SUPABASE_NEAREST_WINDOWS,
+)
+from .base import DatabaseBackend, Epoch, TLE_COLUMNS, _closest, _closest_by_id, _epoch_text
+
+
+class SupabaseBackend(DatabaseBackend):
+    """Supabase implementation of database backend"""
+
+    # Each write is an independent HTTP request
+    concurrent_writes = True
+
+    def __init__(self):
+        self.supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+    def _chunks(self, rows: List[Dict]) -> List[List[Dict]]:
+        return [rows[i:i + SUPABASE_CHUNK_SIZE] for i in range(0, len(rows), SUPABASE_CHUNK_SIZE)]
+
+    def _map_chunks(self, fn, rows: List[Dict]) -> int:
+        """Apply fn to each chunk of rows, several requests in flight at once"""
+        chunks = self._chunks(rows)
+        if len(chunks) <= 1 or SUPABASE_CONCURRENCY <= 1:
+            return sum(fn(chunk) for chunk in chunks)
+        with ThreadPoolExecutor(max_workers=SUPABASE_CONCURRENCY) as pool:
+            return sum(pool.map(fn, chunks))
+
+    def upsert_satellites(self, satellites: List[Dict]) -> int:
+        def upsert(chunk: List[Dict]) -> int:
+            self.supabase.table('satellites').upsert(
+                chunk,
+                on_conflict='norad_id'
+            ).execute()
+            return len(chunk)
+
+        # Rows without a name (bare 2LE input) leave out the column, so the
+        # upsert keeps whatever name is stored
+        named = [sat for sat in satellites if sat['name']]
+        unnamed = [{key: value for key, value in sat.items() if key != 'name'}
+                   for sat in satellites if not sat['name']]
+        try:
+            return self._map_chunks(upsert, named) + self._map_chunks(upsert, unnamed)
+        except Exception as e:
+            print(f"Error updating satellites: {e}")
+            raise
+
+    def insert_tles(self, tles: List[Dict]) -> int:
+        def insert(chunk: List[Dict]) -> int:
+            # ignore_duplicates makes PostgREST skip rows hitting UNIQUE(norad_id, epoch);
+            # the exact count then covers only the rows actually inserted
+            result = self.supabase.table('tles').upsert(
+                chunk,
+                on_conflict='norad_id,epoch',
+                ignore_duplicates=True,
+                count='exact',
+                returning='minimal'
+            ).execute()
+            return result.count or 0
+
+        try:
+            return self._map_chunks(insert, tles)
+        except Exception as e:
+            print(f"Error inserting TLEs: {e}")
+            raise
+
+    def _select_all(self, table: str, columns: str) -> List[Dict]:
+        """Page through a table keyed by norad_id (PostgREST caps rows per response).
+
+        Pages continue after the last norad_id seen rather than at an offset,
+        so each one is an index range scan however deep into the table it is.
+        """
+        rows = []
+        page = 1000
+        while True:
+            query = self.supabase.table(table).select(columns).order('norad_id').limit(page)
+            if rows:
+                query = query.gt('norad_id', rows[-1]['norad_id'])
+            result = query.execute()
+            rows.extend(result.data)
+            if len(result.data) < page:
+                return rows
+
+    # latest_tles is a table kept current by a trigger on tles (sql/supabase_latest.sql)
+    def get_latest_epochs(self) -> Dict[int, str]:
+        return {row['norad_id']: row['epoch'] for row in self._select_all('latest_tles', 'norad_id,epoch')}
+
+    def get_current_catalog(self) -> List[Dict]:
+        return self._select_all('latest_tles', ','.join(TLE_COLUMNS))
+
+    def get_satellite_fingerprints(self) -> Dict[int, tuple]:
+        return {
+            row['norad_id']: (row['name'], row['international_designator'])
+            for row in self._select_all('satellites', 'norad_id,name,international_designator')
+        }
+
+    def _select_window(self, norad_ids: List[int], start: str, end: str) -> List[Dict]:
+        """Rows for a set of norad_ids inside [start, end], a few ids per request"""
+        rows = []
+        for i in range(0, len(norad_ids), SUPABASE_ID_CHUNK):
+            ids = norad_ids[i:i + SUPABASE_ID_CHUNK]
+            offset, page = 0, 1000
+            while True:
+                result = self.supabase.table('tles').select(','.join(TLE_COLUMNS)).in_(
+                    'norad_id', ids
+                ).gte('epoch', start).lte('epoch', end).order('norad_id').order('epoch').range(
+                    offset, offset + page - 1
+                ).execute()
+                rows.extend(result.data)
+                offset += page
+                if len(result.data) < page:
+                    break
+        return rows
+
+    def get_tles_many(self, norad_ids: List[int], start: Epoch, end: Epoch) -> Dict[int, List[Dict]]:
+        grouped: Dict[int, List[Dict]] = {}
+        for row in self._select_window(list(norad_ids), _epoch_text(start), _epoch_text(end)):
+            grouped.setdefault(row['norad_id'], []).append(row)
+        return grouped
+
+    def _nearest_one(self, norad_id: int, t: str) -> Optional[Dict]:
+        """Closest TLE for one satellite: newest at/before t vs oldest at/after t"""
+        query = lambda: self.supabase.table('tles').select(','.join(TLE_COLUMNS)).eq('norad_id', norad_id)
+        before = query().lte('epoch', t).order('epoch', desc=True).limit(1).execute().data
+        after = query().gte('epoch', t).order('epoch').limit(1).execute().data
+        return _closest(before + after, t)
+
+    def get_tle_nearest_many(self, norad_ids: List[int], t: Epoch) -> Dict[int, Dict]:
+        # Set-based: pull a window around t for all ids at once and widen it for
+        # the ids that had nothing nearby; only stragglers fall back to per-id lookups
+        t = _epoch_text(t)
+        center = np.datetime64(t, 'us')
+        nearest: Dict[int, Dict] = {}
+        missing = list(norad_ids)
+        for days in SUPABASE_NEAREST_WINDOWS:
+            if not missing:
+                break
+            half = np.timedelta64(days * 86400, 's')
+            start = str(center - half)
+            end = str(center + half)
+            found = _closest_by_id(self._select_window(missing, start, end), t)
+            nearest.update(found)
+            missing = [norad_id for norad_id in missing if norad_id not in found]
+        for norad_id in missing:
+            row = self._nearest_one(norad_id, t)
+            if row:
+                nearest[norad_id] = row
+        return nearest
+
+    def get_stats(self) -> Dict:
+        try:
+            result = self.supabase.rpc('get_tle_stats').execute()
+            if result.data and len(result.data) > 0:
+                return result.data[0]
+            return {}
+        except Exception as e:
+            print(f"Error getting stats: {e}")
+            return {}
+
+    def recount_stats(self) -> Dict:
+        # Counters live in tle_stats (sql/supabase_stats.sql); this is the
+        # full-scan repair for them
+        self.supabase.rpc('recount_tle_stats').execute()
+        return self.get_stats()
+
+    def rebuild_latest_tles(self):
+        """Repopulate latest_tles from the full tles history (sql/supabase_latest.sql)"""
+        self.supabase.rpc('rebuild_latest_tles').execute()
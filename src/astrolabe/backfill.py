@@ -0,0 +1,186 @@
+"""Multi-core bulk loader for historical TLE archives"""
+import gzip
+import os
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from .config import BACKFILL_CHUNK_BYTES, BACKFILL_COMMIT_ROWS
+from .parser import TLEParser
+
+
+def iter_sources(paths: List[str]) -> Iterator[Tuple[str, object]]:
+    """Yield (name, binary stream) for every .txt/.tle, .gz and .zip member"""
+    for path in paths:
+        path = Path(path)
+        if path.suffix == '.zip':
+            with zipfile.ZipFile(path) as archive:
+                for member in archive.namelist():
+                    if not member.endswith('/'):
+                        with archive.open(member) as stream:
+                            yield f"{path.name}:{member}", stream
+        elif path.suffix == '.gz':
+            with gzip.open(path, 'rb') as stream:
+                yield path.name, stream
+        else:
+            with open(path, 'rb') as stream:
+                yield path.name, stream
+
+
+def _record_boundary(buf: bytes) -> int:
+    """Offset of the last record start in ``buf`` (0 if none is found).
+
+    A record starts at a line-1 row, or at the name row just before it in
+    3LE files. Cutting there keeps every chunk record-aligned.
+    """
+    pos = len(buf)
+    while True:
+        idx = buf.rfind(b'\n1 ', 0, pos)
+        if idx < 0:
+            return 0
+        line2 = buf.find(b'\n', idx + 1)
+        if line2 < 0 or buf[line2 + 1:line2 + 3] != b'2 ':
+            pos = idx
+            continue
+        prev = buf.rfind(b'\n', 0, idx) + 1
+        return idx + 1 if buf[prev:prev + 2] == b'2 ' else prev
+
+
+def iter_chunks(stream, chunk_bytes: int = BACKFILL_CHUNK_BYTES) -> Iterator[bytes]:
+    """Split a binary stream into record-aligned chunks of roughly chunk_bytes"""
+    carry = b''
+    while True:
+        block = stream.read(chunk_bytes)
+        if not block:
+            if carry.strip():
+                yield carry
+            return
+        buf = carry + block
+        cut = _record_boundary(buf)
+        if cut == 0:
+            carry = buf
+            continue
+        carry = buf[cut:]
+        yield buf[:cut]
+
+
+def parse_chunk(data: bytes) -> Tuple[Dict[str, np.ndarray], int, float]:
+    """Worker: parse and validate one chunk, returning only accepted rows.
+
+    Returns the compact column arrays, the number of records read and the
+    seconds spent, so the parent can report per-stage throughput.
+    """
+    start = time.perf_counter()
+    batch = TLEParser.parse_many(data)
+    report = TLEParser.validate_many(batch)
+    accepted = report['accepted']
+    columns = {key: values[accepted] for key, values in batch.items()}
+    return columns, report['total'], time.perf_counter() - start
+
+
+class BackfillLoader:
+    """Parse archives in a process pool and feed one writer.
+
+    Chunks are parsed and validated in worker processes and come back as
+    NumPy column arrays. The parent writes them through the updater's
+    backend, with at most ``2 * workers`` chunks in flight so memory stays
+    bounded. Each file, and every ``commit_rows`` accepted rows of a large
+    one, is its own bulk run, so a failure only loses the current one.
+    """
+
+    def __init__(self, updater, workers: int = None, chunk_bytes: int = BACKFILL_CHUNK_BYTES,
+                 commit_rows: int = BACKFILL_COMMIT_ROWS):
+        self.updater = updater
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_bytes = chunk_bytes
+        self.commit_rows = commit_rows
+        self.stats = {
+            'read': 0,
+            'accepted': 0,
+            'rejected': 0,
+            'read_seconds': 0.0,
+            'parse_seconds': 0.0,
+            'write_seconds': 0.0,
+            'wall_seconds': 0.0,
+        }
+
+    def _write(self, future, source: str):
+        columns, total, parse_seconds = future.result()
+        accepted = len(columns['valid'])
+        self.stats['read'] += total
+        self.stats['accepted'] += accepted
+        self.stats['rejected'] += total - accepted
+        self.updater._count('errors', total - accepted)
+        self.stats['parse_seconds'] += parse_seconds
+
+        start = time.perf_counter()
+        self.updater.write_batch(columns, np.ones(accepted, dtype=bool), source)
+        self.stats['write_seconds'] += time.perf_counter() - start
+
+    def _checkpoint(self, write_errors: int):
+        """Save the dedup filter after a committed bulk run.
+
+        Like process_tles: the next run trusts the filter only if every
+        write so far landed.
+        """
+        if self.updater.dedup_filter is not None and self.updater._write_errors == write_errors:
+            with self.updater._lock:
+                self.updater.dedup_filter.save(self.updater.dedup_filter_path)
+
+    def load(self, paths: List[str]) -> Dict:
+        """Load every input file into the configured backend"""
+        wall = time.perf_counter()
+        # The high-water-mark filter would drop the older history we are loading
+        self.updater.skip_known = False
+        self.updater.epoch_index = None
+        write_errors = self.updater._write_errors
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            for name, stream in iter_sources(paths):
+                source = f"backfill:{name}"
+                print(f"Backfilling {name}...")
+                pending = deque()
+                chunks = iter_chunks(stream, self.chunk_bytes)
+                done = False
+                while not done:
+                    with self.updater.backend.bulk():
+                        committed = self.stats['accepted']
+                        while not self.commit_rows or self.stats['accepted'] - committed < self.commit_rows:
+                            start = time.perf_counter()
+                            data = next(chunks, None)
+                            self.stats['read_seconds'] += time.perf_counter() - start
+                            if data is None:
+                                while pending:
+                                    self._write(pending.popleft(), source)
+                                done = True
+                                break
+                            pending.append(pool.submit(parse_chunk, data))
+                            if len(pending) >= 2 * self.workers:
+                                self._write(pending.popleft(), source)
+                    self._checkpoint(write_errors)
+                print(f"  {self.stats['read']} TLEs read so far")
+
+        self.stats['wall_seconds'] = time.perf_counter() - wall
+        return self.stats
+
+    def print_stats(self):
+        """Print rows/s for each stage of the last load"""
+        stats = self.stats
+
+        def rate(seconds: float) -> str:
+            return f"{stats['read'] / seconds:,.0f} rows/s" if seconds else 'n/a'
+
+        print("\n" + "=" * 50)
+        print("BACKFILL STATISTICS")
+        print("=" * 50)
+        print(f"TLEs read: {stats['read']} (accepted {stats['accepted']}, rejected {stats['rejected']})")
+        print(f"Read:   {stats['read_seconds']:.2f}s  {rate(stats['read_seconds'])}")
+        print(f"Parse:  {stats['parse_seconds']:.2f}s CPU over {self.workers} workers "
+              f"({rate(stats['parse_seconds'] / self.workers)} aggregate)")
+        print(f"Write:  {stats['write_seconds']:.2f}s  {rate(stats['write_seconds'])}")
+        print(f"Total:  {stats['wall_seconds']:.2f}s  {rate(stats['wall_seconds'])}")
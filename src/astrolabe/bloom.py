@@ -0,0 +1,136 @@
+"""Persistent Bloom filter of stored (norad_id, epoch) keys"""
+import json
+import math
+import os
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from .config import DEDUP_FILTER_CAPACITY, DEDUP_FILTER_FP_RATE
+from .index import to_datetime64
+
+FORMAT_VERSION = 1
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _mix(x: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer, applied elementwise to uint64 arrays"""
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def tle_hashes(norad_ids: np.ndarray, epochs: np.ndarray) -> np.ndarray:
+    """64-bit hashes of (norad_id, epoch) pairs; epochs as datetime64 or ISO strings"""
+    epochs = np.asarray(epochs)
+    if epochs.dtype.kind != 'M':
+        epochs = to_datetime64(epochs)
+    micros = epochs.astype('datetime64[us]').astype(np.int64).view(np.uint64)
+    return _mix(micros ^ _mix(np.asarray(norad_ids, dtype=np.int64).view(np.uint64) + _GOLDEN))
+
+
+class BloomFilter:
+    """Bloom filter over TLE (norad_id, epoch) keys, saved to a single file.
+
+    ``might_contain`` is False only for keys that were never added, so
+    anything it clears is certainly new; a True still has to be confirmed
+    against the database (about ``fp_rate`` of new keys look known).
+    Adding keys that later fail to be written only costs such a check,
+    which keeps the filter safe to update optimistically. The file holds a
+    JSON header line followed by the raw bit array and is replaced
+    atomically on save.
+    """
+
+    def __init__(self, capacity: int = DEDUP_FILTER_CAPACITY, fp_rate: float = DEDUP_FILTER_FP_RATE):
+        capacity = max(int(capacity), 1)
+        # Optimal size and hash count for the target false-positive rate
+        bits = math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2)
+        self.size = max(64, (bits + 63) // 64 * 64)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.capacity = capacity
+        self.count = 0
+        self._bits = np.zeros(self.size // 8, dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _positions(self, norad_ids: np.ndarray, epochs: np.ndarray) -> np.ndarray:
+        """N x hashes bit positions by double hashing"""
+        h1 = tle_hashes(norad_ids, epochs)
+        h2 = _mix(h1 ^ _GOLDEN) | np.uint64(1)
+        steps = np.arange(self.hashes, dtype=np.uint64)
+        return (h1[:, None] + steps * h2[:, None]) % np.uint64(self.size)
+
+    def _test(self, positions: np.ndarray) -> np.ndarray:
+        bits = self._bits[positions >> np.uint64(3)] >> (positions & np.uint64(7)).astype(np.uint8)
+        return (bits & 1).all(axis=1)
+
+    def might_contain(self, norad_ids: np.ndarray, epochs: np.ndarray) -> np.ndarray:
+        """False where a key is certainly not stored"""
+        if len(norad_ids) == 0:
+            return np.zeros(0, dtype=bool)
+        return self._test(self._positions(norad_ids, epochs))
+
+    def add(self, norad_ids: np.ndarray, epochs: np.ndarray):
+        """Record keys as stored"""
+        if len(norad_ids) == 0:
+            return
+        positions = self._positions(norad_ids, epochs)
+        # Count keys the filter didn't already claim, so count tracks distinct keys
+        self.count += int(np.count_nonzero(~self._test(positions)))
+        positions = positions.ravel()
+        np.bitwise_or.at(
+            self._bits, positions >> np.uint64(3),
+            np.left_shift(1, (positions & np.uint64(7)).astype(np.uint8)).astype(np.uint8)
+        )
+
+    def expected_fp_rate(self) -> float:
+        """False-positive rate at the current fill"""
+        return (1 - math.exp(-self.hashes * self.count / self.size)) ** self.hashes
+
+    def save(self, path: str):
+        """Write the filter to path, replacing any previous file atomically"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        header = {
+            'version': FORMAT_VERSION, 'size': self.size, 'hashes': self.hashes,
+            'capacity': self.capacity, 'count': self.count,
+        }
+        tmp = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp, 'wb') as f:
+            f.write(json.dumps(header).encode() + b'\n')
+            f.write(self._bits.tobytes())
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional['BloomFilter']:
+        """Read a saved filter, or None if the file is missing or unreadable"""
+        try:
+            with open(path, 'rb') as f:
+                header = json.loads(f.readline())
+                bits = np.fromfile(f, dtype=np.uint8)
+        except (OSError, ValueError):
+            return None
+        if header.get('version') != FORMAT_VERSION or len(bits) * 8 != header['size']:
+            return None
+        bloom = cls.__new__(cls)
+        bloom.size, bloom.hashes = header['size'], header['hashes']
+        bloom.capacity, bloom.count = header['capacity'], header['count']
+        bloom._bits = bits
+        return bloom
+
+    @classmethod
+    def rebuild(cls, backend, capacity: int = DEDUP_FILTER_CAPACITY,
+                fp_rate: float = DEDUP_FILTER_FP_RATE) -> 'BloomFilter':
+        """Build a filter holding every TLE key stored in a backend.
+
+        The capacity is raised to twice the stored row count (if known) so
+        the filter has room to grow.
+        """
+        stored = backend.get_stats().get('total_tles') or 0
+        bloom = cls(max(capacity, 2 * stored), fp_rate)
+        for norad_ids, epochs in backend.iter_tle_keys():
+            bloom.add(np.asarray(norad_ids, dtype=np.int64), epochs)
+        return bloom
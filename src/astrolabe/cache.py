@@ -0,0 +1,108 @@
+"""On-disk conditional-GET cache for TLE source downloads"""
+import hashlib
+import json
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from .config import FETCH_CACHE_DIR, HTTP_CHUNK_SIZE
+
+
+class FetchCache:
+    """Remember ETag/Last-Modified and a content hash per URL.
+
+    ``conditional_headers`` turns the stored validators into request headers.
+    ``open`` inspects the response: a 304, or a 200 whose body hashes the
+    same as last time, is a cache hit and returns ``None`` so callers can
+    skip processing entirely. New entries are only written by ``commit``,
+    once the caller has successfully processed the payload. ``open`` may
+    run on several fetch threads at once.
+    """
+
+    def __init__(self, cache_dir: str = FETCH_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+        self._pending: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def _entry_path(self, url: str) -> Path:
+        return self.cache_dir / (hashlib.sha256(url.encode()).hexdigest() + '.json')
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Return the stored entry for a URL, if any"""
+        try:
+            return json.loads(self._entry_path(url).read_text())
+        except (OSError, ValueError):
+            return None
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for a URL"""
+        entry = self.get(url) or {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def open(self, url: str, response) -> Optional[Iterator[bytes]]:
+        """Return the response lines, or None if the payload is unchanged.
+
+        The body is spooled to a temporary file while it is hashed, so the
+        unchanged check needs no more memory than a streamed read.
+        """
+        if response.status_code == 304:
+            response.close()
+            with self._lock:
+                self.hits += 1
+            print(f"Not modified since last fetch: {url}")
+            return None
+
+        digest = hashlib.sha256()
+        spool = tempfile.TemporaryFile()
+        try:
+            for chunk in response.iter_content(chunk_size=HTTP_CHUNK_SIZE):
+                digest.update(chunk)
+                spool.write(chunk)
+        finally:
+            response.close()
+
+        entry = self.get(url) or {}
+        if entry.get('sha256') == digest.hexdigest():
+            spool.close()
+            with self._lock:
+                self.hits += 1
+            print(f"Payload unchanged since last fetch: {url}")
+            return None
+
+        with self._lock:
+            self.misses += 1
+            self._pending[url] = {
+                'url': url,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'sha256': digest.hexdigest(),
+            }
+        spool.seek(0)
+        return self._iter_spool(spool)
+
+    @staticmethod
+    def _iter_spool(spool) -> Iterator[bytes]:
+        with spool:
+            for line in spool:
+                yield line.rstrip(b'\r\n')
+
+    def commit(self):
+        """Persist entries for payloads that have been processed"""
+        if not self._pending:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        for url, entry in self._pending.items():
+            self._entry_path(url).write_text(json.dumps(entry))
+        self._pending.clear()
+
+    def discard(self):
+        """Forget pending entries after a failed run so the next one refetches"""
+        self._pending.clear()
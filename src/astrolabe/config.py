@@ -1,20 +1,61 @@
 """Configuration management for TLE Tracker"""
 import os
 from pathlib import Path
-from dotenv import load_dotenv
 
-# Load .env file if it exists
+# Load .env file if it exists (python-dotenv is only imported when it does)
 env_path = Path(__file__).parent.parent.parent / '.env'
-load_dotenv(env_path)
+if env_path.exists():
+    from dotenv import load_dotenv
+    load_dotenv(env_path)
 
 # Supabase Configuration
 SUPABASE_URL = os.environ.get('SUPABASE_URL', '')
 SUPABASE_KEY = os.environ.get('SUPABASE_KEY', '')
 
 # Database Configuration
-DB_TYPE = os.environ.get('DB_TYPE', 'supabase')  # 'supabase' or 'sqlite'
+DB_TYPE = os.environ.get('DB_TYPE', 'supabase')  # 'supabase', 'sqlite' or 'postgres'
 DB_PATH = os.environ.get('DB_PATH', 'astrolabe.db')
 
+# SQLite history rows keep raw TLE lines as a small residual against the
+# parsed fields instead of full text (lines are rebuilt on read)
+COMPACT_LINES = os.environ.get('COMPACT_LINES', '0').lower() in ('1', 'true', 'yes')
+
+# Split the SQLite TLE history into one attached file per 'year' or 'month'
+# ('' keeps a single file)
+SQLITE_PARTITION = os.environ.get('SQLITE_PARTITION', '').lower()
+
+# Direct PostgreSQL connection (DB_TYPE=postgres) and its connection pool size
+POSTGRES_DSN = os.environ.get('POSTGRES_DSN', '')
+POSTGRES_POOL_MIN = int(os.environ.get('POSTGRES_POOL_MIN', 1))
+POSTGRES_POOL_MAX = int(os.environ.get('POSTGRES_POOL_MAX', 4))
+
+# Streaming ingest: HTTP read size and TLE records parsed per chunk
+HTTP_CHUNK_SIZE = int(os.environ.get('HTTP_CHUNK_SIZE', 64 * 1024))
+STREAM_BATCH_RECORDS = int(os.environ.get('STREAM_BATCH_RECORDS', 5000))
+
+# Bytes per record-aligned chunk handed to backfill worker processes
+BACKFILL_CHUNK_BYTES = int(os.environ.get('BACKFILL_CHUNK_BYTES', 4 * 1024 * 1024))
+# Accepted rows per backfill transaction (0: one per file); each file also ends one
+BACKFILL_COMMIT_ROWS = int(os.environ.get('BACKFILL_COMMIT_ROWS', 1_000_000))
+
+# Rows handed to the backend per write call
+WRITE_BATCH_SIZE = int(os.environ.get('WRITE_BATCH_SIZE', 1000))
+
+# Pipelined ingest: parsed chunks queue up for background writer threads
+# (more than one only for backends that accept concurrent writes)
+PIPELINE_WRITES = os.environ.get('PIPELINE_WRITES', '1').lower() not in ('0', 'false', 'no')
+WRITE_QUEUE_DEPTH = int(os.environ.get('WRITE_QUEUE_DEPTH', 4))
+WRITE_THREADS = int(os.environ.get('WRITE_THREADS', 2))
+
+# Supabase bulk writes: rows per request and requests in flight
+SUPABASE_CHUNK_SIZE = int(os.environ.get('SUPABASE_CHUNK_SIZE', 500))
+SUPABASE_CONCURRENCY = int(os.environ.get('SUPABASE_CONCURRENCY', 4))
+
+# Supabase reads: norad_ids per IN (...) filter, and the half-widths in days of
+# the windows tried around t by batched nearest-epoch lookups
+SUPABASE_ID_CHUNK = int(os.environ.get('SUPABASE_ID_CHUNK', 200))
+SUPABASE_NEAREST_WINDOWS = (3, 30, 365)
+
 # Validate configuration
 def validate_config():
     """Validate that required configuration is present"""
@@ -24,6 +65,15 @@ def validate_config():
                 "Missing Supabase configuration. "
                 "Please set SUPABASE_URL and SUPABASE_KEY in .env file"
             )
+    elif DB_TYPE == 'sqlite':
+        if SQLITE_PARTITION not in ('', 'year', 'month'):
+            raise ValueError("SQLITE_PARTITION must be 'year', 'month' or empty")
+    elif DB_TYPE == 'postgres':
+        if not POSTGRES_DSN:
+            raise ValueError(
+                "Missing PostgreSQL configuration. "
+                "Please set POSTGRES_DSN in .env file"
+            )
 
 # Celestrak URLs
 CELESTRAK_URLS = {
@@ -34,8 +84,50 @@ CELESTRAK_URLS = {
     'visual': 'https://celestrak.org/NORAD/elements/gp.php?GROUP=visual&FORMAT=tle',
 }
 
+# Drop TLEs not newer than the latest stored epoch before writing (disable for backfills)
+SKIP_KNOWN_EPOCHS = os.environ.get('SKIP_KNOWN_EPOCHS', '1').lower() not in ('0', 'false', 'no')
+
+# Conditional-GET cache of source downloads (set to '' to disable)
+FETCH_CACHE_DIR = os.environ.get('FETCH_CACHE_DIR', str(Path(__file__).parent.parent.parent / '.cache' / 'fetch'))
+
+# Columnar memory-mapped archive of accepted element sets (set to a directory
+# to write it alongside the database; ARCHIVE_ONLY skips the database entirely)
+ARCHIVE_DIR = os.environ.get('ARCHIVE_DIR', '')
+ARCHIVE_ONLY = os.environ.get('ARCHIVE_ONLY', '0').lower() in ('1', 'true', 'yes')
+
+# Persistent Bloom filter of stored (norad_id, epoch) keys: TLEs it has never
+# seen go straight to the backend and only possible repeats are looked up
+# (set to a file path to enable; rebuild it with scripts/rebuild_dedup_filter.py)
+DEDUP_FILTER_PATH = os.environ.get('DEDUP_FILTER_PATH', '')
+DEDUP_FILTER_CAPACITY = int(os.environ.get('DEDUP_FILTER_CAPACITY', 20_000_000))
+DEDUP_FILTER_FP_RATE = float(os.environ.get('DEDUP_FILTER_FP_RATE', 0.01))
+
+# Initialized SGP4 constants kept per (norad_id, epoch) so repeated propagation
+# skips init for unchanged TLEs (set SGP4_CACHE_PATH to keep them across runs)
+SGP4_CACHE_SIZE = int(os.environ.get('SGP4_CACHE_SIZE', 200_000))
+SGP4_CACHE_PATH = os.environ.get('SGP4_CACHE_PATH', '')
+
+# Multi-process propagation: worker processes (0 = one per core) and states
+# per work chunk (0 = sized automatically; see PropagationEngine.tune)
+PROPAGATION_WORKERS = int(os.environ.get('PROPAGATION_WORKERS', 0))
+PROPAGATION_CHUNK_STATES = int(os.environ.get('PROPAGATION_CHUNK_STATES', 0))
+
+# Concurrent group fetching: worker threads and simultaneous requests per host
+FETCH_MAX_WORKERS = int(os.environ.get('FETCH_MAX_WORKERS', 8))
+FETCH_PER_HOST = int(os.environ.get('FETCH_PER_HOST', 2))
+
 # Space-Track Configuration
 SPACETRACK_IDENTITY = os.environ.get('SPACETRACK_IDENTITY', '')
 SPACETRACK_PASSWORD = os.environ.get('SPACETRACK_PASSWORD', '')
 SPACETRACK_URL = "https://www.space-track.org/ajaxauth/login"
-SPACETRACK_API_URL = "https://www.space-track.org/basicspacedata/query/class/gp/EPOCH/%3Enow-30/orderby/NORAD_CAT_ID,EPOCH/format/3le"
\ No newline at end of file
+SPACETRACK_API_URL = "https://www.space-track.org/basicspacedata/query/class/gp/EPOCH/%3Enow-30/orderby/NORAD_CAT_ID,EPOCH/format/3le"
+SPACETRACK_QUERY_URL = "https://www.space-track.org/basicspacedata/query"
+
+# Incremental Space-Track pulls: persisted high-water mark and query splitting
+SPACETRACK_STATE_PATH = os.environ.get(
+    'SPACETRACK_STATE_PATH', str(Path(__file__).parent.parent.parent / '.cache' / 'spacetrack_state.json')
+)
+SPACETRACK_ID_BLOCK = int(os.environ.get('SPACETRACK_ID_BLOCK', 20000))
+SPACETRACK_MAX_ID = int(os.environ.get('SPACETRACK_MAX_ID', 99999))
+SPACETRACK_PAGE_DELAY = float(os.environ.get('SPACETRACK_PAGE_DELAY', 2.5))
+SPACETRACK_OVERLAP_MINUTES = int(os.environ.get('SPACETRACK_OVERLAP_MINUTES', 60))
\ No newline at end of file
@@ -0,0 +1,175 @@
+"""LRU cache of initialized SGP4 constants keyed by (norad_id, epoch)"""
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from .bloom import tle_hashes
+from .config import SGP4_CACHE_PATH, SGP4_CACHE_SIZE
+from .propagate import ELEMENT_FIELDS, sgp4_init
+
+FORMAT_VERSION = 1
+
+
+def _constant_names() -> tuple:
+    """Column names sgp4_init currently produces, to spot stale cache files"""
+    empty = {key: np.zeros(0, dtype='datetime64[us]' if key == 'epoch' else np.float64)
+             for key in ELEMENT_FIELDS}
+    return tuple(sorted(sgp4_init(empty)))
+
+
+class ConstantsCache:
+    """Initialized SGP4 constants for recently propagated element sets.
+
+    ``init`` runs ``sgp4_init`` only for element sets whose
+    (norad_id, epoch) is not cached yet and returns constants for every
+    input row in order, so re-propagating a catalog only pays for the TLEs
+    that changed. Rows are kept in one struct-of-arrays table found by
+    hash lookup; once it holds more than ``capacity`` rows, those least
+    recently returned by ``init`` are evicted. With a ``path`` the table is
+    loaded from and saved to an .npz file.
+    """
+
+    def __init__(self, capacity: int = SGP4_CACHE_SIZE, path: Optional[str] = SGP4_CACHE_PATH):
+        self.capacity = max(int(capacity), 1)
+        self.path = path or None
+        self.stats = {'lookups': 0, 'hits': 0, 'evictions': 0, 'init_rows': 0, 'init_seconds': 0.0}
+        self._clock = 0
+        self._clear()
+        if self.path:
+            self._load()
+
+    def _clear(self):
+        self._hashes = np.zeros(0, dtype=np.uint64)
+        self._norad_ids = np.zeros(0, dtype=np.int64)
+        self._epochs = np.zeros(0, dtype=np.int64)
+        self._used = np.zeros(0, dtype=np.int64)
+        self._columns: Dict[str, np.ndarray] = {}
+        self._sort()
+
+    def _sort(self):
+        self._order = np.argsort(self._hashes, kind='stable')
+        self._sorted = self._hashes[self._order]
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def _find(self, hashes: np.ndarray, norad_ids: np.ndarray, epochs: np.ndarray) -> np.ndarray:
+        """Table row of each key, or -1 where it is not cached"""
+        if not len(self._sorted):
+            return np.full(len(hashes), -1)
+        pos = np.minimum(np.searchsorted(self._sorted, hashes), len(self._sorted) - 1)
+        rows = self._order[pos]
+        found = (
+            (self._sorted[pos] == hashes)
+            & (self._norad_ids[rows] == norad_ids)
+            & (self._epochs[rows] == epochs)
+        )
+        return np.where(found, rows, -1)
+
+    def init(self, elements: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Constants for every element set (``sgp4_init`` output), computing only misses"""
+        norad_ids = np.asarray(elements['norad_id'], dtype=np.int64)
+        epoch_values = np.asarray(elements['epoch'], dtype='datetime64[us]')
+        epochs = epoch_values.astype(np.int64)
+        hashes = tle_hashes(norad_ids, epoch_values)
+        rows = self._find(hashes, norad_ids, epochs)
+        missing = np.flatnonzero(rows < 0)
+        self.stats['lookups'] += len(rows)
+        self.stats['hits'] += len(rows) - len(missing)
+
+        if len(missing):
+            # Initialize each distinct missing key once and append it to the table
+            _, first, inverse = np.unique(hashes[missing], return_index=True, return_inverse=True)
+            new = missing[first]
+            start = time.perf_counter()
+            constants = sgp4_init({key: np.asarray(values)[new] for key, values in elements.items()})
+            self.stats['init_seconds'] += time.perf_counter() - start
+            self.stats['init_rows'] += len(new)
+            base = len(self._hashes)
+            if not self._columns:
+                self._columns = {key: values[:0] for key, values in constants.items()}
+            self._columns = {
+                key: np.concatenate([self._columns[key], constants[key]]) for key in self._columns
+            }
+            self._hashes = np.concatenate([self._hashes, hashes[new]])
+            self._norad_ids = np.concatenate([self._norad_ids, norad_ids[new]])
+            self._epochs = np.concatenate([self._epochs, epochs[new]])
+            self._used = np.concatenate([self._used, np.zeros(len(new), dtype=np.int64)])
+            rows[missing] = base + np.arange(len(new))[inverse.ravel()]
+            self._sort()
+
+        self._clock += 1
+        self._used[rows] = self._clock
+        result = {key: values[rows] for key, values in self._columns.items()}
+        self._evict()
+        return result
+
+    def _evict(self):
+        """Drop the least recently used rows beyond capacity"""
+        excess = len(self._hashes) - self.capacity
+        if excess <= 0:
+            return
+        keep = np.sort(np.argsort(self._used, kind='stable')[excess:])
+        self._hashes = self._hashes[keep]
+        self._norad_ids = self._norad_ids[keep]
+        self._epochs = self._epochs[keep]
+        self._used = self._used[keep]
+        self._columns = {key: values[keep] for key, values in self._columns.items()}
+        self.stats['evictions'] += excess
+        self._sort()
+
+    def hit_rate(self) -> float:
+        """Fraction of looked-up element sets served from the cache"""
+        return self.stats['hits'] / self.stats['lookups'] if self.stats['lookups'] else 0.0
+
+    def saved_seconds(self) -> float:
+        """Init time the hits avoided, at the measured per-row init cost"""
+        if not self.stats['init_rows']:
+            return 0.0
+        return self.stats['hits'] * self.stats['init_seconds'] / self.stats['init_rows']
+
+    def print_stats(self):
+        """Print hit rate and init time saved"""
+        print(f"SGP4 constants cache: {len(self):,} rows (capacity {self.capacity:,})")
+        print(f"  Lookups: {self.stats['lookups']:,}, hit rate {self.hit_rate():.1%}")
+        print(f"  Initialized: {self.stats['init_rows']:,} rows in {self.stats['init_seconds']:.3f}s")
+        print(f"  Init time saved: ~{self.saved_seconds():.3f}s")
+        if self.stats['evictions']:
+            print(f"  Evicted: {self.stats['evictions']:,}")
+
+    def save(self, path: Optional[str] = None):
+        """Write the table to an .npz file, replacing any previous one atomically"""
+        path = Path(path or self.path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + '.tmp')
+        with open(tmp, 'wb') as f:
+            np.savez(
+                f, version=FORMAT_VERSION, names=np.array(sorted(self._columns)),
+                hashes=self._hashes, norad_ids=self._norad_ids, epochs=self._epochs, used=self._used,
+                **{'c_' + key: values for key, values in self._columns.items()},
+            )
+        os.replace(tmp, path)
+
+    def _load(self):
+        """Read a saved table; a missing, unreadable or stale file leaves the cache empty"""
+        try:
+            with np.load(self.path) as data:
+                if int(data['version']) != FORMAT_VERSION:
+                    return
+                names = tuple(data['names'].tolist())
+                if names != _constant_names():
+                    return
+                self._columns = {key: data['c_' + key] for key in names}
+                self._hashes = data['hashes']
+                self._norad_ids = data['norad_ids']
+                self._epochs = data['epochs']
+                self._used = data['used']
+        except (OSError, ValueError, KeyError):
+            self._clear()
+            return
+        self._clock = int(self._used.max(initial=0))
+        self._sort()
+        self._evict()
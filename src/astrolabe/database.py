@@ -1,200 +1,42 @@
-"""Database operations for TLE tracker"""
-import time
-import sqlite3
-from typing import List, Dict, Optional, Any
-from abc import ABC, abstractmethod
-from pathlib import Path
-from supabase import create_client, Client
-import requests
-
-from .parser import TLEParser
-from .config import (
-    SUPABASE_URL, SUPABASE_KEY, DB_TYPE, DB_PATH, validate_config
-)
-from .spacetrack import SpaceTrackClient
-
-
-class DatabaseBackend(ABC):
-    """Abstract base class for database backends"""
-    
-    @abstractmethod
-    def upsert_satellites(self, satellites: List[Dict]) -> int:
-        """Upsert satellites and return count of updated rows"""
-        pass
-
-    @abstractmethod
-    def insert_tles(self, tles: List[Dict]) -> int:
-        """Insert TLEs and return count of added rows (skipping duplicates)"""
-        pass
-
-    @abstractmethod
-    def get_stats(self) -> Dict:
-        """Get database statistics"""
-        pass
+"""Database operations for TLE tracker
 
+The storage backends live in ``astrolabe.backends`` and are imported only
+when selected; the names below are re-exported lazily for existing callers.
+"""
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple
+import numpy as np
 
-class SupabaseBackend(DatabaseBackend):
-    """Supabase implementation of database backend"""
-
-    def __init__(self):
-        self.supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-
-    def upsert_satellites(self, satellites: List[Dict]) -> int:
-        try:
-            self.supabase.table('satellites').upsert(
-                satellites,
-                on_conflict='norad_id'
-            ).execute()
-            return len(satellites)
-        except Exception as e:
-            print(f"Error updating satellites: {e}")
-            raise
-
-    def insert_tles(self, tles: List[Dict]) -> int:
-        added_count = 0
-        for tle in tles:
-            try:
-                # Check if TLE already exists
-                existing = self.supabase.table('tles').select('id').eq(
-                    'norad_id', tle['norad_id']
-                ).eq(
-                    'epoch', tle['epoch']
-                ).execute()
-
-                if not existing.data:
-                    # Insert new TLE
-                    self.supabase.table('tles').insert(tle).execute()
-                    added_count += 1
-            except Exception:
-                # Likely a duplicate, skip
-                pass
-        return added_count
-
-    def get_stats(self) -> Dict:
-        try:
-            result = self.supabase.rpc('get_tle_stats').execute()
-            if result.data and len(result.data) > 0:
-                return result.data[0]
-            return {}
-        except Exception as e:
-            print(f"Error getting stats: {e}")
-            return {}
-
-
-class SQLiteBackend(DatabaseBackend):
-    """SQLite implementation of database backend"""
-
-    def __init__(self, db_path: str):
-        self.db_path = db_path
-        self._init_db()
-
-    def _init_db(self):
-        """Initialize database schema"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS satellites (
-                    norad_id INTEGER PRIMARY KEY,
-                    name TEXT,
-                    international_designator TEXT,
-                    is_active BOOLEAN DEFAULT 1,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS tles (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    norad_id INTEGER,
-                    epoch TIMESTAMP,
-                    tle_line1 TEXT,
-                    tle_line2 TEXT,
-                    inclination REAL,
-                    raan REAL,
-                    eccentricity REAL,
-                    argument_of_perigee REAL,
-                    mean_anomaly REAL,
-                    mean_motion REAL,
-                    revolution_number INTEGER,
-                    bstar REAL,
-                    mean_motion_dot REAL,
-                    source TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(norad_id, epoch),
-                    FOREIGN KEY(norad_id) REFERENCES satellites(norad_id)
-                )
-            """)
-            conn.commit()
-
-    def upsert_satellites(self, satellites: List[Dict]) -> int:
-        count = 0
-        with sqlite3.connect(self.db_path) as conn:
-            for sat in satellites:
-                try:
-                    conn.execute("""
-                        INSERT INTO satellites (norad_id, name, international_designator, is_active)
-                        VALUES (?, ?, ?, ?)
-                        ON CONFLICT(norad_id) DO UPDATE SET
-                            name=excluded.name,
-                            international_designator=excluded.international_designator,
-                            is_active=excluded.is_active,
-                            updated_at=CURRENT_TIMESTAMP
-                    """, (
-                        sat['norad_id'],
-                        sat['name'],
-                        sat['international_designator'],
-                        sat['is_active']
-                    ))
-                    count += 1
-                except Exception as e:
-                    print(f"Error upserting satellite {sat['norad_id']}: {e}")
-        return count
-
-    def insert_tles(self, tles: List[Dict]) -> int:
-        added_count = 0
-        with sqlite3.connect(self.db_path) as conn:
-            for tle in tles:
-                try:
-                    conn.execute("""
-                        INSERT INTO tles (
-                            norad_id, epoch, tle_line1, tle_line2,
-                            inclination, raan, eccentricity, argument_of_perigee,
-                            mean_anomaly, mean_motion, revolution_number,
-                            bstar, mean_motion_dot, source
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        tle['norad_id'], tle['epoch'], tle['tle_line1'], tle['tle_line2'],
-                        tle['inclination'], tle['raan'], tle['eccentricity'], tle['argument_of_perigee'],
-                        tle['mean_anomaly'], tle['mean_motion'], tle['revolution_number'],
-                        tle['bstar'], tle['mean_motion_dot'], tle['source']
-                    ))
-                    added_count += 1
-                except sqlite3.IntegrityError:
-                    # Duplicate
-                    pass
-                except Exception as e:
-                    print(f"Error inserting TLE: {e}")
-        return added_count
-
-    def get_stats(self) -> Dict:
-        stats = {}
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute("SELECT COUNT(*) FROM satellites")
-                stats['total_satellites'] = cursor.fetchone()[0]
-                
-                cursor.execute("SELECT COUNT(*) FROM satellites WHERE is_active = 1")
-                stats['active_satellites'] = cursor.fetchone()[0]
-                
-                cursor.execute("SELECT COUNT(*) FROM tles")
-                stats['total_tles'] = cursor.fetchone()[0]
-                
-                cursor.execute("SELECT MAX(epoch) FROM tles")
-                stats['latest_tle_epoch'] = cursor.fetchone()[0]
-                
-        except Exception as e:
-            print(f"Error getting stats: {e}")
-        return stats
+from .parser import TLEParser, epoch_strings
+from .config import (
+    DB_TYPE, DB_PATH, WRITE_BATCH_SIZE,
+    PIPELINE_WRITES, WRITE_QUEUE_DEPTH, WRITE_THREADS,
+    FETCH_CACHE_DIR, SKIP_KNOWN_EPOCHS, ARCHIVE_DIR, ARCHIVE_ONLY, DEDUP_FILTER_PATH, validate_config
+)
+from .backends import create_backend
+from .stream import iter_response_lines, iter_record_chunks
+from .cache import FetchCache
+from .index import EpochIndex
+from .archive import ColumnarArchive
+from .bloom import BloomFilter
+from .writer import BackgroundWriter
+
+_BACKEND_EXPORTS = {
+    'DatabaseBackend': '.backends.base',
+    'TLE_COLUMNS': '.backends.base',
+    'SQLiteBackend': '.backends.sqlite',
+    'PostgresBackend': '.backends.postgres',
+    'SupabaseBackend': '.backends.supabase',
+}
+
+
+def __getattr__(name: str):
+    """Resolve backend classes on first access (``from .database import SQLiteBackend``)"""
+    if name in _BACKEND_EXPORTS:
+        import importlib
+        return getattr(importlib.import_module(_BACKEND_EXPORTS[name], __package__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class TLEDatabaseUpdater:
@@ -206,80 +48,273 @@ class TLEDatabaseUpdater:
         
         if DB_TYPE == 'sqlite':
             print(f"Using SQLite backend: {DB_PATH}")
-            self.backend = SQLiteBackend(DB_PATH)
+        elif DB_TYPE == 'postgres':
+            print("Using PostgreSQL backend")
         else:
             print("Using Supabase backend")
-            self.backend = SupabaseBackend()
+        self.backend = create_backend(DB_TYPE)
             
         self.parser = TLEParser()
         self.spacetrack_client = None
+        self.fetch_cache = FetchCache(FETCH_CACHE_DIR) if FETCH_CACHE_DIR else None
+        self.skip_known = SKIP_KNOWN_EPOCHS
+        self.epoch_index: Optional[EpochIndex] = None
+        self.archive = ColumnarArchive(ARCHIVE_DIR) if ARCHIVE_DIR else None
+        self.archive_only = ARCHIVE_ONLY and self.archive is not None
+        self.pipeline_writes = PIPELINE_WRITES
+        self._write_errors = 0
+        self.dedup_filter_path = DEDUP_FILTER_PATH
+        self.dedup_filter = self._load_dedup_filter() if DEDUP_FILTER_PATH else None
+        # Guard stats, the epoch index, the dedup filter and the archive once
+        # writes run on background threads
+        self._lock = threading.Lock()
+        self._archive_lock = threading.Lock()
         self.stats = {
             'satellites_added': 0,
             'satellites_updated': 0,
             'tles_added': 0,
             'tles_skipped': 0,
+            'tles_archived': 0,
+            'tles_checked': 0,
+            'cache_hits': 0,
             'errors': 0
         }
 
+    def _load_dedup_filter(self) -> BloomFilter:
+        """Load the persisted dedup filter, rebuilding it from the database if missing"""
+        bloom = BloomFilter.load(self.dedup_filter_path)
+        if bloom is not None:
+            print(f"Loaded dedup filter: {len(bloom)} keys, ~{bloom.expected_fp_rate():.2%} false positives")
+            return bloom
+        try:
+            print("Building dedup filter from the database...")
+            bloom = BloomFilter.rebuild(self.backend)
+        except NotImplementedError:
+            # Starts empty and fills as TLEs are written
+            bloom = BloomFilter()
+        bloom.save(self.dedup_filter_path)
+        return bloom
+
     def fetch_tle_data(self, source_url_or_type: str) -> List[str]:
         """Fetch TLE data from Celestrak or Space-Track"""
+        return [line.decode('ascii', 'replace') for line in self.stream_tle_data(source_url_or_type)
+                if line.strip()]
+
+    def stream_tle_data(self, source_url_or_type: str) -> Iterator[bytes]:
+        """Stream TLE lines from Celestrak or Space-Track in bounded memory.
+
+        Requests are conditional when the fetch cache is enabled; an
+        unchanged payload yields no lines and counts as a cache hit.
+        """
+        hits = self.fetch_cache.hits if self.fetch_cache else 0
         if source_url_or_type == 'spacetrack':
             if not self.spacetrack_client:
+                from .spacetrack import SpaceTrackClient
                 self.spacetrack_client = SpaceTrackClient()
-            return self.spacetrack_client.fetch_tles()
-        
-        # Default to Celestrak (URL provided)
-        url = source_url_or_type
-        print(f"Fetching TLE data from: {url}")
+            yield from self.spacetrack_client.stream_tles(self.fetch_cache)
+        else:
+            # Default to Celestrak (URL provided)
+            import requests
+            url = source_url_or_type
+            print(f"Fetching TLE data from: {url}")
+            try:
+                headers = self.fetch_cache.conditional_headers(url) if self.fetch_cache else {}
+                response = requests.get(url, headers=headers, timeout=30, stream=True)
+                response.raise_for_status()
+                if self.fetch_cache:
+                    yield from self.fetch_cache.open(url, response) or ()
+                else:
+                    yield from iter_response_lines(response)
+            except Exception as e:
+                print(f"Error fetching TLE data: {e}")
+        if self.fetch_cache:
+            self._count('cache_hits', self.fetch_cache.hits - hits)
+
+    def process_tles(self, lines: Iterable[str], source: str = 'celestrak') -> int:
+        """Process TLE data and update database.
+
+        ``lines`` may be a list or a generator (see ``stream_tle_data``); it
+        is consumed in record-aligned chunks so memory stays bounded by
+        ``STREAM_BATCH_RECORDS`` regardless of payload size. Returns the
+        number of TLEs read.
+        """
+        return self._process_batches([(lines, source)])
+
+    def process_groups(self, urls: Dict[str, str]) -> int:
+        """Fetch several groups concurrently and write each unique TLE once,
+        tagged with every group it appeared in.
+
+        Fetches go through the fetch cache like ``stream_tle_data``; it is
+        committed only once every group's TLEs reached the database.
+        Returns the number of TLEs read.
+        """
+        from .fetch import GroupFetcher, merge_groups
+
+        hits = self.fetch_cache.hits if self.fetch_cache else 0
+        payloads = GroupFetcher(cache=self.fetch_cache).fetch_all(urls)
+        if self.fetch_cache:
+            self._count('cache_hits', self.fetch_cache.hits - hits)
+        batches, duplicates = merge_groups(payloads)
+        print(f"\nMerged {len(payloads)} groups, dropped {duplicates} cross-group duplicates")
+        return self._process_batches([(lines, ','.join(groups)) for groups, lines in batches])
+
+    def _process_batches(self, batches: List[Tuple[Iterable, str]]) -> int:
+        """Process (lines, source) pairs, then commit or discard the fetch state once"""
+        write_errors = self._write_errors
+        total_tles = 0
         try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-            return response.text.strip().split('\n')
+            for lines, source in batches:
+                print(f"Processing TLEs from {source}...")
+                count = self._process_chunks(lines, source)
+                print(f"Processed {count} TLEs from {source}")
+                total_tles += count
+        except BaseException:
+            self._discard_fetch_state()
+            raise
+        # Only remember what was fetched once every batch of it reached the database
+        if self._write_errors == write_errors:
+            self._commit_fetch_state()
+            if self.dedup_filter is not None:
+                with self._lock:
+                    self.dedup_filter.save(self.dedup_filter_path)
+        else:
+            self._discard_fetch_state()
+        return total_tles
+
+    def _commit_fetch_state(self):
+        if self.fetch_cache:
+            self.fetch_cache.commit()
+        if self.spacetrack_client:
+            self.spacetrack_client.commit_state()
+
+    def _discard_fetch_state(self):
+        if self.fetch_cache:
+            self.fetch_cache.discard()
+        if self.spacetrack_client:
+            self.spacetrack_client.discard_state()
+
+    def _process_chunks(self, lines: Iterable[str], source: str) -> int:
+        """Parse, validate and write record-aligned chunks; returns TLEs read"""
+        total_tles = 0
+        if self.skip_known and self.epoch_index is None:
+            self.epoch_index = EpochIndex.load(self.backend)
+            print(f"Loaded high-water marks for {len(self.epoch_index)} satellites")
+        with self.backend.bulk(), self._writer() as write:
+            for chunk in iter_record_chunks(lines):
+                batch = self.parser.parse_many(chunk)
+                total_tles += len(batch['valid'])
+
+                # Validate the whole chunk at once and summarise rejections
+                report = self.parser.validate_many(batch)
+                if len(report['rejected']):
+                    self._count('errors', len(report['rejected']))
+                    reasons = ', '.join(f"{name}={count}" for name, count in report['counts'].items() if count)
+                    print(f"  Rejected {len(report['rejected'])} invalid TLEs ({reasons})")
+
+                # Only element sets newer than what is stored go to the backend
+                keep = report['accepted']
+                if self.epoch_index is not None:
+                    with self._lock:
+                        newer = self.epoch_index.newer_mask(batch['norad_id'], batch['epoch'])
+                    self._count('tles_skipped', int(np.count_nonzero(keep & ~newer)))
+                    keep = keep & newer
+
+                write(batch, keep, source)
+                print(f"  Processed {total_tles} TLEs...")
+        return total_tles
+
+    @contextmanager
+    def _writer(self):
+        """Yield the batch write function: queued to background threads when
+        pipelining, so parsing the next chunk overlaps the database write.
+
+        Leaving the block flushes every queued batch before the bulk run
+        commits; the first unexpected write error is re-raised there.
+        """
+        if not self.pipeline_writes:
+            yield self.write_batch
+            return
+        threads = WRITE_THREADS if self.backend.concurrent_writes else 1
+        writer = BackgroundWriter(self._write_job, WRITE_QUEUE_DEPTH, threads)
+        try:
+            yield writer.submit
+        finally:
+            writer.close()
+            stats = writer.stats
+            print(f"  Writer busy {stats['write_seconds']:.2f}s; parser waited "
+                  f"{stats['blocked_seconds']:.2f}s on a full queue")
+
+    def _write_job(self, batch: Dict[str, np.ndarray], mask: np.ndarray, source: str):
+        """write_batch on a writer thread, counting anything it lets escape"""
+        try:
+            self.write_batch(batch, mask, source)
         except Exception as e:
-            print(f"Error fetching TLE data: {e}")
-            return []
-
-    def process_tles(self, lines: List[str], source: str = 'celestrak'):
-        """Process TLE data and update database"""
-        total_tles = len(lines) // 3
-        print(f"Processing {total_tles} TLEs from {source}...")
-
-        # Process in batches
-        batch_size = 100
-        satellites_batch = []
-        tles_batch = []
-
-        for i in range(0, len(lines), 3):
-            if i + 2 >= len(lines):
-                break
-
-            name = lines[i].strip()
-            line1 = lines[i + 1].strip()
-            line2 = lines[i + 2].strip()
-
-            # Validate checksums
-            if not (self.parser.validate_checksum(line1) and
-                    self.parser.validate_checksum(line2)):
-                print(f"Invalid checksum for {name}")
-                self.stats['errors'] += 1
-                continue
-
-            # Parse TLE
-            tle_data = self.parser.parse_tle(name, line1, line2)
-            if not tle_data:
-                continue
-
-            # Prepare satellite data
-            satellite = {
+            print(f"Error writing batch: {e}")
+            self._write_failed()
+            raise
+
+    def _count(self, key: str, n: int = 1):
+        with self._lock:
+            self.stats[key] += n
+
+    def _write_failed(self):
+        with self._lock:
+            self.stats['errors'] += 1
+            self._write_errors += 1
+
+    def write_batch(self, batch: Dict[str, np.ndarray], mask: np.ndarray, source: str):
+        """Write the masked rows of a ``TLEParser.parse_many`` batch"""
+        if self.archive is not None:
+            try:
+                with self._archive_lock:
+                    archived = self.archive.append(batch, mask)
+                self._count('tles_archived', archived)
+            except Exception as e:
+                print(f"Error appending to archive: {e}")
+                self._write_failed()
+        if self.archive_only:
+            return
+        if self.dedup_filter is not None:
+            mask = self._drop_known(batch, mask)
+        written = self._write_records(self.parser.to_records(batch, mask), source)
+        if written and self.dedup_filter is not None:
+            with self._lock:
+                self.dedup_filter.add(batch['norad_id'][mask], batch['epoch'][mask])
+
+    def _drop_known(self, batch: Dict[str, np.ndarray], mask: np.ndarray) -> np.ndarray:
+        """Clear rows the database already holds, looking up only those the
+        dedup filter can't rule out"""
+        rows = np.flatnonzero(mask)
+        norad_ids, epochs = batch['norad_id'][rows], batch['epoch'][rows]
+        maybe = self.dedup_filter.might_contain(norad_ids, epochs)
+        if not maybe.any():
+            return mask
+        keys = list(zip(norad_ids[maybe].tolist(), epoch_strings(epochs[maybe]).tolist()))
+        known = self.backend.known_tles(keys)
+        self._count('tles_checked', len(keys))
+        if not known:
+            return mask
+        drop = np.array([key in known for key in keys], dtype=bool)
+        self._count('tles_skipped', int(np.count_nonzero(drop)))
+        mask = mask.copy()
+        mask[rows[maybe][drop]] = False
+        return mask
+
+    def _write_records(self, records: List[Dict], source: str) -> bool:
+        """Split parsed records into satellite/TLE rows and write them in
+        batches; returns whether every TLE batch was written"""
+        written = True
+        batch_size = WRITE_BATCH_SIZE
+        for start in range(0, len(records), batch_size):
+            chunk = records[start:start + batch_size]
+            # One satellite row per object, even if the batch holds several epochs
+            satellites_batch = list({tle_data['norad_id']: {
                 'norad_id': tle_data['norad_id'],
                 'name': tle_data['name'],
                 'international_designator': tle_data['international_designator'],
                 'is_active': True
-            }
-            satellites_batch.append(satellite)
-
-            # Prepare TLE data
-            tle = {
+            } for tle_data in chunk}.values())
+            tles_batch = [{
                 'norad_id': tle_data['norad_id'],
                 'epoch': tle_data['epoch'],
                 'tle_line1': tle_data['tle_line1'],
@@ -294,34 +329,41 @@ class TLEDatabaseUpdater:
                 'bstar': tle_data['bstar'],
                 'mean_motion_dot': tle_data['mean_motion_dot'],
                 'source': source
-            }
-            tles_batch.append(tle)
-
-            # Process batch when full
-            if len(satellites_batch) >= batch_size:
-                self._update_database(satellites_batch, tles_batch)
-                satellites_batch = []
-                tles_batch = []
-                print(f"  Processed {min(i + 3, len(lines))}/{len(lines)} lines...")
-
-        # Process remaining items
-        if satellites_batch:
-            self._update_database(satellites_batch, tles_batch)
+            } for tle_data in chunk]
+
+            if self.epoch_index is not None:
+                with self._lock:
+                    satellites_batch = self.epoch_index.changed_satellites(satellites_batch)
+            satellites_ok, tles_ok = self._update_database(satellites_batch, tles_batch)
+            written = written and tles_ok
+            if self.epoch_index is not None:
+                with self._lock:
+                    self.epoch_index.update(
+                        tles_batch if tles_ok else [],
+                        satellites_batch if satellites_ok else []
+                    )
+        return written
 
     def _update_database(self, satellites: List[Dict], tles: List[Dict]):
-        """Update database with satellite and TLE data"""
+        """Update database with satellite and TLE data; returns per-table success"""
+        satellites_ok = tles_ok = True
         try:
-            updated = self.backend.upsert_satellites(satellites)
-            self.stats['satellites_updated'] += updated
+            if satellites:
+                updated = self.backend.upsert_satellites(satellites)
+                self._count('satellites_updated', updated)
         except Exception as e:
-            self.stats['errors'] += 1
+            self._write_failed()
+            satellites_ok = False
 
         try:
-            added = self.backend.insert_tles(tles)
-            self.stats['tles_added'] += added
-            self.stats['tles_skipped'] += (len(tles) - added)
+            if tles:
+                added = self.backend.insert_tles(tles)
+                self._count('tles_added', added)
+                self._count('tles_skipped', len(tles) - added)
         except Exception as e:
-            self.stats['errors'] += 1
+            self._write_failed()
+            tles_ok = False
+        return satellites_ok, tles_ok
 
     def get_database_stats(self) -> Dict:
         """Get current database statistics"""
@@ -334,6 +376,9 @@ class TLEDatabaseUpdater:
             'satellites_updated': 0,
             'tles_added': 0,
             'tles_skipped': 0,
+            'tles_archived': 0,
+            'tles_checked': 0,
+            'cache_hits': 0,
             'errors': 0
         }
 
@@ -345,6 +390,11 @@ class TLEDatabaseUpdater:
         print(f"Satellites updated: {self.stats['satellites_updated']}")
         print(f"New TLEs added: {self.stats['tles_added']}")
         print(f"Duplicate TLEs skipped: {self.stats['tles_skipped']}")
+        if self.archive is not None:
+            print(f"TLEs archived: {self.stats['tles_archived']}")
+        if self.dedup_filter is not None:
+            print(f"Possible duplicates looked up: {self.stats['tles_checked']}")
+        print(f"Unchanged fetches skipped: {self.stats['cache_hits']}")
         print(f"Errors: {self.stats['errors']}")
 
         # Get database stats
@@ -356,4 +406,4 @@ class TLEDatabaseUpdater:
             print(f"Active satellites: {db_stats.get('active_satellites', 'N/A')}")
             print(f"Total TLEs: {db_stats.get('total_tles', 'N/A')}")
             if db_stats.get('latest_tle_epoch'):
-                print(f"Latest TLE: {db_stats.get('latest_tle_epoch', 'N/A')}")
\ No newline at end of file
+                print(f"Latest TLE: {db_stats.get('latest_tle_epoch', 'N/A')}")
@@ -0,0 +1,215 @@
+"""Multi-process SGP4 propagation into a shared-memory output buffer"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .config import PROPAGATION_CHUNK_STATES, PROPAGATION_WORKERS
+from .propagate import PRECISIONS, sgp4_propagate
+
+# Automatic chunk sizing: the smallest chunk worth a task round trip, the
+# largest before load balancing suffers, and chunks queued per worker
+MIN_CHUNK_STATES = 1 << 15
+MAX_CHUNK_STATES = 1 << 21
+CHUNKS_PER_WORKER = 4
+
+# Chunk sizes PropagationEngine.tune tries
+TUNE_CANDIDATES = (1 << 15, 1 << 16, 1 << 17, 1 << 18, 1 << 19, 1 << 20)
+
+# Worker side: shared segments this process has attached, by name
+_attached: Dict[str, shared_memory.SharedMemory] = {}
+
+
+def _pack(arrays: Dict[str, np.ndarray]) -> Tuple[shared_memory.SharedMemory, List[Tuple]]:
+    """Copy arrays into one new shared segment.
+
+    Returns the segment and its layout, a list of (key, dtype, shape,
+    offset) from which workers rebuild the arrays without copying.
+    """
+    layout = []
+    offset = 0
+    for key, values in arrays.items():
+        offset = (offset + 63) // 64 * 64
+        layout.append((key, values.dtype.str, values.shape, offset))
+        offset += values.nbytes
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    for (_, dtype, shape, start), values in zip(layout, arrays.values()):
+        np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=start)[...] = values
+    return shm, layout
+
+
+def _attach(name: str, keep: Tuple[str, ...]) -> shared_memory.SharedMemory:
+    """Attach a segment once per worker, closing those of earlier calls"""
+    for old in [n for n in _attached if n not in keep]:
+        _attached.pop(old).close()
+    if name not in _attached:
+        _attached[name] = shared_memory.SharedMemory(name=name)
+    return _attached[name]
+
+
+def _propagate_chunk(task: Tuple) -> float:
+    """Worker: propagate one (rows, columns) tile straight into the shared output.
+
+    Returns only the seconds spent; the states never leave shared memory.
+    """
+    start = time.perf_counter()
+    inputs, layout, output, shape, rows, cols, precision = task
+    keep = (inputs, output)
+    buf = _attach(inputs, keep).buf
+    arrays = {
+        key: np.ndarray(dims, dtype=dtype, buffer=buf, offset=offset)
+        for key, dtype, dims, offset in layout
+    }
+    out = np.ndarray(shape, dtype=np.float64, buffer=_attach(output, keep).buf)
+    tsince = arrays.pop('tsince')
+    constants = {key: values[cols] for key, values in arrays.items()}
+    tsince = tsince[rows] if tsince.ndim == 1 else tsince[rows, cols]
+    sgp4_propagate(constants, tsince, out=out[rows, cols], precision=precision)
+    return time.perf_counter() - start
+
+
+class PropagationEngine:
+    """SGP4 propagation sharded across a persistent pool of worker processes.
+
+    Each call copies the constants and times into shared memory once and
+    splits the (n_times, n_sats) grid into tiles of about ``chunk_states``
+    states: runs of satellites over all times, or runs of times when the
+    catalog is too small to give every worker several chunks. Workers
+    propagate their tiles directly into a shared output buffer, so no
+    states are pickled back, and pick up new tiles as they finish, which
+    evens out the costlier deep-space columns. With ``chunk_states`` 0 the
+    size is derived from the grid and worker count (see ``tune`` to
+    measure it instead).
+
+    The pool and the output buffer are kept across calls. ``propagate``
+    returns a view of that buffer, valid until the next call or
+    ``close()``; copy it to keep it longer.
+    """
+
+    def __init__(self, workers: int = PROPAGATION_WORKERS, chunk_states: int = PROPAGATION_CHUNK_STATES):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_states = chunk_states
+        self.stats = {'calls': 0, 'states': 0, 'chunks': 0, 'wall_seconds': 0.0, 'worker_seconds': 0.0}
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._out: Optional[shared_memory.SharedMemory] = None
+        self._retired: List[shared_memory.SharedMemory] = []
+
+    def __enter__(self) -> 'PropagationEngine':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _plan(self, n_times: int, n_sats: int) -> List[Tuple[slice, slice]]:
+        """(rows, columns) tiles covering the grid"""
+        size = self.chunk_states or min(MAX_CHUNK_STATES, max(
+            MIN_CHUNK_STATES, -(-n_times * n_sats // (self.workers * CHUNKS_PER_WORKER))))
+        cols = min(n_sats, max(1, size // n_times))
+        rows = n_times if cols < n_sats else min(n_times, max(1, size // n_sats))
+        return [
+            (slice(r, min(r + rows, n_times)), slice(c, min(c + cols, n_sats)))
+            for c in range(0, n_sats, cols) for r in range(0, n_times, rows)
+        ]
+
+    def _output(self, shape: Tuple[int, int, int]) -> np.ndarray:
+        """View of the shared output buffer, grown if it is too small"""
+        nbytes = int(np.prod(shape)) * 8
+        if self._out is None or self._out.size < nbytes:
+            self._release_output()
+            self._out = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+        return np.ndarray(shape, dtype=np.float64, buffer=self._out.buf)
+
+    def _release_output(self):
+        if self._out is not None:
+            self._out.unlink()
+            self._retired.append(self._out)
+            self._out = None
+        for shm in list(self._retired):
+            try:
+                shm.close()
+            except BufferError:
+                # A view returned earlier is still alive; try again next time
+                continue
+            self._retired.remove(shm)
+
+    def propagate(self, constants: Dict[str, np.ndarray], tsince: np.ndarray,
+                  precision: str = 'exact') -> np.ndarray:
+        """``sgp4_propagate`` across the worker pool; same arguments and result shape"""
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unknown precision {precision!r}; expected one of {', '.join(PRECISIONS)}")
+        wall = time.perf_counter()
+        n_sats = len(constants['ecco'])
+        tsince = np.asarray(tsince, dtype=np.float64)
+        n_times = tsince.shape[0]
+        out = self._output((n_times, n_sats, 6))
+        if not n_times or not n_sats:
+            return out
+
+        inputs, layout = _pack({**constants, 'tsince': tsince})
+        try:
+            tasks = [
+                (inputs.name, layout, self._out.name, out.shape, rows, cols, precision)
+                for rows, cols in self._plan(n_times, n_sats)
+            ]
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            for seconds in self._pool.map(_propagate_chunk, tasks):
+                self.stats['worker_seconds'] += seconds
+        finally:
+            inputs.unlink()
+            inputs.close()
+
+        self.stats['calls'] += 1
+        self.stats['states'] += n_times * n_sats
+        self.stats['chunks'] += len(tasks)
+        self.stats['wall_seconds'] += time.perf_counter() - wall
+        return out
+
+    def tune(self, constants: Dict[str, np.ndarray], tsince: np.ndarray,
+             candidates: Tuple[int, ...] = TUNE_CANDIDATES) -> int:
+        """Time a propagation at each candidate chunk size and keep the fastest.
+
+        Mirrors src/mojo/tune_chunks.mojo; run it on a representative
+        catalog and time span, then set ``PROPAGATION_CHUNK_STATES``.
+        """
+        stats = dict(self.stats)
+        count = len(constants['ecco']) * len(tsince)
+        print(f"Chunk size tuning: {self.workers} workers, {count:,} states")
+        # Warm up: start the workers and size the output buffer
+        self.chunk_states = candidates[0]
+        self.propagate(constants, tsince)
+        best, best_rate = candidates[0], 0.0
+        for size in candidates:
+            self.chunk_states = size
+            start = time.perf_counter()
+            self.propagate(constants, tsince)
+            rate = count / (time.perf_counter() - start)
+            print(f"  {size:>10,} states/chunk: {rate / 1e6:.2f}M states/sec")
+            if rate > best_rate:
+                best, best_rate = size, rate
+        self.chunk_states = best
+        self.stats = stats
+        print(f"Best: {best:,} states/chunk")
+        return best
+
+    def print_stats(self):
+        """Print throughput and how well the workers were kept busy"""
+        stats = self.stats
+        chunk = f"{self.chunk_states:,} states" if self.chunk_states else 'auto'
+        print(f"Propagation engine: {self.workers} workers, chunk size {chunk}")
+        print(f"  Calls: {stats['calls']}, {stats['states']:,} states in {stats['chunks']:,} chunks")
+        if stats['wall_seconds']:
+            print(f"  Wall: {stats['wall_seconds']:.2f}s "
+                  f"({stats['states'] / stats['wall_seconds'] / 1e6:.2f}M states/sec)")
+            busy = stats['worker_seconds'] / (stats['wall_seconds'] * self.workers)
+            print(f"  Worker time: {stats['worker_seconds']:.2f}s ({busy:.0%} of available)")
+
+    def close(self):
+        """Stop the workers and release the output buffer"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        self._release_output()
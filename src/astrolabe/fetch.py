@@ -0,0 +1,115 @@
+"""Concurrent fetching of Celestrak groups with cross-group deduplication"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .cache import FetchCache
+from .config import FETCH_MAX_WORKERS, FETCH_PER_HOST
+from .stream import iter_response_lines
+
+
+def create_session(pool_size: int = FETCH_MAX_WORKERS) -> requests.Session:
+    """Keep-alive session sized for concurrent requests (gzip is on by default)"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['Accept-Encoding'] = 'gzip, deflate'
+    return session
+
+
+class GroupFetcher:
+    """Fetch several TLE groups in parallel over one shared session.
+
+    At most ``per_host`` requests run against any single host at a time, so
+    pulling every Celestrak group at once stays within their usage policy.
+    With a ``FetchCache``, requests are conditional and unchanged groups
+    come back empty; the caller commits or discards the cache once the
+    payloads are processed.
+    """
+
+    def __init__(self, session: requests.Session = None,
+                 max_workers: int = FETCH_MAX_WORKERS, per_host: int = FETCH_PER_HOST,
+                 cache: Optional[FetchCache] = None):
+        self.session = session or create_session(max_workers)
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.cache = cache
+        self._host_limits: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _host_limit(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self.per_host)
+            return self._host_limits[host]
+
+    def fetch(self, url: str) -> Iterable[bytes]:
+        """Fetch one URL's lines, empty if it failed or is unchanged in the cache.
+
+        The body is streamed: into the cache's spool file when there is a
+        cache, otherwise line by line from the response.
+        """
+        with self._host_limit(url):
+            print(f"Fetching TLE data from: {url}")
+            try:
+                headers = self.cache.conditional_headers(url) if self.cache else {}
+                response = self.session.get(url, headers=headers, timeout=30, stream=True)
+                response.raise_for_status()
+                if self.cache:
+                    return self.cache.open(url, response) or ()
+                return list(iter_response_lines(response))
+            except Exception as e:
+                print(f"Error fetching TLE data: {e}")
+                return ()
+
+    def fetch_all(self, urls: Dict[str, str]) -> Dict[str, Iterable[bytes]]:
+        """Fetch every group concurrently, returning line payloads keyed by group"""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            payloads = pool.map(self.fetch, urls.values())
+            return dict(zip(urls.keys(), payloads))
+
+
+def merge_groups(payloads: Dict[str, Iterable[bytes]]) -> Tuple[List[Tuple[Tuple[str, ...], List[bytes]]], int]:
+    """Merge group payloads into one catalog deduplicated by (norad_id, epoch).
+
+    Records are keyed straight from the line-1 text (catalog number and
+    epoch columns), so nothing is parsed twice. Returns (groups, lines)
+    batches, one per tuple of groups the records appeared in, plus the
+    number of duplicate records dropped. Named records come out as 3LE;
+    bare 2LE records keep no name (as in ``TLEParser.parse_many``) and
+    come out in separate 2LE batches, so no stored name is overwritten.
+    """
+    seen: Dict[Tuple[bytes, bytes], int] = {}
+    records: List[Tuple[bytes, bytes, bytes]] = []
+    memberships: List[List[str]] = []
+    duplicates = 0
+
+    for group, payload in payloads.items():
+        lines = [line.strip() for line in payload if line.strip()]
+        for i in range(len(lines) - 1):
+            line1, line2 = lines[i], lines[i + 1]
+            if line1[:2] != b'1 ' or line2[:2] != b'2 ':
+                continue
+            name = lines[i - 1] if i > 0 and lines[i - 1][:2] not in (b'1 ', b'2 ') else b''
+            key = (line1[2:7], line1[18:32])
+            index = seen.get(key)
+            if index is None:
+                seen[key] = len(records)
+                records.append((name, line1, line2))
+                memberships.append([group])
+            else:
+                duplicates += 1
+                if group not in memberships[index]:
+                    memberships[index].append(group)
+
+    buckets: Dict[Tuple[Tuple[str, ...], bool], List[bytes]] = {}
+    for (name, line1, line2), groups in zip(records, memberships):
+        lines = buckets.setdefault((tuple(groups), bool(name)), [])
+        lines.extend((name, line1, line2) if name else (line1, line2))
+    return [(groups, lines) for (groups, _), lines in buckets.items()], duplicates
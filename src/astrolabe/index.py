@@ -0,0 +1,73 @@
+"""In-memory high-water-mark index of stored element sets"""
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+
+def to_datetime64(epochs: Iterable[str]) -> np.ndarray:
+    """Convert stored ISO epoch strings (naive or UTC-suffixed) to datetime64[us]"""
+    cleaned = [e.replace(' ', 'T').replace('+00:00', '').rstrip('Z') for e in epochs]
+    return np.array(cleaned, dtype='datetime64[us]')
+
+
+class EpochIndex:
+    """Latest stored epoch per norad_id plus satellite row fingerprints.
+
+    Loaded once per run from the backend, it lets the updater drop TLEs that
+    are not newer than what is already stored, and satellite rows whose name
+    and designator have not changed, before anything is sent to the database.
+    """
+
+    def __init__(self, latest_epochs: Dict[int, str], satellites: Dict[int, Tuple[str, str]]):
+        ids = np.fromiter(latest_epochs.keys(), dtype=np.int64, count=len(latest_epochs))
+        epochs = to_datetime64(latest_epochs.values()).astype(np.int64)
+        order = np.argsort(ids)
+        self._ids = ids[order]
+        self._epochs = epochs[order]
+        self._fingerprints = dict(satellites)
+
+    @classmethod
+    def load(cls, backend) -> 'EpochIndex':
+        """Build the index from a backend's latest-epoch and satellite maps"""
+        return cls(backend.get_latest_epochs(), backend.get_satellite_fingerprints())
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def newer_mask(self, norad_ids: np.ndarray, epochs: np.ndarray) -> np.ndarray:
+        """True where an element set is newer than the stored high-water mark"""
+        if len(self._ids) == 0:
+            return np.ones(len(norad_ids), dtype=bool)
+        query = epochs.astype('datetime64[us]').astype(np.int64)
+        pos = np.minimum(np.searchsorted(self._ids, norad_ids), len(self._ids) - 1)
+        known = self._ids[pos] == norad_ids
+        return ~known | (query > self._epochs[pos])
+
+    def _fingerprint(self, sat: Dict) -> Tuple[str, str]:
+        """(name, designator) a row leaves stored; an empty name keeps the stored one"""
+        stored = self._fingerprints.get(sat['norad_id'])
+        name = sat['name'] or (stored[0] if stored else sat['name'])
+        return name, sat['international_designator']
+
+    def changed_satellites(self, satellites: List[Dict]) -> List[Dict]:
+        """Keep satellite rows that are new or whose name/designator changed"""
+        return [
+            sat for sat in satellites
+            if self._fingerprints.get(sat['norad_id']) != self._fingerprint(sat)
+        ]
+
+    def update(self, tles: List[Dict], satellites: List[Dict] = ()):
+        """Advance the index after rows were written successfully"""
+        for sat in satellites:
+            self._fingerprints[sat['norad_id']] = self._fingerprint(sat)
+        if not tles:
+            return
+        ids = np.array([tle['norad_id'] for tle in tles], dtype=np.int64)
+        epochs = to_datetime64(tle['epoch'] for tle in tles).astype(np.int64)
+        ids = np.concatenate((self._ids, ids))
+        epochs = np.concatenate((self._epochs, epochs))
+        # Sort by id then epoch and keep the last (newest) entry of each id
+        order = np.lexsort((epochs, ids))
+        ids, epochs = ids[order], epochs[order]
+        last = np.append(ids[1:] != ids[:-1], True)
+        self._ids, self._epochs = ids[last], epochs[last]
@@ -0,0 +1,212 @@
+"""Lossless compact encoding of TLE lines as parsed fields plus a residual"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .index import to_datetime64
+from .parser import LINE_WIDTH, _CHECKSUM_WEIGHT, _line_matrix
+
+# Stored columns a line pair is re-rendered from
+FIELDS = (
+    'norad_id', 'epoch', 'mean_motion_dot', 'bstar', 'inclination', 'raan',
+    'eccentricity', 'argument_of_perigee', 'mean_anomaly', 'mean_motion',
+    'revolution_number',
+)
+
+_SPACE, _MINUS, _PLUS, _DOT, _ZERO = (ord(c) for c in ' -+.0')
+_CHECKSUM_COL = LINE_WIDTH - 1
+_WEIGHT = _CHECKSUM_WEIGHT.astype(np.uint8)
+
+# Fields with no column of their own are rendered as their usual values;
+# anything else ends up in the residual
+_LINE1_TEMPLATE = b'1 00000U          00000.00000000  .00000000  00000-0  00000-0 0  999 '
+_LINE2_TEMPLATE = b'2 00000   0.0000   0.0000 0000000   0.0000   0.0000  0.00000000    0 '
+
+
+def _digits(values: np.ndarray, width: int) -> np.ndarray:
+    """N x width ASCII digits of non-negative integers, zero padded"""
+    powers = 10 ** np.arange(width - 1, -1, -1, dtype=np.int64)
+    return ((values[:, None] // powers) % 10 + _ZERO).astype(np.uint8)
+
+
+def _blank_leading_zeros(digits: np.ndarray) -> np.ndarray:
+    """Right-align: turn leading zeros into blanks, keeping the last digit"""
+    leading = np.cumprod(digits[:, :-1] == _ZERO, axis=1).astype(bool)
+    digits[:, :-1][leading] = _SPACE
+    return digits
+
+
+def _fixed(values: np.ndarray, int_width: int, frac_width: int) -> np.ndarray:
+    """Render like '%{int_width + 1 + frac_width}.{frac_width}f' for values >= 0"""
+    scaled = np.rint(np.abs(values) * 10.0 ** frac_width).astype(np.int64)
+    whole = _blank_leading_zeros(_digits(scaled // 10 ** frac_width, int_width))
+    dot = np.full((len(values), 1), _DOT, dtype=np.uint8)
+    return np.hstack((whole, dot, _digits(scaled % 10 ** frac_width, frac_width)))
+
+
+def _implied(values: np.ndarray) -> np.ndarray:
+    """Render implied-decimal exponent fields such as ' 34123-4'"""
+    magnitude = np.abs(values)
+    nonzero = magnitude > 0
+    exponent = np.zeros(len(values), dtype=np.int64)
+    exponent[nonzero] = np.floor(np.log10(magnitude[nonzero])).astype(np.int64) + 1
+    mantissa = np.rint(magnitude * 10.0 ** (5 - exponent)).astype(np.int64)
+    carry = mantissa >= 100000
+    mantissa = np.where(carry, np.rint(mantissa / 10), mantissa).astype(np.int64)
+    exponent += carry
+    out = np.empty((len(values), 8), dtype=np.uint8)
+    out[:, 0] = np.where(values < 0, _MINUS, _SPACE)
+    out[:, 1:6] = _digits(mantissa % 100000, 5)
+    out[:, 6] = np.where((exponent < 0) | ~nonzero, _MINUS, _PLUS)
+    out[:, 7] = _ZERO + np.abs(exponent) % 10
+    return out
+
+
+def _set_checksums(m: np.ndarray, out: Optional[np.ndarray] = None):
+    """Write the checksum of each row of m into m (or into out)"""
+    out = m if out is None else out
+    out[:, _CHECKSUM_COL] = _ZERO + _WEIGHT[m[:, :_CHECKSUM_COL]].sum(axis=1, dtype=np.uint16) % 10
+
+
+def render_lines(fields: Dict[str, Sequence]) -> Tuple[np.ndarray, np.ndarray]:
+    """Render canonical line 1 / line 2 matrices (N x 69 bytes) from stored fields.
+
+    ``fields`` holds equal-length sequences keyed by ``FIELDS``; ``epoch``
+    may be ISO strings or datetime64. Columns not kept in the database
+    (designator, element set number, ...) take their common values.
+    """
+    norad = np.asarray(fields['norad_id'], dtype=np.int64)
+    n = len(norad)
+    epoch = np.asarray(fields['epoch'])
+    if epoch.dtype.kind != 'M':
+        epoch = to_datetime64(epoch)
+    epoch = epoch.astype('datetime64[us]')
+    value = {key: np.asarray(fields[key], dtype=np.float64) for key in FIELDS[2:10]}
+
+    m1 = np.tile(np.frombuffer(_LINE1_TEMPLATE, dtype=np.uint8), (n, 1))
+    m2 = np.tile(np.frombuffer(_LINE2_TEMPLATE, dtype=np.uint8), (n, 1))
+    catalog = _digits(norad % 100000, 5)
+    m1[:, 2:7] = catalog
+    m2[:, 2:7] = catalog
+
+    # Epoch: two-digit year, day of year and an eight-digit day fraction
+    year = epoch.astype('datetime64[Y]')
+    day = epoch.astype('datetime64[D]')
+    m1[:, 18:20] = _digits((year.astype(np.int64) + 1970) % 100, 2)
+    m1[:, 20:23] = _digits((day - year.astype('datetime64[D]')).astype(np.int64) + 1, 3)
+    micros = (epoch - day).astype(np.int64)
+    m1[:, 24:32] = _digits(np.minimum((micros + 432) // 864, 99999999), 8)
+
+    ndot = value['mean_motion_dot']
+    m1[:, 33] = np.where(ndot < 0, _MINUS, _SPACE)
+    m1[:, 35:43] = _digits(np.rint(np.abs(ndot) * 1e8).astype(np.int64) % 100000000, 8)
+    m1[:, 53:61] = _implied(value['bstar'])
+
+    for key, start in (('inclination', 8), ('raan', 17), ('argument_of_perigee', 34), ('mean_anomaly', 43)):
+        m2[:, start:start + 8] = _fixed(value[key], 3, 4)
+    m2[:, 26:33] = _digits(np.rint(value['eccentricity'] * 1e7).astype(np.int64) % 10000000, 7)
+    m2[:, 52:63] = _fixed(value['mean_motion'], 2, 8)
+    revolution = np.asarray(fields['revolution_number'], dtype=np.int64) % 100000
+    m2[:, 63:68] = _blank_leading_zeros(_digits(revolution, 5))
+
+    _set_checksums(m1)
+    _set_checksums(m2)
+    return m1, m2
+
+
+def _run_layout(diff: np.ndarray):
+    """Locate the differing byte runs of every row of an N x 69 diff mask.
+
+    A blank column is spliced in before the checksum so it always forms a
+    run of its own. Returns per-run (row, column, length) arrays in
+    row-major order plus per-cell (row, column, run) arrays.
+    """
+    n = len(diff)
+    gap = np.zeros((n, 1), dtype=bool)
+    split = np.hstack((diff[:, :_CHECKSUM_COL], gap, diff[:, _CHECKSUM_COL:]))
+    edges = np.diff(np.hstack((gap, split, gap)).view(np.int8), axis=1)
+    run_rows, run_starts = np.nonzero(edges == 1)
+    _, run_stops = np.nonzero(edges == -1)
+    cell_rows, cell_cols = np.nonzero(split)
+    cell_runs = np.cumsum(edges[:, :-1][split] == 1) - 1
+    unsplit = lambda cols: cols - (cols > _CHECKSUM_COL)
+    return (run_rows, unsplit(run_starts), run_stops - run_starts,
+            cell_rows, unsplit(cell_cols), cell_runs)
+
+
+def encode_residuals(fields: Dict[str, Sequence], line1: Sequence[str],
+                     line2: Sequence[str]) -> List[Optional[bytes]]:
+    """Residuals that turn ``render_lines(fields)`` back into the original lines.
+
+    Each residual holds, for line 1 then line 2, a run count followed by
+    (column, length, bytes) for every stretch that differs from the
+    canonical rendering. The checksum column is compared against the
+    checksum the restored text would get, so only bad checksums cost
+    anything. Rows whose lines are not plain 69-character ASCII get
+    ``None`` and should be stored verbatim.
+    """
+    n = len(line1)
+    plain = np.ones(n, dtype=bool)
+    layouts = []
+    for source, rendered in zip((line1, line2), render_lines(fields)):
+        plain &= np.array([len(line) == LINE_WIDTH and line.isascii() for line in source], dtype=bool)
+        m = _line_matrix(np.array([line.encode('ascii', 'replace') for line in source], dtype=f'S{LINE_WIDTH}'))
+        _set_checksums(m, rendered)
+        layouts.append((m, _run_layout(m != rendered)))
+
+    # Byte size of each row's part for either line, then where each part starts
+    sizes = [
+        1 + np.bincount(run_rows, weights=2 + lengths, minlength=n).astype(np.int64)
+        for _, (run_rows, _, lengths, _, _, _) in layouts
+    ]
+    ends = np.cumsum(sizes[0] + sizes[1])
+    part_starts = [ends - sizes[0] - sizes[1], ends - sizes[1]]
+    buf = np.zeros(int(ends[-1]) if n else 0, dtype=np.uint8)
+    for (m, layout), base in zip(layouts, part_starts):
+        run_rows, run_cols, lengths, cell_rows, cell_cols, cell_runs = layout
+        buf[base] = np.bincount(run_rows, minlength=n)
+        # Offset of each run within its row's part: sizes of the row's earlier runs
+        size = 2 + lengths
+        before = np.cumsum(size) - size
+        first = np.searchsorted(run_rows, run_rows)
+        at = base[run_rows] + 1 + before - before[first]
+        buf[at] = run_cols
+        buf[at + 1] = lengths
+        buf[at[cell_runs] + 2 + cell_cols - run_cols[cell_runs]] = m[cell_rows, cell_cols]
+
+    data = buf.tobytes()
+    starts = part_starts[0].tolist()
+    return [data[a:b] if ok else None for a, b, ok in zip(starts, ends.tolist(), plain.tolist())]
+
+
+def decode_lines(fields: Dict[str, Sequence], residuals: Sequence[bytes]) -> Tuple[List[str], List[str]]:
+    """Restore the original line pairs from stored fields and their residuals"""
+    lengths = np.fromiter((len(r) for r in residuals), dtype=np.int64, count=len(residuals))
+    buf = np.frombuffer(b''.join(residuals) + b'\x00', dtype=np.uint8)
+    pos = np.cumsum(lengths) - lengths
+    rows = np.arange(len(residuals))
+    restored = []
+    for m in render_lines(fields):
+        counts = buf[pos].astype(np.int64)
+        pos = pos + 1
+        checksums = []
+        # Step through the k-th run of every row that has one
+        for k in range(int(counts.max()) if len(counts) else 0):
+            live = rows[counts > k]
+            at = pos[live]
+            cols = buf[at].astype(np.int64)
+            run_lengths = buf[at + 1].astype(np.int64)
+            for j in range(int(run_lengths.max())):
+                hit = run_lengths > j
+                r, c = live[hit], cols[hit] + j
+                values = buf[at[hit] + 2 + j]
+                body = c < _CHECKSUM_COL
+                m[r[body], c[body]] = values[body]
+                checksums.append((r[~body], values[~body]))
+            pos[live] += 2 + run_lengths
+        # Checksums follow the restored text unless the original was wrong
+        _set_checksums(m)
+        for r, values in checksums:
+            m[r, _CHECKSUM_COL] = values
+        restored.append(np.ascontiguousarray(m).view(f'S{LINE_WIDTH}').ravel().astype(str).tolist())
+    return restored[0], restored[1]
@@ -1,11 +1,363 @@
 """TLE parsing utilities"""
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+# Fixed width of a TLE data line
+LINE_WIDTH = 69
+
+# Numeric field layout as (line, start, stop) slices, matching parse_tle
+_FIXED_FIELDS = {
+    'epoch_day': (1, 20, 32),
+    'mean_motion_dot': (1, 33, 43),
+    'inclination': (2, 8, 16),
+    'raan': (2, 17, 25),
+    'argument_of_perigee': (2, 34, 42),
+    'mean_anomaly': (2, 43, 51),
+    'mean_motion': (2, 52, 63),
+}
+_INT_FIELDS = {
+    'norad_id': (1, 2, 7),
+    'epoch_year': (1, 18, 20),
+    'line2_norad_id': (2, 2, 7),
+    'revolution_number': (2, 63, 68),
+}
+_IMPLIED_FIELDS = {
+    'mean_motion_ddot': (1, 44, 52),
+    'bstar': (1, 53, 61),
+}
+
+_SPACE, _PLUS, _MINUS, _DOT, _ZERO = (ord(c) for c in ' +-.0')
+
+# Rejection reason bit flags reported by TLEParser.validate_many
+REJECT_LINE_NUMBER = 1      # lines do not start with '1' / '2'
+REJECT_LENGTH = 2           # a data line is shorter than 69 characters
+REJECT_CHECKSUM = 4         # modulo-10 checksum mismatch on either line
+REJECT_CATALOG_MISMATCH = 8  # catalog number differs between line 1 and 2
+REJECT_COLUMNS = 16         # separator blanks / decimal points out of place
+REJECT_FORMAT = 32          # a numeric field failed to decode
+
+REJECT_REASONS = {
+    REJECT_LINE_NUMBER: 'line_number',
+    REJECT_LENGTH: 'length',
+    REJECT_CHECKSUM: 'checksum',
+    REJECT_CATALOG_MISMATCH: 'catalog_mismatch',
+    REJECT_COLUMNS: 'columns',
+    REJECT_FORMAT: 'format',
+}
+
+# Fixed blank separators and decimal points of the standard layout
+_LINE1_BLANKS = [1, 8, 17, 32, 43, 52, 61, 63]
+_LINE1_DOTS = [23, 34]
+_LINE2_BLANKS = [1, 7, 16, 25, 33, 42, 51]
+_LINE2_DOTS = [11, 20, 37, 46, 54]
+
+# Checksum weight of every byte value: digits count as themselves, '-' as 1
+_CHECKSUM_WEIGHT = np.zeros(256, dtype=np.int32)
+_CHECKSUM_WEIGHT[_ZERO:_ZERO + 10] = np.arange(10)
+_CHECKSUM_WEIGHT[_MINUS] = 1
+
+# Powers of ten from Python's own float pow, so decoded values match float()
+_POW10 = np.array([10.0 ** k for k in range(-20, 21)])
+
+
+def _split_lines(buf: bytes):
+    """Locate non-blank lines in a text buffer without a Python-level loop.
+
+    Returns the buffer as a uint8 array plus ``(starts, ends)`` offsets of
+    each line with surrounding whitespace trimmed.
+    """
+    arr = np.frombuffer(buf, dtype=np.uint8)
+    if len(arr) == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return arr, empty, empty
+    breaks = np.flatnonzero(arr == ord('\n'))
+    starts = np.concatenate(([0], breaks + 1))
+    ends = np.concatenate((breaks, [len(arr)]))
+    # Only the bytes at each line edge are tested, not the whole buffer
+    while True:
+        edge = arr[np.maximum(ends - 1, 0)]
+        trim = (ends > starts) & ((edge == _SPACE) | (edge == ord('\t')) | (edge == ord('\r')))
+        if not trim.any():
+            break
+        ends -= trim
+    while True:
+        edge = arr[np.minimum(starts, len(arr) - 1)]
+        trim = (ends > starts) & ((edge == _SPACE) | (edge == ord('\t')) | (edge == ord('\r')))
+        if not trim.any():
+            break
+        starts += trim
+    keep = ends > starts
+    return arr, starts[keep], ends[keep]
+
+
+def _gather(arr: np.ndarray, starts: np.ndarray, ends: np.ndarray, width: int) -> np.ndarray:
+    """Copy lines into an N x width byte matrix, NUL padded past each line end"""
+    if len(starts) == 0 or width == 0:
+        return np.zeros((len(starts), width), dtype=np.uint8)
+    if starts.max() + width > len(arr):
+        arr = np.concatenate((arr, np.zeros(width, dtype=np.uint8)))
+    # One width-byte item per buffer offset, so each line is a single copy
+    items = np.ndarray((len(arr) - width + 1,), dtype=f'V{width}', buffer=arr, strides=(1,))
+    rows = items[starts].view(np.uint8).reshape(-1, width)
+    short = np.flatnonzero(ends - starts < width)
+    if len(short):
+        rows[short] *= np.arange(width) < (ends - starts)[short, None]
+    return rows
+
+
+def _decode_fixed(cols: np.ndarray):
+    """Decode a fixed-point text field stored column-major as (width, N).
+
+    Digits are accumulated into an exact int64 mantissa and divided once by
+    a power of ten, so results are bit-identical to ``float()`` on the text.
+    Returns ``(value, valid, mantissa, frac_digits)``.
+    """
+    is_digit = (cols - _ZERO) < 10
+    is_dot = cols == _DOT
+    is_minus = cols == _MINUS
+    is_sign = is_minus | (cols == _PLUS)
+    valid = (
+        np.all(is_digit | is_dot | is_sign | (cols == _SPACE), axis=0)
+        & np.any(is_digit, axis=0)
+        & (is_dot.sum(axis=0) <= 1)
+        & (is_sign.sum(axis=0) <= 1)
+    )
+    n = cols.shape[1]
+    mantissa = np.zeros(n, dtype=np.int64)
+    frac_digits = np.zeros(n, dtype=np.int64)
+    seen_dot = np.zeros(n, dtype=bool)
+    for j in range(cols.shape[0]):
+        digit = is_digit[j]
+        mantissa = np.where(digit, mantissa * 10 + (cols[j] - _ZERO), mantissa)
+        seen_dot |= is_dot[j]
+        frac_digits += digit & seen_dot
+    value = mantissa / _POW10[20 + frac_digits]
+    value = np.where(is_minus.any(axis=0), -value, value)
+    return value, valid, mantissa, frac_digits
+
+
+def _decode_int(cols: np.ndarray):
+    """Decode a right-aligned integer field into (value, valid) arrays"""
+    value, valid, mantissa, _ = _decode_fixed(cols)
+    valid &= ~np.any(cols == _DOT, axis=0)
+    return np.where(value < 0, -mantissa, mantissa), valid
+
+
+def _decode_implied(cols: np.ndarray):
+    """Decode an implied-decimal field such as ' 34123-4' (= 0.34123e-4)"""
+    mant_sign, digits, exp_sign, exp_digit = cols[0], cols[1:6], cols[6], cols[7]
+    digit_ok = (digits - _ZERO) < 10
+    valid = (
+        ((mant_sign == _SPACE) | (mant_sign == _PLUS) | (mant_sign == _MINUS))
+        & np.all(digit_ok | (digits == _SPACE), axis=0)
+        & ((exp_sign == _SPACE) | (exp_sign == _PLUS) | (exp_sign == _MINUS))
+        & ((exp_digit - _ZERO) < 10)
+    )
+    # Leading blanks are dropped rather than read as zeros, as parse_tle does
+    _, _, mantissa, _ = _decode_fixed(np.where(digit_ok, digits, _SPACE).astype(np.uint8))
+    exponent = np.minimum(exp_digit - _ZERO, 9).astype(np.int64)
+    exponent = np.where(exp_sign == _MINUS, -exponent, exponent)
+    value = (mantissa / _POW10[20 + digit_ok.sum(axis=0)]) * _POW10[20 + exponent]
+    return np.where(mant_sign == _MINUS, -value, value), valid
+
+
+# Fast path: on rows in the standard column layout every numeric field is
+# decoded at once from 8-byte lanes. A field's digit columns (the standard
+# decimal point left out) are packed right-aligned into one lane, or two for
+# more than eight digits, padded with the blank separator of column 1. Rows
+# that do not fit the layout fall back to the column-wise decoders above, so
+# results are identical either way.
+_ONES = 0x0101010101010101
+# Rows decoded per block by parse_matrices
+_BLOCK_ROWS = 8192
+
+
+def _lane_layout(line: int) -> Dict:
+    """Build the lane gather index and field tables of one data line"""
+    dots = _LINE1_DOTS if line == 1 else _LINE2_DOTS
+    specs = [(key, 'int', a, b) for key, (l, a, b) in _INT_FIELDS.items() if l == line]
+    specs += [(key, 'fixed', a, b) for key, (l, a, b) in _FIXED_FIELDS.items() if l == line]
+    specs += [(key, 'implied', a, b) for key, (l, a, b) in _IMPLIED_FIELDS.items() if l == line]
+    if line == 2:
+        specs.append(('eccentricity', 'ecc', 26, 33))
+    index: List[int] = []
+    need: List[int] = []
+    layout: Dict = {'fields': [], 'last': [], 'divisor': [], 'implied': [], 'split': [], 'high': []}
+    for key, kind, a, b in specs:
+        dot = next((c for c in dots if a <= c < b), None) if kind == 'fixed' else None
+        columns = list(range(a + 1, a + 6)) if kind == 'implied' else [c for c in range(a, b) if c != dot]
+        lane, lanes = len(index) // 8, (len(columns) + 7) // 8
+        index += [1] * (8 * lanes - len(columns)) + columns
+        digits = {'int': 1, 'ecc': len(columns), 'implied': 0, 'fixed': b - 1 - (dot or 0)}[kind]
+        need += [0] * (lanes - 1) + [sum(1 << (8 * i) for i in range(8 - digits, 8))]
+        if kind == 'implied':
+            layout['implied'].append((key, lane, a))
+            continue
+        if lanes == 2:
+            layout['split'].append(len(layout['fields']))
+            layout['high'].append(lane)
+        layout['fields'].append((key, kind))
+        layout['last'].append(lane + lanes - 1)
+        layout['divisor'].append({'int': 1.0, 'ecc': 1e7, 'fixed': _POW10[20 + digits]}[kind])
+        if key == 'epoch_day':
+            layout['day_digits'] = digits
+    layout['index'] = np.array(index)
+    # Fraction digits each lane must hold, as 0x01 bytes
+    layout['need'] = np.array(need, dtype=np.uint64)
+    layout['divisor'] = np.array(layout['divisor'])
+    layout['columns'] = [1] + dots
+    layout['expected'] = np.array([_SPACE] + [_DOT] * len(dots), dtype=np.uint8)
+    return layout
+
+
+_LANES = {line: _lane_layout(line) for line in (1, 2)}
+
+
+def _lane_digits(x: np.ndarray) -> np.ndarray:
+    """Combine eight digit values per little-endian uint64 lane into an integer"""
+    x = (x * 10 + (x >> 8)) & 0x00FF00FF00FF00FF
+    x = (x * 100 + (x >> 16)) & 0x0000FFFF0000FFFF
+    return (x * 10000 + (x >> 32)) & 0xFFFFFFFF
+
+
+def _decode_lanes(m: np.ndarray, line: int):
+    """Decode the numeric fields of one line's N x 69 matrix lane-wise.
+
+    Returns the decoded fields, their ``valid`` mask and a mask of the rows
+    decoded exactly; the remaining rows need the column-wise decoders.
+    """
+    layout = _LANES[line]
+    last, split, high = layout['last'], layout['split'], layout['high']
+    x = m.take(layout['index'], axis=1)
+    d = x - _ZERO
+    digit = d < 10
+
+    def lanes(a):
+        return a.view(np.uint8).view('<u8')
+
+    values = _lane_digits(lanes(d * digit))
+    digit_lanes = lanes(digit)
+    other = _ONES - digit_lanes
+    plus = lanes(x == _PLUS)
+    minus = lanes(x == _MINUS)
+    blank = lanes(x == _SPACE)
+    signs = ((plus + minus) * _ONES) >> 56
+    # Only blanks and at most one sign before the digits, which must be a
+    # run of high-order bytes holding every fraction digit
+    leading = other * 0xFF
+    exact = (
+        ((leading & (leading + 1)) == 0)
+        & ((digit_lanes | plus | minus | blank) == _ONES)
+        & (signs <= 1)
+        & ((digit_lanes & layout['need']) == layout['need'])
+    ).all(axis=1)
+    exact &= np.all(m[:, layout['columns']] == layout['expected'], axis=1)
+    # A two-lane field: the high lane is only read once the low lane is full
+    lows = [last[i] for i in split]
+    exact &= np.all((other[:, lows] == 0) | (other[:, high] == _ONES), axis=1)
+    exact &= np.all(signs[:, lows] + signs[:, high] <= 1, axis=1)
+
+    mantissa = values[:, last]
+    mantissa[:, split] += values[:, high] * 100_000_000
+    mantissa = mantissa.astype(np.int64)
+    negative = minus[:, last] != 0
+    negative[:, split] |= minus[:, high] != 0
+    ints = np.where(negative, -mantissa, mantissa)
+    floats = mantissa / layout['divisor']
+    floats = np.where(negative, -floats, floats)
+    decoded: Dict[str, np.ndarray] = {}
+    for i, (key, kind) in enumerate(layout['fields']):
+        decoded[key] = ints[:, i] if kind == 'int' else floats[:, i]
+        if key == 'epoch_day':
+            decoded['day_mantissa'] = mantissa[:, i]
+            decoded['day_digits'] = np.full(len(m), layout['day_digits'], dtype=np.int64)
+
+    valid = np.ones(len(m), dtype=bool)
+    for key, lane, a in layout['implied']:
+        mant_sign, exp_sign, exp_digit = m[:, a], m[:, a + 6], m[:, a + 7]
+        valid &= (
+            ((mant_sign == _SPACE) | (mant_sign == _PLUS) | (mant_sign == _MINUS))
+            & ((exp_sign == _SPACE) | (exp_sign == _PLUS) | (exp_sign == _MINUS))
+            & ((exp_digit - _ZERO) < 10)
+        )
+        exact &= signs[:, lane] == 0
+        digits = ((digit_lanes[:, lane] * _ONES) >> 56).astype(np.int64)
+        exponent = np.minimum(exp_digit - _ZERO, 9).astype(np.int64)
+        exponent = np.where(exp_sign == _MINUS, -exponent, exponent)
+        value = (values[:, lane].astype(np.int64) / _POW10[20 + digits]) * _POW10[20 + exponent]
+        decoded[key] = np.where(mant_sign == _MINUS, -value, value)
+    return decoded, valid, exact
+
+
+def _decode_columns(m1: np.ndarray, m2: np.ndarray):
+    """Decode every numeric field column by column, for any row layout"""
+    cols = {1: np.ascontiguousarray(m1.T), 2: np.ascontiguousarray(m2.T)}
+    decoded: Dict[str, np.ndarray] = {}
+    valid = np.ones(len(m1), dtype=bool)
+    for key, (line, a, b) in _INT_FIELDS.items():
+        decoded[key], ok = _decode_int(cols[line][a:b])
+        valid &= ok
+    for key, (line, a, b) in _FIXED_FIELDS.items():
+        decoded[key], ok, mantissa, frac_digits = _decode_fixed(cols[line][a:b])
+        valid &= ok
+        if key == 'epoch_day':
+            decoded['day_mantissa'], decoded['day_digits'] = mantissa, frac_digits
+    for key, (line, a, b) in _IMPLIED_FIELDS.items():
+        decoded[key], ok = _decode_implied(cols[line][a:b])
+        valid &= ok
+    ecc_cols = cols[2][26:33]
+    ecc, ok, _, _ = _decode_fixed(ecc_cols)
+    decoded['eccentricity'] = ecc / 1e7
+    valid &= ok & np.all((ecc_cols - _ZERO) < 10, axis=0)
+    return decoded, valid
+
+
+def _text_column(rows: np.ndarray, strip: bool = True) -> np.ndarray:
+    """View an N x width byte matrix as a fixed-width bytes array.
+
+    NumPy drops trailing NULs from ``S`` values, so lines shorter than the
+    matrix width come back exactly as they were.
+    """
+    if rows.shape[1] == 0:
+        return np.zeros(len(rows), dtype='S1')
+    text = np.ascontiguousarray(rows).view(f'S{rows.shape[1]}').ravel()
+    return np.char.strip(text) if strip else text
+
+
+def _line_matrix(lines: np.ndarray) -> np.ndarray:
+    """View a fixed-width bytes array of data lines as an N x 69 byte matrix"""
+    lines = np.ascontiguousarray(lines.astype(f'S{LINE_WIDTH}'))
+    return lines.view(np.uint8).reshape(-1, LINE_WIDTH)
+
+
+def _checksum_ok(m: np.ndarray) -> np.ndarray:
+    """Vectorized modulo-10 checksum test over an N x 69 byte matrix"""
+    total = _CHECKSUM_WEIGHT[m[:, :LINE_WIDTH - 1]].sum(axis=1)
+    return (total % 10) == (m[:, LINE_WIDTH - 1].astype(np.int32) - _ZERO)
+
+
+def epoch_strings(epochs: np.ndarray) -> np.ndarray:
+    """Format datetime64 epochs exactly like ``datetime.isoformat()``"""
+    if len(epochs) == 0:
+        return np.array([], dtype=str)
+    text = np.datetime_as_string(epochs.astype('datetime64[us]'), unit='us')
+    whole = (epochs.astype('datetime64[us]').astype(np.int64) % 1_000_000) == 0
+    return np.where(whole, np.char.replace(text, '.000000', ''), text)
 
 
 class TLEParser:
     """Parse TLE data and extract orbital elements"""
 
+    # Columns of a parse_many() batch, in parse_tle() record order
+    RECORD_FIELDS = (
+        'norad_id', 'name', 'international_designator', 'epoch',
+        'tle_line1', 'tle_line2', 'inclination', 'raan', 'eccentricity',
+        'argument_of_perigee', 'mean_anomaly', 'mean_motion',
+        'revolution_number', 'bstar', 'mean_motion_dot',
+    )
+
     @staticmethod
     def parse_tle(name: str, line1: str, line2: str) -> Optional[Dict]:
         """Parse a TLE into components"""
@@ -102,4 +454,147 @@ class TLEParser:
                 checksum += int(char)
             elif char == '-':
                 checksum += 1
-        return (checksum % 10) == int(line[-1])
\ No newline at end of file
+        return (checksum % 10) == int(line[-1])
+
+    @staticmethod
+    def parse_many(lines_or_bytes: Union[bytes, str, Iterable[Union[str, bytes]]]) -> Dict[str, np.ndarray]:
+        """Parse a whole file of TLEs into a struct-of-arrays batch.
+
+        Accepts raw file contents (bytes/str) or an iterable of lines in 3LE
+        (name + two lines) or bare 2LE layout. The data lines are gathered
+        into N x 69 byte matrices whose numeric fields are decoded together,
+        a block of rows at a time.
+        Returns a dict of equal-length arrays keyed like ``parse_tle``
+        output (``epoch`` as ``datetime64[us]``, text fields as fixed-width
+        ``bytes`` arrays), plus ``classification``,
+        ``epoch_year``, ``epoch_day``, ``mean_motion_ddot``,
+        ``line2_norad_id`` and a ``valid`` mask flagging rows where every
+        field decoded cleanly. Malformed rows never raise. Bare 2LE rows
+        carry an empty ``name``: the name is unknown, and writers keep
+        whatever name is already stored rather than blanking it.
+        """
+        if isinstance(lines_or_bytes, str):
+            lines_or_bytes = lines_or_bytes.encode('ascii', 'replace')
+        elif not isinstance(lines_or_bytes, (bytes, bytearray, memoryview)):
+            lines_or_bytes = b'\n'.join(
+                l.encode('ascii', 'replace') if isinstance(l, str) else l
+                for l in lines_or_bytes
+            )
+        arr, starts, ends = _split_lines(bytes(lines_or_bytes))
+
+        # Frame records: bare 2LE if the file opens with line 1/line 2, else 3LE
+        first = arr[starts] if len(starts) else starts
+        if len(starts) >= 2 and first[0] == ord('1') and first[1] == ord('2'):
+            n = len(starts) // 2
+            l1, l2 = slice(0, 2 * n, 2), slice(1, 2 * n, 2)
+            name_rows = np.zeros((n, 0), dtype=np.uint8)
+        else:
+            n = len(starts) // 3
+            l1, l2 = slice(1, 3 * n, 3), slice(2, 3 * n, 3)
+            ns, ne = starts[0:3 * n:3], ends[0:3 * n:3]
+            name_rows = _gather(arr, ns, ne, int((ne - ns).max()) if n else 0)
+
+        m1 = _gather(arr, starts[l1], ends[l1], LINE_WIDTH)
+        m2 = _gather(arr, starts[l2], ends[l2], LINE_WIDTH)
+        return TLEParser.parse_matrices(name_rows, m1, m2)
+
+    @staticmethod
+    def parse_matrices(name_rows: np.ndarray, m1: np.ndarray, m2: np.ndarray) -> Dict[str, np.ndarray]:
+        """Decode N x 69 line-1/line-2 byte matrices (see ``parse_many``)"""
+        # Decode in blocks of rows so the byte temporaries stay in cache
+        parts: Dict[str, List[np.ndarray]] = {}
+        valid_parts, exact_parts = [], []
+        for start in range(0, max(len(m1), 1), _BLOCK_ROWS):
+            block = slice(start, start + _BLOCK_ROWS)
+            decoded, valid1, exact1 = _decode_lanes(m1[block], 1)
+            line2, valid2, exact2 = _decode_lanes(m2[block], 2)
+            decoded.update(line2)
+            for key, values in decoded.items():
+                parts.setdefault(key, []).append(values)
+            valid_parts.append(valid1 & valid2)
+            exact_parts.append(exact1 & exact2)
+        batch = {key: np.concatenate(values) for key, values in parts.items()}
+        valid = np.concatenate(valid_parts)
+        slow = np.flatnonzero(~np.concatenate(exact_parts))
+        if len(slow):
+            decoded, valid[slow] = _decode_columns(m1[slow], m2[slow])
+            for key, values in decoded.items():
+                batch[key][slow] = values
+        valid &= (m1[:, 0] == ord('1')) & (m2[:, 0] == ord('2'))
+        day_mantissa, day_digits = batch.pop('day_mantissa'), batch.pop('day_digits')
+
+        # Epoch: whole days plus the day fraction as exact integer microseconds
+        years = batch['epoch_year']
+        years = np.where(years < 57, 2000 + years, 1900 + years)
+        scale = (10 ** np.minimum(day_digits, 12)).astype(np.int64)
+        whole_days = day_mantissa // scale - 1
+        micros = np.rint((day_mantissa % scale) * (86_400_000_000 / scale)).astype(np.int64)
+        batch['epoch'] = (
+            (years - 1970).astype('datetime64[Y]').astype('datetime64[us]')
+            + (whole_days * 86_400_000_000 + micros).astype('timedelta64[us]')
+        )
+
+        batch['name'] = _text_column(name_rows, strip=False)
+        batch['classification'] = _text_column(m1[:, 7:8])
+        batch['international_designator'] = _text_column(m1[:, 9:17])
+        batch['tle_line1'] = _text_column(m1, strip=False)
+        batch['tle_line2'] = _text_column(m2, strip=False)
+        batch['valid'] = valid
+        return batch
+
+    @staticmethod
+    def to_records(batch: Dict[str, np.ndarray], mask: Optional[np.ndarray] = None) -> List[Dict]:
+        """Convert rows of a ``parse_many`` batch into ``parse_tle``-style dicts"""
+        if mask is None:
+            mask = batch['valid']
+        columns = {key: batch[key][mask] for key in TLEParser.RECORD_FIELDS}
+        columns['epoch'] = epoch_strings(columns['epoch'])
+        for key, values in columns.items():
+            if values.dtype.kind == 'S':
+                columns[key] = values.astype(str)
+        lists = [columns[key].tolist() for key in TLEParser.RECORD_FIELDS]
+        return [dict(zip(TLEParser.RECORD_FIELDS, row)) for row in zip(*lists)]
+
+    @staticmethod
+    def validate_many(batch: Dict[str, np.ndarray]) -> Dict:
+        """Screen a ``parse_many`` batch and report rejected rows.
+
+        Checks line numbers, line length, both checksums, the catalog number
+        agreeing between line 1 and line 2, the fixed blank/decimal-point
+        columns and field decoding, all as byte-level array operations.
+        Returns a dict with the boolean ``accepted`` mask, the ``rejected``
+        row indices, a ``reasons`` bitmask per rejected row (``REJECT_*``
+        flags) and per-reason ``counts``.
+        """
+        m1 = _line_matrix(batch['tle_line1'])
+        m2 = _line_matrix(batch['tle_line2'])
+        reasons = np.zeros(len(m1), dtype=np.uint16)
+
+        line_number = (m1[:, 0] != ord('1')) | (m2[:, 0] != ord('2'))
+        reasons[line_number] |= REJECT_LINE_NUMBER
+        # Lines are NUL padded to 69 columns, so a short line ends in NUL
+        reasons[(m1[:, LINE_WIDTH - 1] == 0) | (m2[:, LINE_WIDTH - 1] == 0)] |= REJECT_LENGTH
+        reasons[~(_checksum_ok(m1) & _checksum_ok(m2))] |= REJECT_CHECKSUM
+        reasons[np.any(m1[:, 2:7] != m2[:, 2:7], axis=1)] |= REJECT_CATALOG_MISMATCH
+        columns_ok = (
+            np.all(m1[:, _LINE1_BLANKS] == _SPACE, axis=1)
+            & np.all(m1[:, _LINE1_DOTS] == _DOT, axis=1)
+            & np.all(m2[:, _LINE2_BLANKS] == _SPACE, axis=1)
+            & np.all(m2[:, _LINE2_DOTS] == _DOT, axis=1)
+        )
+        reasons[~columns_ok] |= REJECT_COLUMNS
+        reasons[~batch['valid'] & ~line_number] |= REJECT_FORMAT
+
+        accepted = reasons == 0
+        rejected = np.flatnonzero(~accepted)
+        reasons = reasons[rejected]
+        return {
+            'total': len(m1),
+            'accepted': accepted,
+            'rejected': rejected,
+            'reasons': reasons,
+            'counts': {
+                name: int(np.count_nonzero(reasons & flag))
+                for flag, name in REJECT_REASONS.items()
+            },
+        }
@@ -0,0 +1,1060 @@
+"""Vectorized SGP4 propagation over struct-of-arrays element sets
+
+A NumPy port of the Vallado SGP4/SDP4 model (WGS72 constants, 'improved'
+operation mode, as used by the ``sgp4`` package), split like the Mojo
+experiments into ``sgp4_init``, which derives the per-satellite constants
+once, and ``sgp4_propagate``, which evaluates them over a whole
+(n_times, n_sats) grid of minutes since epoch. Elements come in the
+units they are stored in (degrees, revolutions per day), keyed like a
+``TLEParser.parse_many`` batch or an archive read.
+"""
+import time
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .index import to_datetime64
+
+# WGS72 gravity model
+RADIUS_EARTH_KM = 6378.135
+MU = 398600.8                                      # km^3 / s^2
+XKE = float(60.0 / np.sqrt(RADIUS_EARTH_KM ** 3 / MU))    # sqrt(mu) in earth radii^1.5 / min
+J2 = 0.001082616
+J3 = -0.00000253881
+J4 = -0.00000165597
+J3OJ2 = J3 / J2
+
+TWOPI = 2 * np.pi
+X2O3 = 2.0 / 3.0
+DEG2RAD = np.pi / 180.0
+XPDOTP = 1440.0 / TWOPI                            # rev/day per rad/min
+VKMPERSEC = RADIUS_EARTH_KM * XKE / 60.0
+
+# Orbits with a period at or above this (minutes) need the deep-space model
+DEEP_SPACE_PERIOD = 225.0
+
+# Error codes, as reported by the sgp4 package
+ERROR_ECCENTRICITY = 1              # mean eccentricity outside -0.001 <= e < 1
+ERROR_MEAN_MOTION = 2               # mean motion <= 0
+ERROR_PERTURBED_ECCENTRICITY = 3    # deep space: eccentricity outside 0 <= e <= 1 after periodics
+ERROR_SEMI_LATUS = 4                # semi-latus rectum < 0
+ERROR_DECAYED = 6                   # radius below the earth's surface
+
+# Deep space: sun and moon mean motions (rad/min) and eccentricities
+ZNS = 1.19459e-5
+ZES = 0.01675
+ZNL = 1.5835218e-4
+ZEL = 0.05490
+RPTIM = 4.37526908801129966e-3                     # earth rotation, rad/min
+JD_1950 = 2433281.5                                # Julian date SGP4 counts epoch days from
+# Euler-Maclaurin integration of the 12h/24h resonances: step (min) and step^2/2
+RESONANCE_STEP = 720.0
+RESONANCE_STEP2 = 259200.0
+
+# Largest step _rotate may take with a given number of Taylor terms: the
+# truncated sine and cosine series stay within 1e-17 up to these
+_SERIES_LIMITS = {1: 1.2e-4, 2: 4.4e-3, 3: 2.8e-2, 4: 9.0e-2}
+
+# Precision tiers of sgp4_propagate, fastest last (see calibrate_precision):
+# 'exact' follows the reference in float64; 'fast' replaces np.sin/np.cos
+# with polynomials accurate to 1e-13; 'float32' keeps the secular terms in
+# float64 but evaluates the trigonometry, Kepler's equation and the
+# short-period terms in single precision
+PRECISIONS = ('exact', 'fast', 'float32')
+
+# Coefficients of x, x^3, ... for sin and 1, x^2, ... for cos on [-pi/2, pi/2]
+# (least-squares fits, absolute error below 7.5e-14)
+_SIN_POLY = (
+    0.9999999999996205, -0.16666666666097202, 0.008333333308383402, -0.0001984126502017281,
+    2.7556840588880028e-06, -2.502662998860139e-08, 1.5365974877006557e-10,
+)
+_COS_POLY = (
+    0.9999999999999769, -0.4999999999998882, 0.04166666666582177, -0.0013888888861322457,
+    2.4801582877101926e-05, -2.7556935659177953e-07, 2.085830900530972e-09, -1.1007168983031269e-11,
+)
+_PI_LO = 1.2246467991473532e-16                   # pi - float(pi)
+
+# Elements evaluated per block; sized so the temporaries stay cache friendly
+BLOCK_SIZE = 1 << 15
+
+# Input fields sgp4_init needs
+ELEMENT_FIELDS = (
+    'epoch', 'inclination', 'raan', 'eccentricity', 'argument_of_perigee',
+    'mean_anomaly', 'mean_motion', 'bstar',
+)
+
+
+def elements_from_records(records: Iterable[Dict]) -> Dict[str, np.ndarray]:
+    """Struct-of-arrays elements from TLE dicts (e.g. ``get_current_catalog`` rows)"""
+    records = list(records)
+    elements = {
+        key: np.array([r[key] for r in records], dtype=np.float64)
+        for key in ELEMENT_FIELDS if key != 'epoch'
+    }
+    elements['norad_id'] = np.array([r['norad_id'] for r in records], dtype=np.int64)
+    elements['epoch'] = to_datetime64([str(r['epoch']) for r in records])
+    return elements
+
+
+def minutes_since_epoch(epochs: np.ndarray, times: np.ndarray) -> np.ndarray:
+    """(n_times, n_sats) minutes from each element epoch to each time"""
+    epochs = np.asarray(epochs, dtype='datetime64[us]')
+    times = np.asarray(times, dtype='datetime64[us]')
+    delta = times[:, None] - epochs[None, :]
+    return delta.astype(np.int64) / 60e6
+
+
+def sgp4_init(elements: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Derive the SGP4 propagation constants of every element set.
+
+    Returns a dict of per-satellite arrays (mirroring ``sgp4init``'s
+    satrec fields), plus ``error``, the error code of a propagation to
+    epoch (0 if none), and ``deep_space``, flagging orbits of
+    ``DEEP_SPACE_PERIOD`` minutes or longer. The lunar-solar and resonance
+    terms of those are derived for the deep-space rows only and are zero
+    elsewhere.
+    """
+    inclo = np.asarray(elements['inclination'], dtype=np.float64) * DEG2RAD
+    nodeo = np.asarray(elements['raan'], dtype=np.float64) * DEG2RAD
+    argpo = np.asarray(elements['argument_of_perigee'], dtype=np.float64) * DEG2RAD
+    mo = np.asarray(elements['mean_anomaly'], dtype=np.float64) * DEG2RAD
+    ecco = np.asarray(elements['eccentricity'], dtype=np.float64)
+    no_kozai = np.asarray(elements['mean_motion'], dtype=np.float64) / XPDOTP
+    bstar = np.asarray(elements['bstar'], dtype=np.float64)
+
+    with np.errstate(all='ignore'):
+        # initl: recover the original (un-Kozai) mean motion and semi-major axis
+        eccsq = ecco * ecco
+        omeosq = 1.0 - eccsq
+        rteosq = np.sqrt(omeosq)
+        cosio = np.cos(inclo)
+        cosio2 = cosio * cosio
+        ak = np.power(XKE / no_kozai, X2O3)
+        d1 = 0.75 * J2 * (3.0 * cosio2 - 1.0) / (rteosq * omeosq)
+        delta = d1 / (ak * ak)
+        adel = ak * (1.0 - delta * delta - delta * (1.0 / 3.0 + 134.0 * delta * delta / 81.0))
+        delta = d1 / (adel * adel)
+        no_unkozai = no_kozai / (1.0 + delta)
+        ao = np.power(XKE / no_unkozai, X2O3)
+        sinio = np.sin(inclo)
+        po = ao * omeosq
+        con42 = 1.0 - 5.0 * cosio2
+        con41 = -con42 - cosio2 - cosio2
+        posq = po * po
+        rp = ao * (1.0 - ecco)
+
+        # Atmospheric density parameters, altered for perigees below 156 km
+        isimp = rp < 220.0 / RADIUS_EARTH_KM + 1.0
+        perige = (rp - 1.0) * RADIUS_EARTH_KM
+        sfour = np.where(perige < 98.0, 20.0, perige - 78.0)
+        low = perige < 156.0
+        qzms24 = np.where(low, ((120.0 - sfour) / RADIUS_EARTH_KM) ** 4, ((120.0 - 78.0) / RADIUS_EARTH_KM) ** 4)
+        sfour = np.where(low, sfour / RADIUS_EARTH_KM + 1.0, 78.0 / RADIUS_EARTH_KM + 1.0)
+
+        pinvsq = 1.0 / posq
+        tsi = 1.0 / (ao - sfour)
+        eta = ao * ecco * tsi
+        etasq = eta * eta
+        eeta = ecco * eta
+        psisq = np.abs(1.0 - etasq)
+        coef = qzms24 * np.power(tsi, 4.0)
+        coef1 = coef / np.power(psisq, 3.5)
+        cc2 = coef1 * no_unkozai * (
+            ao * (1.0 + 1.5 * etasq + eeta * (4.0 + etasq))
+            + 0.375 * J2 * tsi / psisq * con41 * (8.0 + 3.0 * etasq * (8.0 + etasq))
+        )
+        cc1 = bstar * cc2
+        eccentric = ecco > 1.0e-4
+        cc3 = np.where(eccentric, -2.0 * coef * tsi * J3OJ2 * no_unkozai * sinio / ecco, 0.0)
+        x1mth2 = 1.0 - cosio2
+        cc4 = 2.0 * no_unkozai * coef1 * ao * omeosq * (
+            eta * (2.0 + 0.5 * etasq) + ecco * (0.5 + 2.0 * etasq)
+            - J2 * tsi / (ao * psisq) * (
+                -3.0 * con41 * (1.0 - 2.0 * eeta + etasq * (1.5 - 0.5 * eeta))
+                + 0.75 * x1mth2 * (2.0 * etasq - eeta * (1.0 + etasq)) * np.cos(2.0 * argpo)
+            )
+        )
+        cc5 = 2.0 * coef1 * ao * omeosq * (1.0 + 2.75 * (etasq + eeta) + eeta * etasq)
+
+        # Secular rates of the mean anomaly, perigee and node
+        cosio4 = cosio2 * cosio2
+        temp1 = 1.5 * J2 * pinvsq * no_unkozai
+        temp2 = 0.5 * temp1 * J2 * pinvsq
+        temp3 = -0.46875 * J4 * pinvsq * pinvsq * no_unkozai
+        mdot = (no_unkozai + 0.5 * temp1 * rteosq * con41
+                + 0.0625 * temp2 * rteosq * (13.0 - 78.0 * cosio2 + 137.0 * cosio4))
+        argpdot = (-0.5 * temp1 * con42 + 0.0625 * temp2 * (7.0 - 114.0 * cosio2 + 395.0 * cosio4)
+                   + temp3 * (3.0 - 36.0 * cosio2 + 49.0 * cosio4))
+        xhdot1 = -temp1 * cosio
+        nodedot = xhdot1 + (0.5 * temp2 * (4.0 - 19.0 * cosio2) + 2.0 * temp3 * (3.0 - 7.0 * cosio2)) * cosio
+        omgcof = bstar * cc3 * np.cos(argpo)
+        xmcof = np.where(eccentric, -X2O3 * coef * bstar / eeta, 0.0)
+        nodecf = 3.5 * omeosq * xhdot1 * cc1
+        t2cof = 1.5 * cc1
+        # Guard the divide by zero at exactly 180 degrees inclination
+        xlcof = -0.25 * J3OJ2 * sinio * (3.0 + 5.0 * cosio) / np.where(
+            np.abs(cosio + 1.0) > 1.5e-12, 1.0 + cosio, 1.5e-12)
+        aycof = -0.5 * J3OJ2 * sinio
+        delmo = (1.0 + eta * np.cos(mo)) ** 3
+        sinmao = np.sin(mo)
+        x7thm1 = 7.0 * cosio2 - 1.0
+
+        # Higher order drag terms, dropped (zeroed) for low perigees
+        deep_space = TWOPI / no_unkozai >= DEEP_SPACE_PERIOD
+        isimp |= deep_space
+        cc1sq = cc1 * cc1
+        d2 = 4.0 * ao * tsi * cc1sq
+        temp = d2 * tsi * cc1 / 3.0
+        d3 = (17.0 * ao + sfour) * temp
+        d4 = 0.5 * temp * ao * tsi * (221.0 * ao + 31.0 * sfour) * cc1
+        t3cof = d2 + 2.0 * cc1sq
+        t4cof = 0.25 * (3.0 * d3 + cc1 * (12.0 * d2 + 10.0 * cc1sq))
+        t5cof = 0.2 * (3.0 * d4 + 12.0 * cc1 * d3 + 6.0 * d2 * d2 + 15.0 * cc1sq * (2.0 * d2 + cc1sq))
+        for term in (d2, d3, d4, t3cof, t4cof, t5cof, omgcof, xmcof, cc5):
+            term[isimp] = 0.0
+
+    constants = {
+        'epoch': np.asarray(elements['epoch'], dtype='datetime64[us]'),
+        'bstar': bstar, 'ecco': ecco, 'inclo': inclo, 'nodeo': nodeo, 'argpo': argpo, 'mo': mo,
+        'no_unkozai': no_unkozai, 'ao': ao, 'sinio': sinio, 'cosio': cosio, 'isimp': isimp, 'deep_space': deep_space,
+        'con41': con41, 'cc1': cc1, 'cc4': cc4, 'cc5': cc5, 'd2': d2, 'd3': d3, 'd4': d4,
+        'delmo': delmo, 'eta': eta, 'argpdot': argpdot, 'omgcof': omgcof, 'sinmao': sinmao,
+        't2cof': t2cof, 't3cof': t3cof, 't4cof': t4cof, 't5cof': t5cof,
+        'x1mth2': x1mth2, 'x7thm1': x7thm1, 'mdot': mdot, 'nodedot': nodedot,
+        'xlcof': xlcof, 'xmcof': xmcof, 'nodecf': nodecf, 'aycof': aycof,
+    }
+
+    # Epoch as days since 1950 and sidereal time, rounded like the reference's Julian dates
+    epoch = constants['epoch']
+    midnight = epoch.astype('datetime64[D]')
+    jd_midnight = (midnight - np.datetime64('1949-12-31', 'D')).astype(np.float64) + JD_1950
+    epoch_days = (jd_midnight + (epoch - midnight).astype(np.int64) / 86400e6) - JD_1950
+    constants['gsto'] = _gstime(epoch_days + JD_1950)
+
+    deep = np.flatnonzero(deep_space)
+    for key, values in _deep_space_init(_subset(constants, deep), epoch_days[deep]).items():
+        column = np.zeros(len(ecco), dtype=values.dtype)
+        column[deep] = values
+        constants[key] = column
+
+    error = np.zeros((1, len(ecco)), dtype=np.int8)
+    sgp4_propagate(constants, np.zeros(1), errors=error)
+    constants['error'] = error[0]
+    return constants
+
+
+def _gstime(jdut1: np.ndarray) -> np.ndarray:
+    """Greenwich mean sidereal time (rad) at UT1 Julian dates"""
+    tut1 = (jdut1 - 2451545.0) / 36525.0
+    temp = (-6.2e-6 * tut1 * tut1 * tut1 + 0.093104 * tut1 * tut1
+            + (876600.0 * 3600 + 8640184.812866) * tut1 + 67310.54841)
+    temp = np.fmod(temp * DEG2RAD / 240.0, TWOPI)
+    return np.where(temp < 0.0, temp + TWOPI, temp)
+
+
+def _lunar_solar_terms(zcosg, zsing, zcosi, zsini, zcosh, zsinh, cc, c) -> Dict[str, np.ndarray]:
+    """One pass of dscom's loop: the s and z coefficients for the sun or the moon"""
+    a1 = zcosg * zcosh + zsing * zcosi * zsinh
+    a3 = -zsing * zcosh + zcosg * zcosi * zsinh
+    a7 = -zcosg * zsinh + zsing * zcosi * zcosh
+    a8 = zsing * zsini
+    a9 = zsing * zsinh + zcosg * zcosi * zcosh
+    a10 = zcosg * zsini
+    a2 = c['cosim'] * a7 + c['sinim'] * a8
+    a4 = c['cosim'] * a9 + c['sinim'] * a10
+    a5 = -c['sinim'] * a7 + c['cosim'] * a8
+    a6 = -c['sinim'] * a9 + c['cosim'] * a10
+
+    x1 = a1 * c['cosomm'] + a2 * c['sinomm']
+    x2 = a3 * c['cosomm'] + a4 * c['sinomm']
+    x3 = -a1 * c['sinomm'] + a2 * c['cosomm']
+    x4 = -a3 * c['sinomm'] + a4 * c['cosomm']
+    x5 = a5 * c['sinomm']
+    x6 = a6 * c['sinomm']
+    x7 = a5 * c['cosomm']
+    x8 = a6 * c['cosomm']
+
+    emsq = c['emsq']
+    t = {}
+    t['z31'] = 12.0 * x1 * x1 - 3.0 * x3 * x3
+    t['z32'] = 24.0 * x1 * x2 - 6.0 * x3 * x4
+    t['z33'] = 12.0 * x2 * x2 - 3.0 * x4 * x4
+    z1 = 3.0 * (a1 * a1 + a2 * a2) + t['z31'] * emsq
+    z2 = 6.0 * (a1 * a3 + a2 * a4) + t['z32'] * emsq
+    z3 = 3.0 * (a3 * a3 + a4 * a4) + t['z33'] * emsq
+    t['z11'] = -6.0 * a1 * a5 + emsq * (-24.0 * x1 * x7 - 6.0 * x3 * x5)
+    t['z12'] = (-6.0 * (a1 * a6 + a3 * a5)
+                + emsq * (-24.0 * (x2 * x7 + x1 * x8) - 6.0 * (x3 * x6 + x4 * x5)))
+    t['z13'] = -6.0 * a3 * a6 + emsq * (-24.0 * x2 * x8 - 6.0 * x4 * x6)
+    t['z21'] = 6.0 * a2 * a5 + emsq * (24.0 * x1 * x5 - 6.0 * x3 * x7)
+    t['z22'] = (6.0 * (a4 * a5 + a2 * a6)
+                + emsq * (24.0 * (x2 * x5 + x1 * x6) - 6.0 * (x4 * x7 + x3 * x8)))
+    t['z23'] = 6.0 * a4 * a6 + emsq * (24.0 * x2 * x6 - 6.0 * x4 * x8)
+    t['z1'] = z1 + z1 + c['betasq'] * t['z31']
+    t['z2'] = z2 + z2 + c['betasq'] * t['z32']
+    t['z3'] = z3 + z3 + c['betasq'] * t['z33']
+    t['s3'] = cc * c['xnoi']
+    t['s2'] = -0.5 * t['s3'] / c['rtemsq']
+    t['s4'] = t['s3'] * c['rtemsq']
+    t['s1'] = -15.0 * c['ecco'] * t['s4']
+    t['s5'] = x1 * x3 + x2 * x4
+    t['s6'] = x2 * x3 + x1 * x4
+    t['s7'] = x2 * x4 - x1 * x3
+    return t
+
+
+def _deep_space_init(c: Dict[str, np.ndarray], epoch_days: np.ndarray) -> Dict[str, np.ndarray]:
+    """Lunar-solar and resonance constants of deep-space orbits (dscom and dsinit at epoch).
+
+    ``c`` holds the near-earth constants of the deep-space rows only.
+    Resonance type ``irez`` is 1 for synchronous (24h) orbits and 2 for
+    eccentric half-day (12h) orbits; the coefficients of the other type
+    are left zero.
+    """
+    ecco, inclo, nodeo, argpo = c['ecco'], c['inclo'], c['nodeo'], c['argpo']
+    no = c['no_unkozai']
+    with np.errstate(all='ignore'):
+        # dscom: sun and moon positions at epoch
+        emsq = ecco * ecco
+        betasq = 1.0 - emsq
+        common = {
+            'cosim': np.cos(inclo), 'sinim': np.sin(inclo), 'cosomm': np.cos(argpo), 'sinomm': np.sin(argpo),
+            'ecco': ecco, 'emsq': emsq, 'betasq': betasq, 'rtemsq': np.sqrt(betasq), 'xnoi': 1.0 / no,
+        }
+        snodm = np.sin(nodeo)
+        cnodm = np.cos(nodeo)
+        day = epoch_days + 18261.5
+        xnodce = np.fmod(4.5236020 - 9.2422029e-4 * day, TWOPI)
+        stem = np.sin(xnodce)
+        ctem = np.cos(xnodce)
+        zcosil = 0.91375164 - 0.03568096 * ctem
+        zsinil = np.sqrt(1.0 - zcosil * zcosil)
+        zsinhl = 0.089683511 * stem / zsinil
+        zcoshl = np.sqrt(1.0 - zsinhl * zsinhl)
+        gam = 5.8351514 + 0.0019443680 * day
+        zx = 0.39785416 * stem / zsinil
+        zy = zcoshl * ctem + 0.91744867 * zsinhl * stem
+        zx = gam + np.arctan2(zx, zy) - xnodce
+        sun = _lunar_solar_terms(0.1945905, -0.98088458, 0.91744867, 0.39785416,
+                                 cnodm, snodm, 2.9864797e-6, common)
+        moon = _lunar_solar_terms(np.cos(zx), np.sin(zx), zcosil, zsinil,
+                                  zcoshl * cnodm + zsinhl * snodm, snodm * zcoshl - cnodm * zsinhl,
+                                  4.7968065e-7, common)
+
+        # Periodic coefficients, applied at each propagation by _lunar_solar_periodics
+        d = {
+            'zmol': np.fmod(4.7199672 + 0.22997150 * day - gam, TWOPI),
+            'zmos': np.fmod(6.2565837 + 0.017201977 * day, TWOPI),
+        }
+        d['se2'] = 2.0 * sun['s1'] * sun['s6']
+        d['se3'] = 2.0 * sun['s1'] * sun['s7']
+        d['si2'] = 2.0 * sun['s2'] * sun['z12']
+        d['si3'] = 2.0 * sun['s2'] * (sun['z13'] - sun['z11'])
+        d['sl2'] = -2.0 * sun['s3'] * sun['z2']
+        d['sl3'] = -2.0 * sun['s3'] * (sun['z3'] - sun['z1'])
+        d['sl4'] = -2.0 * sun['s3'] * (-21.0 - 9.0 * emsq) * ZES
+        d['sgh2'] = 2.0 * sun['s4'] * sun['z32']
+        d['sgh3'] = 2.0 * sun['s4'] * (sun['z33'] - sun['z31'])
+        d['sgh4'] = -18.0 * sun['s4'] * ZES
+        d['sh2'] = -2.0 * sun['s2'] * sun['z22']
+        d['sh3'] = -2.0 * sun['s2'] * (sun['z23'] - sun['z21'])
+        d['ee2'] = 2.0 * moon['s1'] * moon['s6']
+        d['e3'] = 2.0 * moon['s1'] * moon['s7']
+        d['xi2'] = 2.0 * moon['s2'] * moon['z12']
+        d['xi3'] = 2.0 * moon['s2'] * (moon['z13'] - moon['z11'])
+        d['xl2'] = -2.0 * moon['s3'] * moon['z2']
+        d['xl3'] = -2.0 * moon['s3'] * (moon['z3'] - moon['z1'])
+        d['xl4'] = -2.0 * moon['s3'] * (-21.0 - 9.0 * emsq) * ZEL
+        d['xgh2'] = 2.0 * moon['s4'] * moon['z32']
+        d['xgh3'] = 2.0 * moon['s4'] * (moon['z33'] - moon['z31'])
+        d['xgh4'] = -18.0 * moon['s4'] * ZEL
+        d['xh2'] = -2.0 * moon['s2'] * moon['z22']
+        d['xh3'] = -2.0 * moon['s2'] * (moon['z23'] - moon['z21'])
+
+        # dsinit: secular lunar-solar rates
+        sinim, cosim = common['sinim'], common['cosim']
+        equatorial = (inclo < 5.2359877e-2) | (inclo > np.pi - 5.2359877e-2)
+        inclined = sinim != 0.0
+        ses = sun['s1'] * ZNS * sun['s5']
+        sis = sun['s2'] * ZNS * (sun['z11'] + sun['z13'])
+        sls = -ZNS * sun['s3'] * (sun['z1'] + sun['z3'] - 14.0 - 6.0 * emsq)
+        sghs = sun['s4'] * ZNS * (sun['z31'] + sun['z33'] - 6.0)
+        shs = np.where(equatorial, 0.0, -ZNS * sun['s2'] * (sun['z21'] + sun['z23']))
+        shs = np.where(inclined, shs / sinim, shs)
+        sgs = sghs - cosim * shs
+        d['dedt'] = ses + moon['s1'] * ZNL * moon['s5']
+        d['didt'] = sis + moon['s2'] * ZNL * (moon['z11'] + moon['z13'])
+        d['dmdt'] = sls - ZNL * moon['s3'] * (moon['z1'] + moon['z3'] - 14.0 - 6.0 * emsq)
+        sghl = moon['s4'] * ZNL * (moon['z31'] + moon['z33'] - 6.0)
+        shll = np.where(equatorial, 0.0, -ZNL * moon['s2'] * (moon['z21'] + moon['z23']))
+        d['domdt'] = np.where(inclined, sgs + sghl - cosim / sinim * shll, sgs + sghl)
+        d['dnodt'] = np.where(inclined, shs + shll / sinim, shs)
+
+        # dsinit: resonance coefficients
+        half_day = (8.26e-3 <= no) & (no <= 9.24e-3) & (ecco >= 0.5)
+        one_day = (0.0034906585 < no) & (no < 0.0052359877)
+        d['irez'] = np.where(half_day, 2, np.where(one_day, 1, 0)).astype(np.int8)
+        theta = np.fmod(c['gsto'], TWOPI)
+        aonv = np.power(no / XKE, X2O3)
+        d.update(_half_day_resonance(c, d, sinim, cosim, aonv, theta, half_day))
+        d.update(_one_day_resonance(c, d, sinim, cosim, aonv, theta, one_day))
+        d['xlamo'] = np.where(half_day, d.pop('xlamo2'), np.where(one_day, d.pop('xlamo1'), 0.0))
+        d['xfact'] = np.where(half_day, d.pop('xfact2'), np.where(one_day, d.pop('xfact1'), 0.0))
+    return d
+
+
+def _half_day_resonance(c, d, sinim, cosim, aonv, theta, mask) -> Dict[str, np.ndarray]:
+    """Geopotential resonance coefficients of 12h orbits, zero outside ``mask``"""
+    em = c['ecco']
+    emsq = em * em
+    eoc = em * emsq
+    low = em <= 0.65
+    g201 = -0.306 - (em - 0.64) * 0.440
+    g211 = np.where(low, 3.616 - 13.2470 * em + 16.2900 * emsq,
+                    -72.099 + 331.819 * em - 508.738 * emsq + 266.724 * eoc)
+    g310 = np.where(low, -19.302 + 117.3900 * em - 228.4190 * emsq + 156.5910 * eoc,
+                    -346.844 + 1582.851 * em - 2415.925 * emsq + 1246.113 * eoc)
+    g322 = np.where(low, -18.9068 + 109.7927 * em - 214.6334 * emsq + 146.5816 * eoc,
+                    -342.585 + 1554.908 * em - 2366.899 * emsq + 1215.972 * eoc)
+    g410 = np.where(low, -41.122 + 242.6940 * em - 471.0940 * emsq + 313.9530 * eoc,
+                    -1052.797 + 4758.686 * em - 7193.992 * emsq + 3651.957 * eoc)
+    g422 = np.where(low, -146.407 + 841.8800 * em - 1629.014 * emsq + 1083.4350 * eoc,
+                    -3581.690 + 16178.110 * em - 24462.770 * emsq + 12422.520 * eoc)
+    g520 = np.where(low, -532.114 + 3017.977 * em - 5740.032 * emsq + 3708.2760 * eoc,
+                    np.where(em > 0.715, -5149.66 + 29936.92 * em - 54087.36 * emsq + 31324.56 * eoc,
+                             1464.74 - 4664.75 * em + 3763.64 * emsq))
+    below = em < 0.7
+    g533 = np.where(below, -919.22770 + 4988.6100 * em - 9064.7700 * emsq + 5542.21 * eoc,
+                    -37995.780 + 161616.52 * em - 229838.20 * emsq + 109377.94 * eoc)
+    g521 = np.where(below, -822.71072 + 4568.6173 * em - 8491.4146 * emsq + 5337.524 * eoc,
+                    -51752.104 + 218913.95 * em - 309468.16 * emsq + 146349.42 * eoc)
+    g532 = np.where(below, -853.66600 + 4690.2500 * em - 8624.7700 * emsq + 5341.4 * eoc,
+                    -40023.880 + 170470.89 * em - 242699.48 * emsq + 115605.82 * eoc)
+
+    cosisq = cosim * cosim
+    sini2 = sinim * sinim
+    f220 = 0.75 * (1.0 + 2.0 * cosim + cosisq)
+    f221 = 1.5 * sini2
+    f321 = 1.875 * sinim * (1.0 - 2.0 * cosim - 3.0 * cosisq)
+    f322 = -1.875 * sinim * (1.0 + 2.0 * cosim - 3.0 * cosisq)
+    f441 = 35.0 * sini2 * f220
+    f442 = 39.3750 * sini2 * sini2
+    f522 = 9.84375 * sinim * (sini2 * (1.0 - 2.0 * cosim - 5.0 * cosisq)
+                              + 0.33333333 * (-2.0 + 4.0 * cosim + 6.0 * cosisq))
+    f523 = sinim * (4.92187512 * sini2 * (-2.0 - 4.0 * cosim + 10.0 * cosisq)
+                    + 6.56250012 * (1.0 + 2.0 * cosim - 3.0 * cosisq))
+    f542 = 29.53125 * sinim * (2.0 - 8.0 * cosim + cosisq * (-12.0 + 8.0 * cosim + 10.0 * cosisq))
+    f543 = 29.53125 * sinim * (-2.0 - 8.0 * cosim + cosisq * (12.0 + 8.0 * cosim - 10.0 * cosisq))
+
+    no = c['no_unkozai']
+    r = {}
+    temp1 = 3.0 * no * no * aonv * aonv
+    temp = temp1 * 1.7891679e-6
+    r['d2201'] = temp * f220 * g201
+    r['d2211'] = temp * f221 * g211
+    temp1 = temp1 * aonv
+    temp = temp1 * 3.7393792e-7
+    r['d3210'] = temp * f321 * g310
+    r['d3222'] = temp * f322 * g322
+    temp1 = temp1 * aonv
+    temp = 2.0 * temp1 * 7.3636953e-9
+    r['d4410'] = temp * f441 * g410
+    r['d4422'] = temp * f442 * g422
+    temp1 = temp1 * aonv
+    temp = temp1 * 1.1428639e-7
+    r['d5220'] = temp * f522 * g520
+    r['d5232'] = temp * f523 * g532
+    temp = 2.0 * temp1 * 2.1765803e-9
+    r['d5421'] = temp * f542 * g521
+    r['d5433'] = temp * f543 * g533
+    r = {key: np.where(mask, values, 0.0) for key, values in r.items()}
+    r['xlamo2'] = np.fmod(c['mo'] + c['nodeo'] + c['nodeo'] - theta - theta, TWOPI)
+    r['xfact2'] = c['mdot'] + d['dmdt'] + 2.0 * (c['nodedot'] + d['dnodt'] - RPTIM) - no
+    return r
+
+
+def _one_day_resonance(c, d, sinim, cosim, aonv, theta, mask) -> Dict[str, np.ndarray]:
+    """Geopotential resonance coefficients of synchronous orbits, zero outside ``mask``"""
+    emsq = c['ecco'] * c['ecco']
+    g200 = 1.0 + emsq * (-2.5 + 0.8125 * emsq)
+    g310 = 1.0 + 2.0 * emsq
+    g300 = 1.0 + emsq * (-6.0 + 6.60937 * emsq)
+    f220 = 0.75 * (1.0 + cosim) * (1.0 + cosim)
+    f311 = 0.9375 * sinim * sinim * (1.0 + 3.0 * cosim) - 0.75 * (1.0 + cosim)
+    f330 = 1.0 + cosim
+    f330 = 1.875 * f330 * f330 * f330
+    no = c['no_unkozai']
+    del1 = 3.0 * no * no * aonv * aonv
+    r = {
+        'del2': 2.0 * del1 * f220 * g200 * 1.7891679e-6,
+        'del3': 3.0 * del1 * f330 * g300 * 2.2123015e-7 * aonv,
+        'del1': del1 * f311 * g310 * 2.1460748e-6 * aonv,
+    }
+    r = {key: np.where(mask, values, 0.0) for key, values in r.items()}
+    r['xlamo1'] = np.fmod(c['mo'] + c['nodeo'] + c['argpo'] - theta, TWOPI)
+    r['xfact1'] = (c['mdot'] + (c['argpdot'] + c['nodedot']) - RPTIM
+                   + d['dmdt'] + d['domdt'] + d['dnodt'] - no)
+    return r
+
+
+def _fast_sincos(x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """sin and cos by reduction to [-pi/2, pi/2] and the _SIN_POLY/_COS_POLY polynomials.
+
+    About three times cheaper than np.sin plus np.cos in float64, which
+    NumPy does not vectorize. Accurate to 1e-13 for arguments up to a few
+    hundred radians; the reduction loses accuracy beyond that.
+    """
+    k = np.rint(x * (1.0 / np.pi))
+    y = x - k * np.pi
+    y -= k * _PI_LO
+    # (-1)^k
+    k *= 0.5
+    sign = np.floor(k)
+    sign -= k
+    sign *= 4.0
+    sign += 1.0
+    y2 = y * y
+    sin = _SIN_POLY[-1] * y2
+    for coef in _SIN_POLY[-2:0:-1]:
+        sin += coef
+        sin *= y2
+    sin += _SIN_POLY[0]
+    sin *= y
+    sin *= sign
+    cos = _COS_POLY[-1] * y2
+    for coef in _COS_POLY[-2:0:-1]:
+        cos += coef
+        cos *= y2
+    cos += _COS_POLY[0]
+    cos *= sign
+    return sin, cos
+
+
+def _float32(x: np.ndarray) -> np.ndarray:
+    return np.asarray(x, dtype=np.float32)
+
+
+# Trigonometry and working precision (of Kepler's equation and the
+# short-period terms) of each precision tier. 'sincos64' is for the deep-space
+# inclination, whose 1 + cos(i) cancels in float32 near retrograde equatorial orbits
+_TIERS = {
+    'exact': {
+        'sin': np.sin, 'cos': np.cos, 'sincos': lambda x: (np.sin(x), np.cos(x)),
+        'sincos64': lambda x: (np.sin(x), np.cos(x)), 'dtype': np.float64,
+    },
+    'fast': {
+        'sin': lambda x: _fast_sincos(x)[0], 'cos': lambda x: _fast_sincos(x)[1], 'sincos': _fast_sincos,
+        'sincos64': _fast_sincos, 'dtype': np.float64,
+    },
+    'float32': {
+        'sin': lambda x: np.sin(_float32(x)), 'cos': lambda x: np.cos(_float32(x)),
+        'sincos': lambda x: (np.sin(_float32(x)), np.cos(_float32(x))),
+        'sincos64': _fast_sincos, 'dtype': np.float32,
+    },
+}
+
+
+def _wrap(angle: np.ndarray) -> np.ndarray:
+    """Reduce angles to [-pi, pi]; np.sin/np.cos are markedly faster there"""
+    return angle - TWOPI * np.rint(angle * (1.0 / TWOPI))
+
+
+def _rotate(sin_a: np.ndarray, cos_a: np.ndarray, d: np.ndarray, terms: int) -> Tuple[np.ndarray, np.ndarray]:
+    """sin and cos of (a + d) from those of a.
+
+    Steps within the range of a ``terms``-term Taylor series (see
+    ``_SERIES_LIMITS``) use the series, which is exact in double precision
+    there and cheaper than evaluating np.sin and np.cos afresh; larger
+    steps fall back to the exact functions.
+    """
+    d2 = d * d
+    sin_d = 1.0
+    cos_d = 1.0
+    for k in range(terms, 0, -1):
+        sin_d = 1.0 - d2 * (1.0 / ((2 * k) * (2 * k + 1))) * sin_d
+        cos_d = 1.0 - d2 * (1.0 / ((2 * k - 1) * (2 * k))) * cos_d
+    sin_d = d * sin_d
+    big = np.abs(d) > _SERIES_LIMITS[terms]
+    if big.any():
+        sin_d[big] = np.sin(d[big])
+        cos_d[big] = np.cos(d[big])
+    return sin_a * cos_d + cos_a * sin_d, cos_a * cos_d - sin_a * sin_d
+
+
+def _solve_kepler(u: np.ndarray, axnl: np.ndarray, aynl: np.ndarray, tier: Dict) -> Tuple[np.ndarray, np.ndarray]:
+    """Sine and cosine of the eccentric longitude solving Kepler's equation.
+
+    Newton steps are clamped to 0.95 rad and at most ten are taken, as in
+    the reference code. Each pass only revisits the elements that have
+    not converged yet and advances their sine and cosine by rotation
+    rather than recomputing them. Inputs are flat arrays of equal length.
+    """
+    sineo1, coseo1 = tier['sincos'](u)
+    # Single precision stops at steps float32 cannot resolve anyway
+    tolerance = 1.0e-12 if u.dtype == np.float64 else 3.0e-7
+    eo1, s, c, uu, ax, ay = u, sineo1, coseo1, u, axnl, aynl
+    index = None
+    for iteration in range(9):
+        step = (uu - ay * c + ax * s - eo1) / (1.0 - c * ax - s * ay)
+        np.clip(step, -0.95, 0.95, out=step)
+        moving = np.flatnonzero(np.abs(step) >= tolerance)
+        if not len(moving):
+            break
+        index = moving if index is None else index[moving]
+        step = step[moving]
+        eo1 = eo1[moving] + step
+        # Newton steps shrink quadratically, and so do the series needed
+        s, c = _rotate(s[moving], c[moving], step, max(4 - 2 * iteration, 1))
+        uu, ax, ay = uu[moving], ax[moving], ay[moving]
+        sineo1[index] = s
+        coseo1[index] = c
+    return sineo1, coseo1
+
+
+def _short_period(am: np.ndarray, nm: np.ndarray, axnl: np.ndarray, aynl: np.ndarray, u: np.ndarray,
+                  nodep: np.ndarray, sinip: np.ndarray, cosip: np.ndarray, con41: np.ndarray,
+                  x1mth2: np.ndarray, x7thm1: np.ndarray, tier: Dict) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Solve Kepler's equation, add the short-period periodics and orient the state.
+
+    Shared by both models once the long-period terms are in. Returns the
+    (rows, n_sats, 6) TEME states, and the semi-latus rectum and radius
+    (earth radii) the error checks need. The small short-period
+    corrections to the argument of latitude, node and inclination are
+    applied by rotation instead of new sin/cos evaluations. Everything
+    here runs in the working precision of the ``tier``.
+    """
+    shape = u.shape
+    am, nm, axnl, aynl, u, sinip, cosip, con41, x1mth2, x7thm1 = (
+        np.asarray(x, dtype=tier['dtype'])
+        for x in (am, nm, axnl, aynl, u, sinip, cosip, con41, x1mth2, x7thm1)
+    )
+    sineo1, coseo1 = _solve_kepler(u.ravel(), axnl.ravel(), aynl.ravel(), tier)
+    sineo1 = sineo1.reshape(shape)
+    coseo1 = coseo1.reshape(shape)
+
+    ecose = axnl * coseo1 + aynl * sineo1
+    esine = axnl * sineo1 - aynl * coseo1
+    el2 = axnl * axnl + aynl * aynl
+    pl = am * (1.0 - el2)
+    rl = am * (1.0 - ecose)
+    rdotl = np.sqrt(am) * esine / rl
+    rvdotl = np.sqrt(pl) / rl
+    betal = np.sqrt(1.0 - el2)
+    temp = esine / (1.0 + betal)
+    sinu = am / rl * (sineo1 - aynl - axnl * temp)
+    cosu = am / rl * (coseo1 - axnl + aynl * temp)
+    # sin/cos of atan2(sinu, cosu)
+    norm = 1.0 / np.sqrt(sinu * sinu + cosu * cosu)
+    sinu *= norm
+    cosu *= norm
+    sin2u = (cosu + cosu) * sinu
+    cos2u = 1.0 - 2.0 * sinu * sinu
+    temp = 1.0 / pl
+    temp1 = 0.5 * J2 * temp
+    temp2 = temp1 * temp
+
+    mrt = rl * (1.0 - 1.5 * temp2 * betal * con41) + 0.5 * temp1 * x1mth2 * cos2u
+    mvt = rdotl - nm * temp1 * x1mth2 * sin2u / XKE
+    rvdot = rvdotl + nm * temp1 * (x1mth2 * cos2u + 1.5 * con41) / XKE
+
+    # Orientation vectors, after the short-period corrections
+    sinsu, cossu = _rotate(sinu, cosu, -0.25 * temp2 * x7thm1 * sin2u, 2)
+    temp2 *= 1.5 * cosip
+    snod, cnod = _rotate(*tier['sincos'](nodep), temp2 * sin2u, 2)
+    sini, cosi = _rotate(sinip, cosip, temp2 * sinip * cos2u, 2)
+    xmx = -snod * cosi
+    xmy = cnod * cosi
+    ux = xmx * sinsu + cnod * cossu
+    uy = xmy * sinsu + snod * cossu
+    uz = sini * sinsu
+    vx = xmx * cossu - cnod * sinsu
+    vy = xmy * cossu - snod * sinsu
+    vz = sini * cossu
+
+    states = np.empty(shape + (6,))
+    mr = mrt * RADIUS_EARTH_KM
+    states[..., 0] = mr * ux
+    states[..., 1] = mr * uy
+    states[..., 2] = mr * uz
+    mvt *= VKMPERSEC
+    rvdot *= VKMPERSEC
+    states[..., 3] = mvt * ux + rvdot * vx
+    states[..., 4] = mvt * uy + rvdot * vy
+    states[..., 5] = mvt * uz + rvdot * vz
+    return states, pl, mrt
+
+
+def _propagate_near_earth(c: Dict[str, np.ndarray], t: np.ndarray, tier: Dict) -> Tuple[np.ndarray, np.ndarray]:
+    """SGP4 at a (rows, n_sats) block of minutes since epoch.
+
+    Returns (rows, n_sats, 6) states in TEME km and km/s, and the matching
+    error codes; states are NaN wherever the code is non-zero. Follows the
+    reference step by step, except that angles are only reduced modulo
+    2 pi where that speeds up the trigonometry.
+    """
+    with np.errstate(all='ignore'):
+        # Secular gravity and atmospheric drag
+        xmdf = c['mo'] + c['mdot'] * t
+        argpm = c['argpo'] + c['argpdot'] * t
+        t2 = t * t
+        nodem = _wrap(c['nodeo'] + c['nodedot'] * t + c['nodecf'] * t2)
+        tempa = 1.0 - c['cc1'] * t
+        tempe = c['bstar'] * c['cc4'] * t
+        templ = c['t2cof'] * t2
+
+        # The higher order terms have zero coefficients for isimp orbits
+        delm = c['xmcof'] * ((1.0 + c['eta'] * tier['cos'](_wrap(xmdf))) ** 3 - c['delmo'])
+        temp = c['omgcof'] * t + delm
+        mm = xmdf + temp
+        argpm -= temp
+        t3 = t2 * t
+        t4 = t3 * t
+        tempa -= c['d2'] * t2 + c['d3'] * t3 + c['d4'] * t4
+        tempe += c['bstar'] * c['cc5'] * (tier['sin'](_wrap(mm)) - c['sinmao'])
+        templ += c['t3cof'] * t3 + t4 * (c['t4cof'] + t * c['t5cof'])
+
+        am = c['ao'] * tempa * tempa
+        nm = XKE / (am * np.sqrt(am))
+        em = c['ecco'] - tempe
+        bad_ecc = (em >= 1.0) | (em < -0.001)
+        em = np.maximum(em, 1.0e-6)
+        mm += c['no_unkozai'] * templ
+        argpm = _wrap(argpm)
+
+        # Long period periodics
+        sin_argpm, cos_argpm = tier['sincos'](argpm)
+        axnl = em * cos_argpm
+        temp = 1.0 / (am * (1.0 - em * em))
+        aynl = em * sin_argpm + temp * c['aycof']
+        u = _wrap(mm + argpm + temp * c['xlcof'] * axnl)
+        states, pl, mrt = _short_period(am, nm, axnl, aynl, u, nodem, c['sinio'], c['cosio'],
+                                        c['con41'], c['x1mth2'], c['x7thm1'], tier)
+
+        # Error codes, the earliest check the reference would fail winning
+        error = np.zeros(t.shape, dtype=np.int8)
+        error[mrt < 1.0] = ERROR_DECAYED
+        error[pl < 0.0] = ERROR_SEMI_LATUS
+        error[bad_ecc] = ERROR_ECCENTRICITY
+        error[np.broadcast_to(c['no_unkozai'] <= 0.0, t.shape)] = ERROR_MEAN_MOTION
+        states[error != 0] = np.nan
+    return states, error
+
+
+def _resonance_rates(c: Dict[str, np.ndarray], xli: np.ndarray, xni: np.ndarray,
+                     atime: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """xldot, xndt and xnddt of the resonance integrator at step time ``atime``"""
+    xldot = xni + c['xfact']
+    # Synchronous orbits
+    a1 = xli - 0.13130908
+    a2 = 2.0 * (xli - 2.8843198)
+    a3 = 3.0 * (xli - 0.37448087)
+    xndt1 = c['del1'] * np.sin(a1) + c['del2'] * np.sin(a2) + c['del3'] * np.sin(a3)
+    xnddt1 = c['del1'] * np.cos(a1) + 2.0 * c['del2'] * np.cos(a2) + 3.0 * c['del3'] * np.cos(a3)
+    # Half-day orbits
+    xomi = c['argpo'] + c['argpdot'] * atime
+    x2omi = xomi + xomi
+    x2li = xli + xli
+    g22, g32, g44, g52, g54 = 5.7686396, 0.95240898, 1.8014998, 1.0508330, 4.4108898
+    args = (
+        ('d2201', x2omi + xli - g22), ('d2211', xli - g22),
+        ('d3210', xomi + xli - g32), ('d3222', -xomi + xli - g32),
+        ('d4410', x2omi + x2li - g44), ('d4422', x2li - g44),
+        ('d5220', xomi + xli - g52), ('d5232', -xomi + xli - g52),
+        ('d5421', xomi + x2li - g54), ('d5433', -xomi + x2li - g54),
+    )
+    sines = {key: c[key] * np.sin(arg) for key, arg in args}
+    cosines = {key: c[key] * np.cos(arg) for key, arg in args}
+    xndt2 = sines['d2201']
+    for key, _ in args[1:]:
+        xndt2 = xndt2 + sines[key]
+    xnddt2 = cosines['d2201']
+    for key in ('d2211', 'd3210', 'd3222', 'd5220', 'd5232'):
+        xnddt2 = xnddt2 + cosines[key]
+    xnddt2 = xnddt2 + 2.0 * (cosines['d4410'] + cosines['d4422'] + cosines['d5421'] + cosines['d5433'])
+
+    half_day = c['irez'] == 2
+    xndt = np.where(half_day, xndt2, xndt1)
+    xnddt = np.where(half_day, xnddt2, xnddt1) * xldot
+    return xldot, xndt, xnddt
+
+
+def _resonance_table(c: Dict[str, np.ndarray], tsince: np.ndarray) -> Optional[Tuple]:
+    """Integrate the resonant orbits far enough to cover ``tsince``.
+
+    The reference integrates each satellite in 720 minute steps from epoch
+    up to the requested time; the state after each step only depends on
+    the step count and direction, so it is tabulated once per call:
+    (columns, table, origin) where ``table[:, origin + k, j]`` holds xli,
+    xni, xldot, xndt and xnddt of resonant column j after k steps
+    (backwards for negative k). None if no orbit is resonant.
+    """
+    cols = np.flatnonzero(c['irez'] != 0)
+    if not len(cols):
+        return None
+    r = _subset(c, cols)
+    t = tsince[:, cols]
+    forward = int(np.max(t, initial=0.0) // RESONANCE_STEP) + 1
+    back = int(np.max(-t, initial=0.0) // RESONANCE_STEP) + 1
+    table = np.empty((5, back + forward + 1, len(cols)))
+    for delt, steps, sign in ((RESONANCE_STEP, forward, 1), (-RESONANCE_STEP, back, -1)):
+        xli = r['xlamo']
+        xni = r['no_unkozai']
+        for k in range(steps + 1):
+            xldot, xndt, xnddt = _resonance_rates(r, xli, xni, k * delt)
+            table[:, back + sign * k] = xli, xni, xldot, xndt, xnddt
+            xli = xli + xldot * delt + xndt * RESONANCE_STEP2
+            xni = xni + xndt * delt + xnddt * RESONANCE_STEP2
+    return cols, table, back
+
+
+def _resonance(c: Dict[str, np.ndarray], resonance: Tuple, t: np.ndarray, theta: np.ndarray,
+               nodem: np.ndarray, argpm: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Mean motion and mean anomaly of the resonant columns (dspace's integrator)"""
+    cols, table, origin = resonance
+    t = t[:, cols]
+    # Whole steps taken: the reference steps while |t - atime| >= 720
+    at = np.abs(t)
+    k = np.floor(at / RESONANCE_STEP)
+    k -= at - k * RESONANCE_STEP < 0.0
+    k += at - k * RESONANCE_STEP >= RESONANCE_STEP
+    k = np.where(t > 0.0, k, -k)
+    ft = t - k * RESONANCE_STEP
+    xli, xni, xldot, xndt, xnddt = table[:, origin + k.astype(np.intp), np.arange(len(cols))]
+
+    no = c['no_unkozai'][cols]
+    nm = xni + xndt * ft + xnddt * ft * ft * 0.5
+    xl = xli + xldot * ft + xndt * ft * ft * 0.5
+    nodem = nodem[:, cols]
+    theta = theta[:, cols]
+    mm = np.where(c['irez'][cols] == 2, xl - 2.0 * nodem + 2.0 * theta, xl - nodem - argpm[:, cols] + theta)
+    return no + (nm - no), mm
+
+
+def _lunar_solar_periodics(c: Dict[str, np.ndarray], t: np.ndarray, ep: np.ndarray, inclp: np.ndarray,
+                           nodep: np.ndarray, argpp: np.ndarray, mp: np.ndarray, tier: Dict) -> Tuple:
+    """dpper: add the lunar-solar periodics to the mean elements.
+
+    Below 0.2 rad of inclination the node and perigee are corrected in
+    Lyddane's form, which stays regular at zero inclination.
+    """
+    zm = c['zmos'] + ZNS * t
+    zf = zm + 2.0 * ZES * tier['sin'](zm)
+    sinzf, coszf = tier['sincos'](zf)
+    f2 = 0.5 * sinzf * sinzf - 0.25
+    f3 = -0.5 * sinzf * coszf
+    ses = c['se2'] * f2 + c['se3'] * f3
+    sis = c['si2'] * f2 + c['si3'] * f3
+    sls = c['sl2'] * f2 + c['sl3'] * f3 + c['sl4'] * sinzf
+    sghs = c['sgh2'] * f2 + c['sgh3'] * f3 + c['sgh4'] * sinzf
+    shs = c['sh2'] * f2 + c['sh3'] * f3
+    zm = c['zmol'] + ZNL * t
+    zf = zm + 2.0 * ZEL * tier['sin'](zm)
+    sinzf, coszf = tier['sincos'](zf)
+    f2 = 0.5 * sinzf * sinzf - 0.25
+    f3 = -0.5 * sinzf * coszf
+    sel = c['ee2'] * f2 + c['e3'] * f3
+    sil = c['xi2'] * f2 + c['xi3'] * f3
+    sll = c['xl2'] * f2 + c['xl3'] * f3 + c['xl4'] * sinzf
+    sghl = c['xgh2'] * f2 + c['xgh3'] * f3 + c['xgh4'] * sinzf
+    shll = c['xh2'] * f2 + c['xh3'] * f3
+    pe = ses + sel
+    pinc = sis + sil
+    pl = sls + sll
+    pgh = sghs + sghl
+    ph = shs + shll
+
+    inclp = inclp + pinc
+    ep = ep + pe
+    sinip, cosip = tier['sincos'](inclp)
+    direct = inclp >= 0.2
+
+    # Lyddane's modification for low inclinations
+    sinop, cosop = tier['sincos'](nodep)
+    alfdp = sinip * sinop + (ph * cosop + pinc * cosip * sinop)
+    betdp = sinip * cosop + (-ph * sinop + pinc * cosip * cosop)
+    xnoh = np.fmod(nodep, TWOPI)
+    xls = mp + argpp + pl + pgh + (cosip - pinc * sinip) * xnoh
+    node_low = np.arctan2(alfdp, betdp)
+    node_low = np.where(np.abs(xnoh - node_low) > np.pi,
+                        np.where(node_low < xnoh, node_low + TWOPI, node_low - TWOPI), node_low)
+    mp = mp + pl
+
+    ph = ph / sinip
+    nodep = np.where(direct, nodep + ph, node_low)
+    argpp = np.where(direct, argpp + (pgh - cosip * ph), xls - mp - cosip * node_low)
+    return ep, inclp, nodep, argpp, mp
+
+
+def _propagate_deep_space(c: Dict[str, np.ndarray], t: np.ndarray, resonance: Optional[Tuple],
+                          tier: Dict) -> Tuple[np.ndarray, np.ndarray]:
+    """SDP4 at a (rows, n_sats) block of minutes since epoch, deep-space rows only.
+
+    Same outputs as ``_propagate_near_earth``. ``resonance`` is the
+    ``_resonance_table`` of these rows. Angles are reduced with fmod
+    exactly where the reference does, since the Lyddane branch of the
+    periodics is not invariant under whole turns.
+    """
+    with np.errstate(all='ignore'):
+        # Secular gravity, drag (isimp) and lunar-solar rates
+        t2 = t * t
+        tempa = 1.0 - c['cc1'] * t
+        tempe = c['bstar'] * c['cc4'] * t
+        templ = c['t2cof'] * t2
+        theta = np.fmod(c['gsto'] + t * RPTIM, TWOPI)
+        em = c['ecco'] + c['dedt'] * t
+        inclm = c['inclo'] + c['didt'] * t
+        argpm = c['argpo'] + c['argpdot'] * t + c['domdt'] * t
+        nodem = c['nodeo'] + c['nodedot'] * t + c['nodecf'] * t2 + c['dnodt'] * t
+        mm = c['mo'] + c['mdot'] * t + c['dmdt'] * t
+        nm = np.broadcast_to(c['no_unkozai'], t.shape)
+        if resonance is not None:
+            cols = resonance[0]
+            nm = nm.copy()
+            nm[:, cols], mm[:, cols] = _resonance(c, resonance, t, theta, nodem, argpm)
+
+        bad_motion = nm <= 0.0
+        am = np.power(XKE / nm, X2O3) * tempa * tempa
+        nm = XKE / np.power(am, 1.5)
+        em = em - tempe
+        bad_ecc = (em >= 1.0) | (em < -0.001)
+        em = np.maximum(em, 1.0e-6)
+        mm = mm + c['no_unkozai'] * templ
+        xlm = mm + argpm + nodem
+        nodem = np.fmod(nodem, TWOPI)
+        argpm = np.fmod(argpm, TWOPI)
+        xlm = np.fmod(xlm, TWOPI)
+        mm = np.fmod(xlm - argpm - nodem, TWOPI)
+
+        # Lunar-solar periodics, then the long-period terms at the perturbed inclination
+        ep, xincp, nodep, argpp, mp = _lunar_solar_periodics(c, t, em, inclm, nodem, argpm, mm, tier)
+        flip = xincp < 0.0
+        xincp = np.where(flip, -xincp, xincp)
+        nodep = np.where(flip, nodep + np.pi, nodep)
+        argpp = np.where(flip, argpp - np.pi, argpp)
+        bad_ep = (ep < 0.0) | (ep > 1.0)
+        sinip, cosip = tier['sincos64'](xincp)
+        aycof = -0.5 * J3OJ2 * sinip
+        xlcof = -0.25 * J3OJ2 * sinip * (3.0 + 5.0 * cosip) / np.where(
+            np.abs(cosip + 1.0) > 1.5e-12, 1.0 + cosip, 1.5e-12)
+
+        sin_argpp, cos_argpp = tier['sincos'](argpp)
+        axnl = ep * cos_argpp
+        temp = 1.0 / (am * (1.0 - ep * ep))
+        aynl = ep * sin_argpp + temp * aycof
+        xl = mp + argpp + nodep + temp * xlcof * axnl
+        u = np.fmod(xl - nodep, TWOPI)
+        cosisq = cosip * cosip
+        states, pl, mrt = _short_period(am, nm, axnl, aynl, u, nodep, sinip, cosip,
+                                        3.0 * cosisq - 1.0, 1.0 - cosisq, 7.0 * cosisq - 1.0, tier)
+
+        error = np.zeros(t.shape, dtype=np.int8)
+        error[mrt < 1.0] = ERROR_DECAYED
+        error[pl < 0.0] = ERROR_SEMI_LATUS
+        error[bad_ep] = ERROR_PERTURBED_ECCENTRICITY
+        error[bad_ecc] = ERROR_ECCENTRICITY
+        error[bad_motion] = ERROR_MEAN_MOTION
+        states[error != 0] = np.nan
+    return states, error
+
+
+def _subset(constants: Dict[str, np.ndarray], index: np.ndarray) -> Dict[str, np.ndarray]:
+    return {key: values[index] for key, values in constants.items()}
+
+
+def sgp4_propagate(constants: Dict[str, np.ndarray], tsince: np.ndarray, out: Optional[np.ndarray] = None,
+                   errors: Optional[np.ndarray] = None, precision: str = 'exact') -> np.ndarray:
+    """Propagate every satellite to every time.
+
+    ``tsince`` holds minutes since each satellite's epoch, either one
+    vector of n_times offsets shared by all satellites or an
+    (n_times, n_sats) grid (see ``minutes_since_epoch``). Returns an
+    (n_times, n_sats, 6) array of TEME position (km) and velocity (km/s),
+    written into ``out`` if given. States that fail to propagate
+    (decayed, eccentricity out of range) are NaN; their error codes are
+    written into ``errors``, an (n_times, n_sats) integer array, if given.
+
+    Near-earth and deep-space satellites are evaluated as two separate
+    batches, so neither pays for the other's terms, and scattered back
+    into their input columns. ``precision`` picks one of ``PRECISIONS``,
+    trading accuracy for speed; ``calibrate_precision`` measures what each
+    tier costs on a given catalog.
+    """
+    if precision not in _TIERS:
+        raise ValueError(f"Unknown precision {precision!r}; expected one of {', '.join(PRECISIONS)}")
+    tier = _TIERS[precision]
+    n_sats = len(constants['ecco'])
+    tsince = np.asarray(tsince, dtype=np.float64)
+    if tsince.ndim == 1:
+        tsince = np.broadcast_to(tsince[:, None], (len(tsince), n_sats))
+    n_times = tsince.shape[0]
+    if out is None:
+        out = np.empty((n_times, n_sats, 6))
+
+    for deep_space in (False, True):
+        index = np.flatnonzero(constants['deep_space'] == deep_space)
+        if not n_times or not len(index):
+            continue
+        if len(index) == n_sats:
+            index, c = slice(None), constants
+        else:
+            c = _subset(constants, index)
+        if deep_space:
+            resonance = _resonance_table(c, tsince[:, index])
+
+        # Evaluate whole rows of times at a time, about BLOCK_SIZE states per block
+        rows = max(1, BLOCK_SIZE // len(c['ecco']))
+        for start in range(0, n_times, rows):
+            block = tsince[start:start + rows, index]
+            if deep_space:
+                states, error = _propagate_deep_space(c, block, resonance, tier)
+            else:
+                states, error = _propagate_near_earth(c, block, tier)
+            out[start:start + rows, index] = states
+            if errors is not None:
+                errors[start:start + rows, index] = error
+    return out
+
+
+def propagate(elements: Dict[str, np.ndarray], times: np.ndarray, cache=None,
+              precision: str = 'exact') -> np.ndarray:
+    """Propagate element sets to absolute times (datetime64), shape (n_times, n_sats, 6).
+
+    Pass a ``ConstantsCache`` to reuse the constants of element sets seen before.
+    """
+    constants = cache.init(elements) if cache is not None else sgp4_init(elements)
+    return sgp4_propagate(constants, minutes_since_epoch(constants['epoch'], times), precision=precision)
+
+
+def calibrate_precision(constants: Dict[str, np.ndarray], tsince: np.ndarray,
+                        precisions: Sequence[str] = PRECISIONS,
+                        percentiles: Sequence[float] = (50.0, 90.0, 99.0, 99.9, 100.0)) -> Dict[str, Dict]:
+    """Position error and speed of each precision tier against 'exact'.
+
+    Propagates the same constants to the same times once per tier and
+    measures the distance (km) between each tier's positions and the
+    'exact' ones wherever both exist. Returns, per tier, ``seconds``,
+    ``states_per_sec``, ``speedup`` over 'exact', ``mismatched`` (states
+    only one of the two could propagate) and ``errors_km``, a dict from
+    each percentile to the position error at that percentile.
+    """
+    report = {}
+    reference = None
+    for precision in ['exact'] + [p for p in precisions if p != 'exact']:
+        start = time.perf_counter()
+        states = sgp4_propagate(constants, tsince, precision=precision)
+        seconds = time.perf_counter() - start
+        positions = states[..., :3]
+        del states
+        if reference is None:
+            reference = positions
+        diff = np.sqrt(((positions - reference) ** 2).sum(axis=-1))
+        defined = ~np.isnan(diff)
+        report[precision] = {
+            'seconds': seconds,
+            'states_per_sec': diff.size / seconds if seconds else 0.0,
+            'speedup': report['exact']['seconds'] / seconds if precision != 'exact' else 1.0,
+            'mismatched': int(np.count_nonzero(np.isnan(positions[..., 0]) != np.isnan(reference[..., 0]))),
+            'errors_km': dict(zip(percentiles, np.percentile(diff[defined], percentiles)
+                                  if defined.any() else [0.0] * len(percentiles))),
+        }
+    return {precision: report[precision] for precision in precisions}
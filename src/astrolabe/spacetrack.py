@@ -1,13 +1,27 @@
+import json
 import requests
 import time
-from .config import SPACETRACK_IDENTITY, SPACETRACK_PASSWORD, SPACETRACK_URL, SPACETRACK_API_URL
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List, Optional
+from urllib.parse import quote
+
+from .config import (
+    SPACETRACK_IDENTITY, SPACETRACK_PASSWORD, SPACETRACK_URL,
+    SPACETRACK_QUERY_URL, SPACETRACK_STATE_PATH, SPACETRACK_ID_BLOCK, SPACETRACK_MAX_ID,
+    SPACETRACK_PAGE_DELAY, SPACETRACK_OVERLAP_MINUTES
+)
+from .stream import iter_response_lines
 
 class SpaceTrackClient:
     """Client for interacting with Space-Track API"""
 
-    def __init__(self):
+    def __init__(self, state_path: str = SPACETRACK_STATE_PATH):
         self.session = requests.Session()
+        self.session.headers['Accept-Encoding'] = 'gzip, deflate'
         self.authenticated = False
+        self.state_path = Path(state_path) if state_path else None
+        self._pending_state: Optional[dict] = None
 
     def authenticate(self):
         """Authenticate with Space-Track"""
@@ -28,16 +42,85 @@ class SpaceTrackClient:
         else:
             raise Exception(f"Authentication failed: {response.status_code} - {response.text}")
 
+    def load_state(self) -> dict:
+        """Read the persisted high-water mark (empty before the first run)"""
+        try:
+            return json.loads(self.state_path.read_text()) if self.state_path else {}
+        except (OSError, ValueError):
+            return {}
+
+    def commit_state(self):
+        """Persist the high-water mark of the last fully ingested query"""
+        if self._pending_state and self.state_path:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            self.state_path.write_text(json.dumps(self._pending_state))
+        self._pending_state = None
+
+    def discard_state(self):
+        """Drop the pending high-water mark so the next run re-queries the window"""
+        self._pending_state = None
+
+    def build_queries(self, since: Optional[str] = None) -> List[str]:
+        """Build delta query URLs, one per NORAD_CAT_ID block.
+
+        With ``since`` (a UTC 'YYYY-MM-DD HH:MM:SS' timestamp) only element
+        sets created after it are requested; otherwise the 30-day window.
+        """
+        if since:
+            window = f"CREATION_DATE/%3E{quote(since)}"
+        else:
+            window = "EPOCH/%3Enow-30"
+        queries = []
+        for low in range(0, SPACETRACK_MAX_ID + 1, SPACETRACK_ID_BLOCK):
+            high = min(low + SPACETRACK_ID_BLOCK - 1, SPACETRACK_MAX_ID)
+            queries.append(
+                f"{SPACETRACK_QUERY_URL}/class/gp/{window}/NORAD_CAT_ID/{low}--{high}"
+                f"/orderby/NORAD_CAT_ID,EPOCH/format/3le"
+            )
+        return queries
+
     def fetch_tles(self):
         """Fetch TLE data from Space-Track"""
+        return [line.decode('ascii', 'replace') for line in self.stream_tles() if line.strip()]
+
+    def stream_tles(self, fetch_cache=None):
+        """Stream TLE lines from Space-Track without buffering the response.
+
+        Queries are incremental from the persisted high-water mark and split
+        into NORAD_CAT_ID blocks that are streamed one after another. The
+        new mark is only saved by ``commit_state`` once the caller has
+        ingested everything. With a ``FetchCache``, the stable full-window
+        queries yield nothing when unchanged since the last processed fetch.
+        """
         if not self.authenticated:
             self.authenticate()
 
-        print("Fetching TLE data from Space-Track...")
-        # Fetching 3LE format which includes the satellite name
-        response = self.session.get(SPACETRACK_API_URL)
-        
-        if response.status_code == 200:
-            return response.text.strip().split('\n')
+        # Overlap the previous window a little so late-published sets are not missed
+        started = datetime.now(timezone.utc)
+        since = self.load_state().get('last_query_started')
+        if since:
+            since = datetime.fromisoformat(since)
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=timezone.utc)  # Marks saved before offsets were stored
+            since = since.astimezone(timezone.utc) - timedelta(minutes=SPACETRACK_OVERLAP_MINUTES)
+            since = since.strftime('%Y-%m-%d %H:%M:%S')
+            print(f"Fetching TLE data from Space-Track created since {since}...")
         else:
-            raise Exception(f"Failed to fetch TLEs: {response.status_code} - {response.text}")
+            print("Fetching TLE data from Space-Track...")
+        cache = None if since else fetch_cache
+
+        for i, url in enumerate(self.build_queries(since)):
+            if i:
+                time.sleep(SPACETRACK_PAGE_DELAY)  # Stay inside Space-Track's rate limits
+            # Fetching 3LE format which includes the satellite name
+            headers = cache.conditional_headers(url) if cache else {}
+            response = self.session.get(url, headers=headers, stream=True)
+
+            if response.status_code in (200, 304) and cache:
+                yield from cache.open(url, response) or ()
+            elif response.status_code == 200:
+                yield from iter_response_lines(response)
+            else:
+                raise Exception(f"Failed to fetch TLEs: {response.status_code} - {response.text}")
+
+        self._pending_state = {'last_query_started': started.isoformat(timespec='seconds')}
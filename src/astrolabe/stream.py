@@ -0,0 +1,36 @@
+"""Streaming helpers for bounded-memory TLE ingest"""
+from typing import Iterable, Iterator, List, Union
+
+from .config import HTTP_CHUNK_SIZE, STREAM_BATCH_RECORDS
+
+
+def iter_response_lines(response, chunk_size: int = HTTP_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield raw lines from a streamed ``requests`` response.
+
+    The body is read ``chunk_size`` bytes at a time, so only one chunk plus
+    a partial line is ever held in memory.
+    """
+    try:
+        yield from response.iter_lines(chunk_size=chunk_size)
+    finally:
+        response.close()
+
+
+def iter_record_chunks(lines: Iterable[Union[str, bytes]],
+                       records: int = STREAM_BATCH_RECORDS) -> Iterator[List[Union[str, bytes]]]:
+    """Group lines into record-aligned chunks for ``TLEParser.parse_many``.
+
+    Blank lines are dropped. Chunks hold a multiple of six lines so both
+    3LE (name + two lines) and bare 2LE input stay aligned to records.
+    """
+    chunk_lines = 6 * max(1, records // 2)
+    chunk: List[Union[str, bytes]] = []
+    for line in lines:
+        if not line.strip():
+            continue
+        chunk.append(line)
+        if len(chunk) >= chunk_lines:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,69 @@
+"""Background database writes behind a bounded queue"""
+import queue
+import threading
+import time
+from typing import Callable, Optional
+
+from .config import WRITE_QUEUE_DEPTH
+
+_STOP = object()
+
+
+class BackgroundWriter:
+    """Run ``write(*args)`` jobs on background threads while the caller keeps parsing.
+
+    ``submit`` blocks once ``depth`` jobs are waiting, so a slow backend
+    throttles the producer instead of letting parsed batches pile up in
+    memory. The first exception raised by a job stops further submissions
+    and is re-raised by ``submit`` or ``close``. ``close`` always drains
+    the jobs already queued before returning.
+    """
+
+    def __init__(self, write: Callable, depth: int = WRITE_QUEUE_DEPTH, threads: int = 1):
+        self.write = write
+        self._queue: queue.Queue = queue.Queue(maxsize=max(depth, 1))
+        self._error: Optional[BaseException] = None
+        self._lock = threading.Lock()
+        self.stats = {'jobs': 0, 'write_seconds': 0.0, 'blocked_seconds': 0.0}
+        self._threads = [
+            threading.Thread(target=self._run, name=f"tle-writer-{i}", daemon=True)
+            for i in range(max(threads, 1))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is _STOP:
+                return
+            if self._error is not None:
+                continue
+            start = time.perf_counter()
+            try:
+                self.write(*job)
+            except BaseException as e:
+                with self._lock:
+                    self._error = self._error or e
+            with self._lock:
+                self.stats['jobs'] += 1
+                self.stats['write_seconds'] += time.perf_counter() - start
+
+    def _raise_error(self):
+        if self._error is not None:
+            raise self._error
+
+    def submit(self, *args):
+        """Queue a job, waiting while the queue is full"""
+        self._raise_error()
+        start = time.perf_counter()
+        self._queue.put(args)
+        self.stats['blocked_seconds'] += time.perf_counter() - start
+
+    def close(self):
+        """Wait for every queued job to finish, then re-raise any job error"""
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        self._raise_error()